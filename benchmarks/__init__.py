@@ -0,0 +1 @@
+"""Benchmarks offline do scraper e da pipeline."""
@@ -0,0 +1,133 @@
+"""Backtest sobre histórico sintético: confere a equivalência e mede a grade em 1 x N processos.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_backtest                   # 100k corridas, grade de 127 prefixos x 9 stakes
+    python -m benchmarks.bench_backtest --races 20000 --workers 4
+
+Antes de medir, confere que:
+  - com os prefixos/stakes do ``config.py`` as apostas do backtest são exatamente as seleções
+    que ``build_lines_and_audit`` exportaria (mesmos cães, tags e stakes);
+  - P&L, acertos e drawdown batem com um loop aposta a aposta.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from benchmarks.bench_marketfeeder_import import synthetic_forecast
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.pipeline.backtest import evaluate, prefix_grid, prepare_bets, run_grid
+from src.mktfeeder_greyhounds.pipeline.build_marketfeeder_import import build_lines_and_audit, _strategy_for_category
+
+_COMMISSION = 0.05
+
+
+def synthetic_results(df_forecast: pd.DataFrame, seed: int = 5) -> pd.DataFrame:
+    """Um resultado por cão do forecast (posição 1..6 e BSP), com ~2% de corridas sem resultado."""
+    rng = random.Random(seed)
+    rows = []
+    for rec in df_forecast.to_dict("records"):
+        if rng.random() < 0.02:
+            continue
+        positions = rng.sample(range(1, 7), 3)
+        for idx in range(3):
+            dog = rec.get(f"forecast_{idx + 1}")
+            if not dog:
+                continue
+            rows.append(
+                {
+                    "date": rec["date"],
+                    "track": rec["track"],
+                    "hhmm": rec["hhmm"],
+                    "dog_name": dog,
+                    "position": positions[idx],
+                    "bsp": round(rng.uniform(1.5, 15.0), 2) if rng.random() > 0.01 else None,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def check_live_parity(df_forecast: pd.DataFrame) -> None:
+    """As apostas da combinação do ``config.py`` = seleções exportadas ao MarketFeeder."""
+    # Resultado para todos os cães do forecast, para nenhuma seleção ficar de fora da liquidação.
+    full = df_forecast.melt(
+        id_vars=["date", "track", "hhmm"], value_vars=["forecast_1", "forecast_2", "forecast_3"], value_name="dog_name"
+    ).assign(position=2, bsp=2.0)
+    bets = prepare_bets(df_forecast, full, _COMMISSION)
+    tags = np.array([_strategy_for_category(cat)[0] for cat in bets.categories] or [None], dtype=object)
+    placed = tags[bets.category_codes] if len(bets.categories) else np.array([], dtype=object)
+    _, audit, *_ = build_lines_and_audit(df_forecast)
+    expected = audit["strategy_tag"].value_counts().to_dict() if not audit.empty else {}
+    got = pd.Series(placed[pd.notna(placed)]).value_counts().to_dict()
+    assert got == expected, (got, expected)
+    row = evaluate(bets, [(tuple(settings.BACK_CATEGORY_PREFIXES), tuple(settings.LAY_CATEGORY_PREFIXES))], [(1.0, 1.0)])[0]
+    assert (row["back_bets"], row["lay_bets"]) == (expected.get("BACK", 0), expected.get("LAY", 0)), row
+
+
+def _naive(bets, back_prefixes, lay_prefixes, stake_back, stake_lay) -> tuple[float, int, float]:
+    pnl, peak, drawdown, wins = 0.0, 0.0, 0.0, 0
+    for code, back_unit, lay_unit, won in zip(bets.category_codes, bets.back_unit, bets.lay_unit, bets.dog_won):
+        cat = bets.categories[code]
+        if any(cat.startswith(p) for p in back_prefixes):
+            pnl += stake_back * back_unit
+            wins += bool(won)
+        elif any(cat.startswith(p) for p in lay_prefixes):
+            pnl += stake_lay * lay_unit
+            wins += not won
+        else:
+            continue
+        peak = max(peak, pnl)
+        drawdown = max(drawdown, peak - pnl)
+    return pnl, wins, drawdown
+
+
+def check_naive(bets, prefix_pairs, stake_pairs, sample: int = 6) -> None:
+    rng = random.Random(3)
+    for back_prefixes, lay_prefixes in rng.sample(prefix_pairs, min(sample, len(prefix_pairs))):
+        rows = evaluate(bets, [(back_prefixes, lay_prefixes)], stake_pairs)
+        for row in rows:
+            pnl, wins, drawdown = _naive(bets, back_prefixes, lay_prefixes, row["stake_back"], row["stake_lay"])
+            assert abs(row["pnl"] - pnl) < 0.01 and row["wins"] == wins, (row, pnl, wins)
+            assert abs(row["max_drawdown"] - drawdown) < 0.01, (row, drawdown)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--races", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=0, help="0 = um processo por CPU")
+    args = parser.parse_args()
+
+    logger.disable("src.mktfeeder_greyhounds.pipeline.build_marketfeeder_import")
+
+    df_forecast = synthetic_forecast(args.races)
+    df_results = synthetic_results(df_forecast)
+    check_live_parity(df_forecast)
+
+    started = time.perf_counter()
+    bets = prepare_bets(df_forecast, df_results, _COMMISSION)
+    t_prepare = time.perf_counter() - started
+    prefix_pairs = prefix_grid(["A", "OR", "S", "I"], ["D", "HP", "HC"])
+    stake_pairs = [(b, lay) for b in (0.5, 1.0, 2.0) for lay in (0.5, 1.0, 2.0)]
+    check_naive(bets, prefix_pairs, stake_pairs)
+    print(
+        f"{bets.races} corridas | {len(bets.category_codes)} apostas liquidadas ({bets.unsettled} sem resultado) "
+        f"em {t_prepare:.2f}s | grade: {len(prefix_pairs)} prefixos x {len(stake_pairs)} stakes (conferida)"
+    )
+
+    timings = {}
+    for label, workers in (("1 processo", 1), ("pool", args.workers)):
+        started = time.perf_counter()
+        table = run_grid(bets, prefix_pairs, stake_pairs, workers)
+        timings[label] = time.perf_counter() - started
+        print(f"{label:<11}: {timings[label]:7.2f}s ({len(table)} combinações)")
+    print(f"speedup: {timings['1 processo'] / timings['pool']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
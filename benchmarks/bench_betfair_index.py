@@ -0,0 +1,248 @@
+"""Compara a leitura do índice Betfair: WebDriver corrida a corrida x ``page_source`` único.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_betfair_index                 # offline: parse do fixture + driver simulado
+    python -m benchmarks.bench_betfair_index --rtt-ms 3      # latência simulada por comando ao chromedriver
+    python -m benchmarks.bench_betfair_index --chrome        # antes/depois num Chrome real (file://)
+
+O driver simulado responde aos mesmos seletores do scraper antigo sobre o HTML do fixture e
+conta cada comando como um round-trip; ``--rtt-ms`` soma uma espera por comando (o custo
+típico de um comando local ao chromedriver fica entre 1 e 5 ms).
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from urllib.parse import urljoin
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.scrapers.betfair_parse import parse_betfair_index
+from src.mktfeeder_greyhounds.scrapers.timeform_parse import Node, parse_html
+from src.mktfeeder_greyhounds.utils.dates import hhmm_to_today_iso
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "betfair_index.html"
+
+_MEETINGS_CSS = ".country-content li.meeting-item, li.meeting-item"
+_RACE_LINKS_CSS = "ul.race-list li.race-information a.race-link"
+
+
+# --- Extração "antes": uma chamada ao chromedriver por elemento/atributo. ---
+
+
+def _legacy_rows(driver, base_url: str) -> List[Dict[str, str]]:
+    from selenium.webdriver.common.by import By
+
+    rows: List[Dict[str, str]] = []
+    meetings = driver.find_elements(By.CSS_SELECTOR, _MEETINGS_CSS)
+    if not meetings:
+        meetings = driver.find_elements(By.CSS_SELECTOR, ".meeting-label")
+    for meeting in meetings:
+        track_name = ""
+        try:
+            track_name = meeting.find_element(By.CSS_SELECTOR, ".meeting-label").text.strip()
+        except Exception:
+            try:
+                track_name = meeting.text.strip()
+            except Exception:
+                pass
+        race_links = []
+        try:
+            race_links = meeting.find_elements(By.CSS_SELECTOR, _RACE_LINKS_CSS)
+        except Exception:
+            pass
+        for anchor in race_links:
+            try:
+                time_label = anchor.find_element(By.CSS_SELECTOR, ".label").text.strip()
+            except Exception:
+                time_label = ""
+            href = anchor.get_attribute("href") or anchor.get_attribute("ng-href") or anchor.get_attribute("data-href")
+            if not href:
+                href = anchor.get_attribute("attr.href") or ""
+            if href and not href.startswith("http"):
+                href = urljoin(base_url, href)
+            rows.append(
+                {
+                    "track_name": track_name,
+                    "race_time_label": time_label,
+                    "race_time_iso": hhmm_to_today_iso(time_label) if time_label else "",
+                    "race_url": href,
+                }
+            )
+    return rows
+
+
+def _snapshot_rows(driver, base_url: str) -> List[Dict[str, str]]:
+    return parse_betfair_index(driver.page_source, base_url)
+
+
+# --- Driver simulado sobre o fixture ---
+
+
+class _FakeElement:
+    """Elemento com a API usada pelo scraper antigo; cada chamada passa pelo contador do driver."""
+
+    def __init__(self, driver: "_FakeDriver", node: Node) -> None:
+        self._driver = driver
+        self._node = node
+
+    def _matches(self, css: str) -> List[Node]:
+        node = self._node
+        if css == ".meeting-label":
+            return node.find_all(cls="meeting-label")
+        if css == ".label":
+            return node.find_all(cls="label")
+        if css == _MEETINGS_CSS:
+            return node.find_all("li", "meeting-item")
+        if css == _RACE_LINKS_CSS:
+            return [
+                a
+                for a in node.find_all("a", "race-link")
+                if a.parent is not None and "race-information" in a.parent.classes
+            ]
+        raise ValueError(f"seletor não suportado no driver simulado: {css}")
+
+    def find_elements(self, by, css: str) -> List["_FakeElement"]:
+        self._driver.command()
+        return [_FakeElement(self._driver, n) for n in self._matches(css)]
+
+    def find_element(self, by, css: str) -> "_FakeElement":
+        self._driver.command()
+        found = self._matches(css)
+        if not found:
+            raise LookupError(css)
+        return _FakeElement(self._driver, found[0])
+
+    def get_attribute(self, name: str) -> str | None:
+        self._driver.command()
+        value = self._node.attrs.get(name)
+        if name == "href" and value:
+            return urljoin(self._driver.current_url, value)
+        return value
+
+    @property
+    def text(self) -> str:
+        self._driver.command()
+        return self._node.text
+
+
+class _FakeDriver(_FakeElement):
+    def __init__(self, html: str, rtt_sec: float) -> None:
+        self.current_url = settings.BETFAIR_GREYHOUND_RACING_URL
+        self.commands = 0
+        self._html = html
+        self._rtt_sec = rtt_sec
+        super().__init__(self, parse_html(html))
+
+    def command(self) -> None:
+        self.commands += 1
+        if self._rtt_sec:
+            time.sleep(self._rtt_sec)
+
+    @property
+    def page_source(self) -> str:
+        self.command()
+        return self._html
+
+
+# --- Medição ---
+
+
+def _timeit(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _report(label: str, samples: List[float], round_trips: int | None = None) -> None:
+    extra = f" | round-trips={round_trips}" if round_trips is not None else ""
+    print(
+        f"{label:<30} mediana={statistics.median(samples):9.2f} ms  "
+        f"min={min(samples):9.2f} ms  max={max(samples):9.2f} ms{extra}"
+    )
+
+
+def _check(before: List[Dict[str, str]], after: List[Dict[str, str]]) -> None:
+    if before != after:
+        diff = next((i for i, (b, a) in enumerate(zip(before, after)) if b != a), min(len(before), len(after)))
+        print(f"AVISO: resultados divergentes ({len(before)} x {len(after)} linhas; 1ª diferença na linha {diff})")
+    else:
+        print(f"{len(after)} corridas (idênticas)")
+
+
+def _count_round_trips(driver, fn: Callable[[object], object]) -> int:
+    """Conta os comandos enviados ao chromedriver durante uma extração."""
+    original = driver.execute
+    calls = 0
+
+    def counting_execute(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(*args, **kwargs)
+
+    driver.execute = counting_execute
+    try:
+        fn(driver)
+    finally:
+        driver.execute = original
+    return calls
+
+
+def bench_offline(repeat: int, rtt_ms: float) -> None:
+    html = FIXTURE.read_text(encoding="utf-8")
+    _report("parse_betfair_index (offline)", _timeit(lambda: parse_betfair_index(html), repeat))
+
+    driver = _FakeDriver(html, rtt_ms / 1000)
+    _check(_legacy_rows(driver, settings.BETFAIR_GREYHOUND_RACING_URL), _snapshot_rows(driver, settings.BETFAIR_GREYHOUND_RACING_URL))
+    legacy_repeat = max(1, repeat // 10) if rtt_ms else repeat
+    for label, fn, runs in (
+        ("antes (WebDriver por corrida)", _legacy_rows, legacy_repeat),
+        ("depois (page_source único)", _snapshot_rows, repeat),
+    ):
+        driver.commands = 0
+        samples = _timeit(lambda: fn(driver, settings.BETFAIR_GREYHOUND_RACING_URL), runs)
+        _report(f"{label}", samples, driver.commands // runs)
+
+
+def bench_chrome(repeat: int) -> None:
+    from src.mktfeeder_greyhounds.utils.selenium_driver import build_chrome_driver
+
+    driver = build_chrome_driver()
+    try:
+        driver.get(FIXTURE.as_uri())
+        base_url = driver.current_url
+        _check(_legacy_rows(driver, base_url), _snapshot_rows(driver, base_url))
+        _report(
+            "Chrome antes (WebDriver)",
+            _timeit(lambda: _legacy_rows(driver, base_url), max(1, repeat // 10)),
+            _count_round_trips(driver, lambda d: _legacy_rows(d, base_url)),
+        )
+        _report(
+            "Chrome depois (page_source)",
+            _timeit(lambda: _snapshot_rows(driver, base_url), repeat),
+            _count_round_trips(driver, lambda d: _snapshot_rows(d, base_url)),
+        )
+    finally:
+        driver.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="latência simulada por comando no driver offline")
+    parser.add_argument("--chrome", action="store_true", help="Mede também no Chrome (requer Chrome instalado).")
+    args = parser.parse_args()
+
+    bench_offline(args.repeat, args.rtt_ms)
+    if args.chrome:
+        bench_chrome(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
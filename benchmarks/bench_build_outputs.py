@@ -0,0 +1,160 @@
+"""Compara os builders de TOP3/FORECAST: ``iterrows`` (antes) x operações por coluna (depois).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_build_outputs                  # 500k linhas sintéticas
+    python -m benchmarks.bench_build_outputs --rows 50000
+    python -m benchmarks.bench_build_outputs --skip-legacy    # só a versão vetorizada
+
+Antes de medir, confere que as duas versões geram DataFrames idênticos.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date
+
+import pandas as pd
+from loguru import logger
+
+from src.mktfeeder_greyhounds.pipeline.build_outputs import build_forecast, build_top3
+from src.mktfeeder_greyhounds.utils.dates import iso_to_hhmm
+from src.mktfeeder_greyhounds.utils.text import normalize_category, normalize_spaces
+
+_TRACKS = ["Romford", "Towcester", "Hove", "  Sheffield ", "Monmore\tGreen", "Shelbourne Park", "Perry Barr"]
+_CATEGORIES = ["A5", "a 3", "OR", "D3", "HP", "S1", "I-V", "UNK", ""]
+_DOGS = ["Droopys Jet", "Ballymac  Eske", "Swords Rex", "Kinda Keen", "Lenson Bocko", "Rising Brandy"]
+
+
+# --- Builders "antes": cópia da implementação com iterrows (sem o warning por linha). ---
+
+
+def _legacy_build_top3(df_raw: pd.DataFrame) -> pd.DataFrame:
+    rows = []
+    for _, row in df_raw.iterrows():
+        dog1 = normalize_spaces(str(row.get("TimeformTop1") or "")).strip()
+        dog2 = normalize_spaces(str(row.get("TimeformTop2") or "")).strip()
+        dog3 = normalize_spaces(str(row.get("TimeformTop3") or "")).strip()
+        if not (dog1 and dog2 and dog3):
+            continue
+        hhmm_val = str(row.get("hhmm") or "") or iso_to_hhmm(str(row.get("race_time_iso") or ""))
+        rows.append(
+            {
+                "date": str(row.get("date") or date.today().isoformat()),
+                "track": normalize_spaces(str(row.get("track") or "")),
+                "hhmm": hhmm_val,
+                "category_raw": normalize_spaces(str(row.get("category_raw") or "")),
+                "category_norm": normalize_category(str(row.get("category_norm") or "")),
+                "dog_1": dog1,
+                "dog_2": dog2,
+                "dog_3": dog3,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _legacy_build_forecast(df_raw: pd.DataFrame) -> pd.DataFrame:
+    rows = []
+    for _, row in df_raw.iterrows():
+        f1 = row.get("Forecast1") or row.get("forecast_1") or ""
+        f2 = row.get("Forecast2") or row.get("forecast_2") or ""
+        f3 = row.get("Forecast3") or row.get("forecast_3") or ""
+        if not f1 or not (f2 and f3):
+            continue
+        rows.append(
+            {
+                "date": row.get("date"),
+                "track": row.get("track"),
+                "hhmm": row.get("hhmm"),
+                "category_raw": row.get("category_raw"),
+                "category_norm": row.get("category_norm"),
+                "forecast_1": f1,
+                "forecast_2": f2,
+                "forecast_3": f3,
+                "forecast_1_odds": row.get("Forecast1Odds") or row.get("forecast_1_odds"),
+                "forecast_2_odds": row.get("Forecast2Odds") or row.get("forecast_2_odds"),
+                "forecast_3_odds": row.get("Forecast3Odds") or row.get("forecast_3_odds"),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def synthetic_raw(n_rows: int, seed: int = 7) -> pd.DataFrame:
+    """Raw no formato do timeform_forecast, com buracos (None/""/NaN) como nos arquivos reais."""
+    rng = random.Random(seed)
+
+    def dog() -> object:
+        roll = rng.random()
+        if roll < 0.03:
+            return rng.choice([None, "", float("nan")])
+        return rng.choice(_DOGS)
+
+    def odds() -> object:
+        roll = rng.random()
+        if roll < 0.05:
+            return rng.choice([None, 0.0, float("nan")])
+        return round(rng.uniform(1.5, 12.0), 2)
+
+    rows = []
+    for _ in range(n_rows):
+        hh, mm = rng.randint(10, 22), rng.choice(range(0, 60, 3))
+        hhmm = f"{hh:02d}:{mm:02d}"
+        rows.append(
+            {
+                "date": "2024-05-01" if rng.random() > 0.01 else None,
+                "track": rng.choice(_TRACKS),
+                "track_key": "",
+                "hhmm": hhmm if rng.random() > 0.02 else "",
+                "race_time_iso": f"2024-05-01T{hhmm}",
+                "category_raw": rng.choice(_CATEGORIES),
+                "category_norm": rng.choice(_CATEGORIES),
+                "TimeformTop1": dog(),
+                "TimeformTop2": dog(),
+                "TimeformTop3": dog(),
+                "Forecast1": dog(),
+                "Forecast2": dog(),
+                "Forecast3": dog(),
+                "Forecast1Odds": odds(),
+                "Forecast2Odds": odds(),
+                "Forecast3Odds": odds(),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _timed(fn, df_raw: pd.DataFrame) -> tuple[float, pd.DataFrame]:
+    started = time.perf_counter()
+    out = fn(df_raw)
+    return time.perf_counter() - started, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--skip-legacy", action="store_true", help="não roda a versão com iterrows")
+    args = parser.parse_args()
+
+    # O resumo de linhas ignoradas não interessa aqui.
+    logger.disable("src.mktfeeder_greyhounds.pipeline.build_outputs")
+
+    df_raw = synthetic_raw(args.rows)
+    print(f"Raw sintético: {len(df_raw)} linhas")
+    for label, new_fn, legacy_fn in (
+        ("TOP3", build_top3, _legacy_build_top3),
+        ("FORECAST", build_forecast, _legacy_build_forecast),
+    ):
+        t_new, out_new = _timed(new_fn, df_raw)
+        if args.skip_legacy:
+            print(f"{label:<9} vetorizado: {t_new:8.2f}s ({len(out_new)} linhas)")
+            continue
+        t_old, out_old = _timed(legacy_fn, df_raw)
+        pd.testing.assert_frame_equal(out_new, out_old)
+        print(
+            f"{label:<9} iterrows: {t_old:8.2f}s | vetorizado: {t_new:8.2f}s | "
+            f"{t_old / t_new if t_new else float('inf'):6.1f}x | {len(out_new)} linhas (idênticas)"
+        )
+
+
+if __name__ == "__main__":
+    main()
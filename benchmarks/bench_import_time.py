@@ -0,0 +1,138 @@
+"""Tempo de import dos scripts (``python -X importtime``) com orçamento e módulos proibidos.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_import_time                  # todos os scripts, orçamento padrão
+    python -m benchmarks.bench_import_time --budget-ms 80 --repeat 9
+    python -m benchmarks.bench_import_time --only scripts.build_marketfeeder_file --top 15
+
+Cada script é importado num processo novo; o custo de import de numpy, pandas e loguru
+(dependências reais de todos eles) é descontado na mesma medição, de modo que o orçamento
+vale para o código do projeto e independe da máquina. Sai com código 1 se algum script
+passar do orçamento ou importar selenium/webdriver-manager/requests, que só devem ser
+carregados quando há raspagem de fato.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+ENTRY_POINTS = (
+    "scripts.build_marketfeeder_file",
+    "scripts.build_outputs",
+    "scripts.load_warehouse",
+    "scripts.backtest",
+    "scripts.run_daily",
+    "scripts.run_daemon",
+    "scripts.backfill",
+)
+BASELINE = ("numpy", "pandas", "loguru")
+FORBIDDEN = ("selenium", "webdriver_manager", "requests")
+
+
+def _import_profile(modules: Tuple[str, ...]) -> Tuple[Dict[str, Tuple[int, int]], int, List[str]]:
+    """Importa ``modules`` num processo novo.
+
+    Retorna {módulo: (self_us, cumulativo_us)}, o tempo (us) das dependências de ``BASELINE``
+    (cada uma contada só onde não está dentro de outra, p.ex. numpy sob pandas) e os
+    módulos proibidos carregados.
+    """
+    code = (
+        "import sys\n"
+        + "".join(f"import {module}\n" for module in modules)
+        + f"print(','.join(m for m in {FORBIDDEN!r} if m in sys.modules))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: Dict[str, Tuple[int, int]] = {}
+    # -X importtime lista cada módulo depois dos que ele importou, indentado pela profundidade:
+    # ao fechar um nó, as entradas mais profundas pendentes são descendentes dele.
+    baseline_hits: List[Tuple[int, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len("import time:") :].split("|")
+        name = raw_name.strip()
+        depth = len(raw_name) - len(raw_name.lstrip())
+        prev = timings.get(name, (0, 0))
+        timings[name] = (prev[0] + int(self_us), prev[1] + int(cumulative_us))
+        outer = [(d, us) for d, us in baseline_hits if d <= depth]
+        inner = sum(us for d, us in baseline_hits if d > depth)
+        if name in BASELINE:
+            baseline_hits = outer + [(depth, int(cumulative_us))]
+        elif inner:
+            baseline_hits = outer + [(depth, inner)]
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return timings, sum(us for _, us in baseline_hits), loaded
+
+
+def measure_entry(module: str, repeat: int) -> Tuple[float, float, List[str], Dict[str, Tuple[int, int]]]:
+    """Import de ``module`` em ``repeat`` processos.
+
+    Retorna o menor tempo total (ms), o menor tempo além de ``BASELINE`` (descontado na
+    mesma rodada: o import do pandas sozinho varia dezenas de ms entre processos), os módulos
+    proibidos carregados e o perfil da rodada com menor sobrecusto.
+    """
+    best_total, best_overhead, best_timings, loaded = float("inf"), float("inf"), {}, []
+    for _ in range(repeat):
+        timings, baseline_us, loaded = _import_profile((module,))
+        total_ms = timings[module][1] / 1000
+        overhead_ms = total_ms - baseline_us / 1000
+        best_total = min(best_total, total_ms)
+        if overhead_ms < best_overhead:
+            best_overhead, best_timings = overhead_ms, timings
+    return best_total, best_overhead, loaded, best_timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", help="scripts a medir (padrão: todos)")
+    parser.add_argument("--repeat", type=int, default=5, help="processos por script (vale o menor tempo)")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=100.0,
+        help="tempo máximo de import além de numpy + pandas + loguru (padrão: 100 ms)",
+    )
+    parser.add_argument("--top", type=int, default=0, help="lista os N módulos do projeto com maior tempo próprio")
+    args = parser.parse_args()
+
+    print(f"orçamento: +{args.budget_ms:.0f} ms além de {' + '.join(BASELINE)}")
+
+    failures = []
+    for module in args.only or ENTRY_POINTS:
+        total_ms, overhead_ms, loaded, timings = measure_entry(module, args.repeat)
+        status = "ok"
+        if overhead_ms > args.budget_ms:
+            status = "ACIMA DO ORÇAMENTO"
+            failures.append(module)
+        if loaded:
+            status = f"importa {', '.join(loaded)}"
+            failures.append(module)
+        print(f"{module:<34} {total_ms:7.0f} ms  (+{overhead_ms:4.0f} ms além de {'/'.join(BASELINE)})  {status}")
+        if args.top:
+            own = sorted(
+                ((name, self_us) for name, (self_us, _) in timings.items() if name.startswith(("src.", "scripts."))),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+            for name, self_us in own[: args.top]:
+                print(f"    {self_us / 1000:7.1f} ms  {name}")
+
+    if failures:
+        print(f"Falhas: {', '.join(dict.fromkeys(failures))}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
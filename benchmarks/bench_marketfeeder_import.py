@@ -0,0 +1,189 @@
+"""Compara ``build_lines_and_audit``: ``iterrows`` + records (antes) x colunas + melt (depois).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_marketfeeder_import                 # 200k corridas (~600k seleções)
+    python -m benchmarks.bench_marketfeeder_import --races 20000
+    python -m benchmarks.bench_marketfeeder_import --skip-legacy
+
+Antes de medir, confere que as duas versões geram exatamente as mesmas linhas, o mesmo
+CSV de auditoria (byte a byte) e os mesmos contadores (inclusive a ordem das chaves).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import pandas as pd
+from loguru import logger
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.pipeline.build_marketfeeder_import import build_lines_and_audit
+from src.mktfeeder_greyhounds.utils.dates import today_str
+from src.mktfeeder_greyhounds.utils.text import normalize_category, normalize_spaces
+
+_TRACKS = ["Romford", "Towcester", "Hove", " Sheffield", "Monmore  Green", "Shelbourne Park", "Perry Barr"]
+_CATEGORIES = ["A5", "a 3", "OR", "D3", "HP", "HC", "S1", "I-V", "UNK", "", None]
+_DOGS = ["Droopys Jet", "Ballymac  Eske", " Swords Rex", "Kinda Keen", "Lenson Bocko", "Rising Brandy"]
+
+
+# --- "Antes": cópia da implementação com iterrows (sem o log por corrida). ---
+
+
+def _legacy_strategy_for_category(category_norm: str) -> tuple[str | None, float | None]:
+    cat = normalize_category(category_norm)
+    if any(cat.startswith(prefix) for prefix in settings.BACK_CATEGORY_PREFIXES):
+        return "BACK", settings.STAKE_BACK
+    if any(cat.startswith(prefix) for prefix in settings.LAY_CATEGORY_PREFIXES):
+        return "LAY", settings.STAKE_LAY
+    return None, None
+
+
+def _legacy_build_lines_and_audit(df_forecast: pd.DataFrame):
+    lines: list[str] = []
+    audit_rows: list[dict[str, object]] = []
+    skipped_forecast_incomplete = 0
+    counts_by_strategy: dict[str, int] = {}
+    races_by_strategy: dict[str, int] = {}
+    exported_category_counts: dict[str, int] = {}
+    ignored_by_category_total = 0
+    ignored_category_counts: dict[str, int] = {}
+    records: list[dict[str, object]] = []
+
+    for _, row in df_forecast.iterrows():
+        track = normalize_spaces(str(row.get("track") or ""))
+        hhmm = str(row.get("hhmm") or "")
+        category_norm = normalize_category(str(row.get("category_norm") or ""))
+        category_raw = normalize_spaces(str(row.get("category_raw") or ""))
+        strategy_tag, stake = _legacy_strategy_for_category(category_norm)
+        if not strategy_tag or stake is None:
+            ignored_by_category_total += 1
+            ignored_category_counts[category_norm] = ignored_category_counts.get(category_norm, 0) + 1
+            continue
+
+        dogs = [
+            str(row.get("forecast_1") or "").strip(),
+            str(row.get("forecast_2") or "").strip(),
+            str(row.get("forecast_3") or "").strip(),
+        ]
+        if not dogs[0] or any(not d for d in dogs):
+            skipped_forecast_incomplete += 1
+            continue
+
+        races_by_strategy[strategy_tag] = races_by_strategy.get(strategy_tag, 0) + 1
+        if category_norm:
+            exported_category_counts[category_norm] = exported_category_counts.get(category_norm, 0) + 1
+        for order_idx, dog in enumerate(dogs):
+            records.append(
+                {
+                    "track": track,
+                    "hhmm": hhmm,
+                    "category_raw": category_raw,
+                    "category_norm": category_norm,
+                    "dog_name": normalize_spaces(dog),
+                    "strategy_tag": strategy_tag,
+                    "stake": stake,
+                    "order": order_idx,
+                }
+            )
+            counts_by_strategy[strategy_tag] = counts_by_strategy.get(strategy_tag, 0) + 1
+
+    sorted_records = sorted(records, key=lambda r: (r["hhmm"], r["track"], r["order"]))
+    for rec in sorted_records:
+        dog = normalize_spaces(rec["dog_name"])
+        lines.append(f"[{rec['hhmm']} {rec['track']}]{dog}\t\"{rec['strategy_tag']}\"\t{rec['stake']}")
+        audit_rows.append(
+            {
+                "date": today_str(),
+                "track": rec["track"],
+                "hhmm": rec["hhmm"],
+                "category_raw": rec["category_raw"],
+                "category_norm": rec["category_norm"],
+                "dog_name": rec["dog_name"],
+                "strategy_tag": rec["strategy_tag"],
+                "stake": rec["stake"],
+            }
+        )
+    if settings.KEEP_ALL_ACTIVE:
+        lines.append("#all_active#")
+    return (
+        lines,
+        pd.DataFrame(audit_rows),
+        skipped_forecast_incomplete,
+        counts_by_strategy,
+        races_by_strategy,
+        exported_category_counts,
+        ignored_by_category_total,
+        ignored_category_counts,
+    )
+
+
+def synthetic_forecast(n_races: int, seed: int = 11) -> pd.DataFrame:
+    """FORECAST no formato do ``forecast_YYYY-MM-DD.csv``, com horários/pistas repetidos (vários dias)."""
+    rng = random.Random(seed)
+
+    def dog() -> object:
+        return rng.choice([None, ""]) if rng.random() < 0.02 else rng.choice(_DOGS)
+
+    rows = []
+    for _ in range(n_races):
+        hhmm = f"{rng.randint(10, 22):02d}:{rng.choice(range(0, 60, 3)):02d}"
+        rows.append(
+            {
+                "date": f"2024-05-{rng.randint(1, 28):02d}",
+                "track": rng.choice(_TRACKS),
+                "hhmm": hhmm,
+                "category_raw": rng.choice(_CATEGORIES),
+                "category_norm": rng.choice(_CATEGORIES),
+                "forecast_1": dog(),
+                "forecast_2": dog(),
+                "forecast_3": dog(),
+                "forecast_1_odds": round(rng.uniform(1.5, 12.0), 2),
+                "forecast_2_odds": round(rng.uniform(1.5, 12.0), 2),
+                "forecast_3_odds": round(rng.uniform(1.5, 12.0), 2),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def assert_same(new, old) -> None:
+    lines_new, audit_new, *counters_new = new
+    lines_old, audit_old, *counters_old = old
+    assert lines_new == lines_old, "linhas diferentes"
+    assert audit_new.to_csv(index=False) == audit_old.to_csv(index=False), "auditoria diferente"
+    for value_new, value_old in zip(counters_new, counters_old):
+        if isinstance(value_old, dict):
+            assert list(value_new.items()) == list(value_old.items()), (value_new, value_old)
+        else:
+            assert value_new == value_old, (value_new, value_old)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--races", type=int, default=200_000)
+    parser.add_argument("--skip-legacy", action="store_true", help="não roda a versão com iterrows")
+    args = parser.parse_args()
+
+    logger.disable("src.mktfeeder_greyhounds.pipeline.build_marketfeeder_import")
+
+    df_forecast = synthetic_forecast(args.races)
+    print(f"FORECAST sintético: {len(df_forecast)} corridas")
+    started = time.perf_counter()
+    new = build_lines_and_audit(df_forecast)
+    t_new = time.perf_counter() - started
+    if args.skip_legacy:
+        print(f"vetorizado: {t_new:8.2f}s ({len(new[0])} linhas)")
+        return
+    started = time.perf_counter()
+    old = _legacy_build_lines_and_audit(df_forecast)
+    t_old = time.perf_counter() - started
+    assert_same(new, old)
+    print(
+        f"iterrows: {t_old:8.2f}s | vetorizado: {t_new:8.2f}s | "
+        f"{t_old / t_new if t_new else float('inf'):6.1f}x | {len(new[0])} linhas (idênticas)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Compara a extração por página de corrida: WebDriver elemento a elemento x snapshot único.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_race_extraction            # só parse offline do fixture
+    python -m benchmarks.bench_race_extraction --chrome   # antes/depois num Chrome real (file://)
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from src.mktfeeder_greyhounds.scrapers.timeform_parse import (
+    category_from_texts,
+    forecast_from_text,
+    parse_race_page,
+)
+from src.mktfeeder_greyhounds.utils.text import clean_dog_name
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "timeform_race.html"
+
+
+# --- Extração "antes": uma chamada ao chromedriver por elemento/atributo. ---
+
+
+def _legacy_extract_top3(driver) -> List[str]:
+    from selenium.webdriver.common.by import By
+
+    try:
+        container = driver.find_element(By.CSS_SELECTOR, ".rpf-verdict-container")
+        selections = container.find_elements(By.CSS_SELECTOR, ".rpf-verdict-selection")
+        top_names: List[str] = []
+        for selection in selections[:3]:
+            try:
+                name_el = selection.find_element(By.CSS_SELECTOR, ".rpf-verdict-selection-name a")
+                name = name_el.text.strip()
+                if name:
+                    top_names.append(clean_dog_name(name))
+            except Exception:
+                continue
+        return top_names
+    except Exception:
+        return []
+
+
+def _legacy_extract_betting_forecast(driver) -> List[Dict[str, object]]:
+    from selenium.webdriver.common.by import By
+
+    texts: List[str] = []
+    for xp in (
+        "//p[b[contains(., 'Betting Forecast')]]",
+        "//p[contains(., 'Betting Forecast')]",
+        "//*[contains(text(), 'Betting Forecast')]",
+    ):
+        try:
+            txt = driver.find_element(By.XPATH, xp).text.strip()
+            if txt:
+                texts.append(txt)
+                break
+        except Exception:
+            continue
+    if not texts:
+        try:
+            body_text = driver.find_element(By.TAG_NAME, "body").text
+            if "Betting Forecast" in body_text:
+                texts.append(body_text)
+        except Exception:
+            pass
+    return forecast_from_text(texts[0]) if texts else []
+
+
+def _legacy_extract_category(driver) -> str:
+    from selenium.webdriver.common.by import By
+
+    texts: List[str] = []
+    try:
+        el = driver.find_element(By.XPATH, "//*[contains(., 'Grade:')]")
+        if el and el.text:
+            texts.append(el.text)
+    except Exception:
+        pass
+    body_text = ""
+    try:
+        body_text = driver.find_element(By.TAG_NAME, "body").text
+        if body_text:
+            texts.append(body_text)
+    except Exception:
+        body_text = ""
+    return category_from_texts(texts, body_text)
+
+
+def _legacy_extract(driver) -> Dict[str, object]:
+    return {
+        "top3": _legacy_extract_top3(driver),
+        "forecast": _legacy_extract_betting_forecast(driver),
+        "category_raw": _legacy_extract_category(driver),
+    }
+
+
+def _snapshot_extract(driver) -> Dict[str, object]:
+    return parse_race_page(driver.page_source)
+
+
+# --- Medição ---
+
+
+def _timeit(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _report(label: str, samples: List[float], round_trips: int | None = None) -> None:
+    extra = f" | round-trips/página={round_trips}" if round_trips is not None else ""
+    print(
+        f"{label:<28} mediana={statistics.median(samples):8.2f} ms  "
+        f"min={min(samples):8.2f} ms  max={max(samples):8.2f} ms{extra}"
+    )
+
+
+def _count_round_trips(driver, fn: Callable[[object], object]) -> int:
+    """Conta os comandos enviados ao chromedriver durante uma extração."""
+    original = driver.execute
+    calls = 0
+
+    def counting_execute(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(*args, **kwargs)
+
+    driver.execute = counting_execute
+    try:
+        fn(driver)
+    finally:
+        driver.execute = original
+    return calls
+
+
+def bench_offline(repeat: int) -> None:
+    html = FIXTURE.read_text(encoding="utf-8")
+    _report("parse_race_page (offline)", _timeit(lambda: parse_race_page(html), repeat))
+
+
+def bench_chrome(repeat: int) -> None:
+    from src.mktfeeder_greyhounds.utils.selenium_driver import build_chrome_driver
+
+    driver = build_chrome_driver()
+    try:
+        driver.get(FIXTURE.as_uri())
+        before, after = _legacy_extract(driver), _snapshot_extract(driver)
+        if before != after:
+            print(f"AVISO: resultados divergentes\n  antes:  {before}\n  depois: {after}")
+        _report(
+            "antes (WebDriver por campo)",
+            _timeit(lambda: _legacy_extract(driver), repeat),
+            _count_round_trips(driver, _legacy_extract),
+        )
+        _report(
+            "depois (page_source único)",
+            _timeit(lambda: _snapshot_extract(driver), repeat),
+            _count_round_trips(driver, _snapshot_extract),
+        )
+    finally:
+        driver.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--chrome", action="store_true", help="Mede também no Chrome (requer Chrome instalado).")
+    args = parser.parse_args()
+
+    bench_offline(args.repeat)
+    if args.chrome:
+        bench_chrome(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Microbenchmark de ``normalize_track_name`` / ``clean_dog_name``: versão anterior x atual.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_text_normalization
+    python -m benchmarks.bench_text_normalization --repeat 20
+
+Confere primeiro o corpus dourado (``fixtures/text_golden.json``: nomes de pistas e cães
+com a saída da implementação anterior) e depois mede três cenários: implementação
+anterior, nova sem cache (uma passada a menos por etapa) e nova com cache LRU, chamando
+cada nome ``--repeat`` vezes como acontece entre listagem, scrape e builders.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, Iterable
+
+from src.mktfeeder_greyhounds.utils import text
+
+GOLDEN = Path(__file__).resolve().parent / "fixtures" / "text_golden.json"
+
+
+# --- "Antes": cópia da implementação anterior (sem cache, uma regex por etapa). ---
+
+_COUNTRY_SUFFIX_RE = re.compile(r"\s*\(([A-Z]{2,3})\)\s*$")
+_APOSTROPHES_RE = re.compile(r"[\u2019\u2018\']+")
+_NON_ALNUM_SPACE_RE = re.compile(r"[^0-9A-Za-z\s]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_PARENTHESIS_CONTENT_RE = re.compile(r"\s*\([^\)]*\)")
+_PROVIDER_PREFIX_RE = re.compile(
+    r"^(?:"
+    r"SIS(?:\s+TV)?"
+    r"|TRP"
+    r"|RPGTV"
+    r"|SKY\s+SPORTS(?:\s+RACING)?"
+    r"|SPORTY\s+STUFF"
+    r"|PREM\.?\s*GH(?:\s*RACING)?"
+    r"|PREMIER\s+GREYHOUNDS"
+    r"|RACING\s+POST"
+    r"|TIMEFORM\s+TV"
+    r"|IGOBF"
+    r"|ISGB"
+    r"|BAGS"
+    r"|VC"
+    r"|RCE"
+    r")\s*(?:-|/)?\s*",
+    re.IGNORECASE,
+)
+_DATE_TOKEN_RE = re.compile(r"\b\d{1,2}(?:st|nd|rd|th)?\b", re.IGNORECASE)
+_MONTH_TOKEN_RE = re.compile(
+    r"\b(?:"
+    r"Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|"
+    r"Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?"
+    r")\b",
+    re.IGNORECASE,
+)
+_SESSION_TOKEN_RE = re.compile(
+    r"\b(?:Matinee|Morning|Early|Late|Afternoon|Evening|Midnight|Night|Eve)\b",
+    re.IGNORECASE,
+)
+_DAY_TOKEN_RE = re.compile(
+    r"\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)(?:day)?\b",
+    re.IGNORECASE,
+)
+_COUNTRY_PREFIX_RE = re.compile(
+    r"^(?:Aus|Australia|Ire|Ireland|Nz|New\s+Zealand|Uk|United\s+Kingdom)\b\s*",
+    re.IGNORECASE,
+)
+_TRAILING_DOGS_RE = re.compile(r"\b(Dogs?|Dg)\b", re.IGNORECASE)
+_EMBEDDED_DAY_SUFFIX_RE = re.compile(r"(\d{1,2})(st|nd|rd|th)", re.IGNORECASE)
+_NUMERIC_CAMEL_RE = re.compile(r"(\D)(\d)")
+_VALLEY_TYPO_RE = re.compile(r"\bValey\b", re.IGNORECASE)
+_CANONICAL_OVERRIDES = {
+    "Shelbourne": "Shelbourne Park",
+    "Shelbourn": "Shelbourne Park",
+}
+
+
+def _legacy_normalize_spaces(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _legacy_strip_country_suffix(text: str) -> str:
+    return _COUNTRY_SUFFIX_RE.sub("", text)
+
+
+def _legacy_remove_apostrophes(text: str) -> str:
+    return _APOSTROPHES_RE.sub("", text)
+
+
+def _legacy_strip_accents(text: str) -> str:
+    nfkd = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in nfkd if not unicodedata.combining(c))
+
+
+def legacy_clean_dog_name(raw_name: str) -> str:
+    name = _legacy_strip_country_suffix(raw_name or "")
+    name = _legacy_normalize_spaces(name)
+    name = _legacy_remove_apostrophes(name)
+    name = _legacy_strip_accents(name)
+    name = _NON_ALNUM_SPACE_RE.sub(" ", name)
+    name = _legacy_normalize_spaces(name)
+    return name.title()
+
+
+def legacy_normalize_track_name(raw_name: str) -> str:
+    name = _legacy_normalize_spaces(str(raw_name or ""))
+    if not name:
+        return ""
+
+    name = name.replace("/", " ").replace("\\", " ").replace("-", " ")
+    name = _EMBEDDED_DAY_SUFFIX_RE.sub(r"\1", name)
+    name = _NUMERIC_CAMEL_RE.sub(r"\1 \2", name)
+    name = _PROVIDER_PREFIX_RE.sub("", name)
+    name = _PROVIDER_PREFIX_RE.sub("", name)
+    name = _COUNTRY_PREFIX_RE.sub("", name)
+    name = _PARENTHESIS_CONTENT_RE.sub("", name)
+    name = _DATE_TOKEN_RE.sub(" ", name)
+    name = _MONTH_TOKEN_RE.sub(" ", name)
+    name = _DAY_TOKEN_RE.sub(" ", name)
+    name = _SESSION_TOKEN_RE.sub(" ", name)
+    name = re.sub(r"\b\d{4}\b", " ", name)
+    name = _TRAILING_DOGS_RE.sub(" ", name)
+    name = re.sub(r"^The\s+", "", name, flags=re.IGNORECASE)
+    name = _legacy_normalize_spaces(name)
+    name = _legacy_remove_apostrophes(name)
+    name = _legacy_strip_accents(name)
+    name = re.sub(r"\bStadium\b", "", name, flags=re.IGNORECASE)
+    name = re.sub(r"\bGreyhound Stadium\b", "", name, flags=re.IGNORECASE)
+    name = re.sub(r"\bRacecourse\b", "", name, flags=re.IGNORECASE)
+    name = _NON_ALNUM_SPACE_RE.sub(" ", name)
+    name = _legacy_normalize_spaces(name).title()
+    name = _VALLEY_TYPO_RE.sub("Valley", name)
+    name = _CANONICAL_OVERRIDES.get(name, name)
+    if not name:
+        return _legacy_normalize_spaces(str(raw_name or "")).title()
+    return name
+
+
+def check_golden(golden: Dict[str, Dict[str, str]]) -> int:
+    """Retorna o número de divergências entre a implementação atual e o corpus."""
+    mismatches = 0
+    for label, fn in (("track", text.normalize_track_name), ("dog", text.clean_dog_name)):
+        for raw, expected in golden[label].items():
+            got = fn(raw)
+            if got != expected:
+                mismatches += 1
+                print(f"[{label}] {raw!r}: esperado {expected!r}, obtido {got!r}")
+    return mismatches
+
+
+def _time_calls(fn: Callable[[str], str], names: Iterable[str], repeat: int) -> float:
+    names = list(names)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for name in names:
+            fn(name)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="chamadas por nome")
+    args = parser.parse_args()
+
+    golden = json.loads(GOLDEN.read_text(encoding="utf-8"))
+    mismatches = check_golden(golden)
+    print(f"Corpus dourado: {len(golden['track'])} pistas, {len(golden['dog'])} cães | divergências: {mismatches}")
+    if mismatches:
+        raise SystemExit(1)
+
+    text.normalize_track_name.cache_clear()
+    text.clean_dog_name.cache_clear()
+    for label, legacy, uncached, cached in (
+        ("track", legacy_normalize_track_name, text._normalize_track_name, text.normalize_track_name),
+        ("dog", legacy_clean_dog_name, text._clean_dog_name, text.clean_dog_name),
+    ):
+        names = golden[label]
+        t_legacy = _time_calls(legacy, names, args.repeat)
+        t_uncached = _time_calls(uncached, names, args.repeat)
+        t_cached = _time_calls(cached, names, args.repeat)
+        calls = len(names) * args.repeat
+        print(
+            f"{label:<6} {calls} chamadas | anterior: {t_legacy * 1e6 / calls:6.1f}us | "
+            f"nova s/ cache: {t_uncached * 1e6 / calls:6.1f}us ({t_legacy / t_uncached:4.1f}x) | "
+            f"com cache: {t_cached * 1e6 / calls:6.2f}us ({t_legacy / t_cached:5.1f}x)"
+        )
+    print(f"Cache: {text.normalization_cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
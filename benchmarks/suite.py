@@ -0,0 +1,357 @@
+"""Suíte offline de benchmarks: parsers do Timeform, normalização de nomes e builders da pipeline.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.suite run                                  # grava data/benchmarks/bench_<timestamp>.json
+    python -m benchmarks.suite run --scale 0.1 --only build_        # entradas sintéticas menores / só alguns casos
+    python -m benchmarks.suite run --baseline data/benchmarks/bench_base.json
+    python -m benchmarks.suite compare base.json novo.json --threshold 0.15
+
+``compare`` (e ``run --baseline``) sai com código 1 quando algum caso ficou mais lento que
+o limiar, para servir de gate antes de um merge. A comparação usa o menor tempo de cada caso
+(como o ``timeit``), o número menos sensível a ruído; rode base e novo na mesma máquina ociosa.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.utils import text
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+RESULTS_DIR = settings.DATA_DIR / "benchmarks"
+
+# Cada caso recebe a escala e devolve (função medida, itens processados por chamada).
+Setup = Callable[[float], Tuple[Callable[[], object], int]]
+_CASES: Dict[str, Tuple[Setup, int]] = {}
+
+
+def case(name: str, repeat: int = 7) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        _CASES[name] = (setup, repeat)
+        return setup
+
+    return register
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def _golden() -> dict:
+    return json.loads(_fixture("text_golden.json"))
+
+
+# --- Timeform: texto do Betting Forecast ---
+
+
+@case("fractional_to_decimal")
+def _(scale: float):
+    from src.mktfeeder_greyhounds.scrapers.timeform_parse import _fractional_to_decimal
+
+    odds = ["7/4", "5/2", "4/1", "EVS", "evens", "11/10", "100/30", "16/1", "1/0", "abc", ""] * max(1, int(2000 * scale))
+    return (lambda: [_fractional_to_decimal(o) for o in odds]), len(odds)
+
+
+@case("parse_forecast_items")
+def _(scale: float):
+    from src.mktfeeder_greyhounds.scrapers.timeform_parse import _parse_forecast_items
+
+    forecast = "7/4 Swift Blaze, 5/2 Droopys Aoife, 4/1 Ballymac Tas, Coolavanny Bert 5/1, 8/1 Romeo Magico, EVS Kinda Keen"
+    texts = [forecast] * max(1, int(500 * scale))
+    return (lambda: [_parse_forecast_items(t) for t in texts]), len(texts)
+
+
+# --- Normalização de nomes (implementação sem cache e wrapper com cache quente) ---
+
+
+@case("normalize_track_name")
+def _(scale: float):
+    names = list(_golden()["track"])
+    return (lambda: [text._normalize_track_name(n) for n in names]), len(names)
+
+
+@case("normalize_track_name_cached")
+def _(scale: float):
+    names = list(_golden()["track"])
+    for n in names:
+        text.normalize_track_name(n)
+    return (lambda: [text.normalize_track_name(n) for n in names]), len(names)
+
+
+@case("clean_dog_name")
+def _(scale: float):
+    names = list(_golden()["dog"])
+    return (lambda: [text._clean_dog_name(n) for n in names]), len(names)
+
+
+@case("clean_dog_name_cached")
+def _(scale: float):
+    names = list(_golden()["dog"])
+    for n in names:
+        text.clean_dog_name(n)
+    return (lambda: [text.clean_dog_name(n) for n in names]), len(names)
+
+
+# --- Extração sobre HTML gravado ---
+
+
+@case("parse_html_race")
+def _(scale: float):
+    from src.mktfeeder_greyhounds.scrapers.timeform_parse import parse_html
+
+    html = _fixture("timeform_race.html")
+    return (lambda: parse_html(html)), 1
+
+
+@case("extract_top3")
+def _(scale: float):
+    from src.mktfeeder_greyhounds.scrapers.timeform_parse import extract_top3, parse_html
+
+    doc = parse_html(_fixture("timeform_race.html"))
+    return (lambda: extract_top3(doc)), 1
+
+
+@case("extract_betting_forecast")
+def _(scale: float):
+    from src.mktfeeder_greyhounds.scrapers.timeform_parse import extract_betting_forecast, parse_html
+
+    doc = parse_html(_fixture("timeform_race.html"))
+    return (lambda: extract_betting_forecast(doc)), 1
+
+
+@case("extract_category")
+def _(scale: float):
+    from src.mktfeeder_greyhounds.scrapers.timeform_parse import extract_category, parse_html
+
+    doc = parse_html(_fixture("timeform_race.html"))
+    return (lambda: extract_category(doc)), 1
+
+
+@case("parse_race_page")
+def _(scale: float):
+    from src.mktfeeder_greyhounds.scrapers.timeform_parse import parse_race_page
+
+    html = _fixture("timeform_race.html")
+    return (lambda: parse_race_page(html)), 1
+
+
+@case("parse_card_list")
+def _(scale: float):
+    from src.mktfeeder_greyhounds.scrapers.timeform_parse import parse_card_list
+
+    html = _fixture("timeform_cards.html")
+    return (lambda: parse_card_list(html)), 1
+
+
+@case("parse_betfair_index")
+def _(scale: float):
+    from src.mktfeeder_greyhounds.scrapers.betfair_parse import parse_betfair_index
+
+    html = _fixture("betfair_index.html")
+    return (lambda: parse_betfair_index(html)), 1
+
+
+# --- Pipeline sobre entradas sintéticas escaladas ---
+
+
+@case("build_forecast", repeat=5)
+def _(scale: float):
+    from benchmarks.bench_build_outputs import synthetic_raw
+    from src.mktfeeder_greyhounds.pipeline.build_outputs import build_forecast
+
+    df_raw = synthetic_raw(max(1, int(100_000 * scale)))
+    return (lambda: build_forecast(df_raw)), len(df_raw)
+
+
+@case("build_top3", repeat=5)
+def _(scale: float):
+    from benchmarks.bench_build_outputs import synthetic_raw
+    from src.mktfeeder_greyhounds.pipeline.build_outputs import build_top3
+
+    df_raw = synthetic_raw(max(1, int(100_000 * scale)))
+    return (lambda: build_top3(df_raw)), len(df_raw)
+
+
+@case("build_lines_and_audit", repeat=5)
+def _(scale: float):
+    from benchmarks.bench_marketfeeder_import import synthetic_forecast
+    from src.mktfeeder_greyhounds.pipeline.build_marketfeeder_import import build_lines_and_audit
+
+    df_forecast = synthetic_forecast(max(1, int(50_000 * scale)))
+    return (lambda: build_lines_and_audit(df_forecast)), len(df_forecast)
+
+
+@case("join_markets", repeat=5)
+def _(scale: float):
+    from benchmarks.bench_marketfeeder_import import synthetic_forecast
+    from src.mktfeeder_greyhounds.pipeline.market_join import MarketIndex, join_markets
+
+    df_forecast = synthetic_forecast(max(1, int(50_000 * scale)))
+    pairs = df_forecast[["track", "hhmm"]].drop_duplicates().itertuples(index=False)
+    # Um terço do índice com o nome da pista abreviado, forçando o casamento aproximado.
+    df_index = pd.DataFrame(
+        {
+            "track_name": track.split()[0] if i % 3 == 0 else track,
+            "race_time_label": hhmm,
+            "race_url": f"https://www.betfair.com/exchange/plus/en/greyhound-racing/market/1.{230000000 + i}",
+        }
+        for i, (track, hhmm) in enumerate(pairs)
+    )
+    index = MarketIndex.from_frame(df_index, settings.MARKET_JOIN_MIN_SIMILARITY)
+    return (lambda: join_markets(df_forecast, index)), len(df_forecast)
+
+
+# --- Medição / resultados ---
+
+
+def _measure(fn: Callable[[], object], repeat: int, min_sample_sec: float = 0.05) -> Tuple[List[float], int]:
+    """Amostras em ms por chamada; chamadas rápidas são agrupadas até ``min_sample_sec`` por amostra."""
+    fn()  # aquece caches/imports
+    gc.collect()
+    gc.disable()
+    try:
+        return _samples(fn, repeat, min_sample_sec)
+    finally:
+        gc.enable()
+
+
+def _samples(fn: Callable[[], object], repeat: int, min_sample_sec: float) -> Tuple[List[float], int]:
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_sample_sec or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_sample_sec / 10 else 2
+    samples = [elapsed / number * 1000]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number * 1000)
+    return samples, number
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10, cwd=FIXTURES.parent
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def run_suite(scale: float = 1.0, only: List[str] | None = None) -> dict:
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "scale": scale,
+        "cases": {},
+    }
+    for name, (setup, repeat) in _CASES.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        fn, items = setup(scale)
+        samples, number = _measure(fn, repeat)
+        median = statistics.median(samples)
+        report["cases"][name] = {
+            "median_ms": round(median, 4),
+            "min_ms": round(min(samples), 4),
+            "max_ms": round(max(samples), 4),
+            "mean_ms": round(statistics.fmean(samples), 4),
+            "stdev_ms": round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0,
+            "repeat": repeat,
+            "number": number,
+            "items": items,
+            "us_per_item": round(median * 1000 / items, 4) if items else None,
+        }
+        print(f"{name:<30} mediana={median:10.3f} ms  min={min(samples):10.3f} ms  ({items} itens, {number}x{repeat})")
+    return report
+
+
+def compare(base: dict, new: dict, threshold: float, min_delta_ms: float = 0.0) -> List[str]:
+    """Imprime a comparação (menor tempo) dos casos do relatório novo e retorna os que regrediram."""
+    if base.get("scale") != new.get("scale"):
+        print(f"AVISO: escalas diferentes (base={base.get('scale')}, novo={new.get('scale')}); compare com cuidado.")
+    regressions: List[str] = []
+    print(f"{'caso':<30} {'base ms':>12} {'novo ms':>12} {'variação':>9}")
+    for name, new_case in new["cases"].items():
+        old_case = base["cases"].get(name)
+        if old_case is None:
+            print(f"{name:<30} {'-':>12} {new_case['min_ms']:12.3f} {'(novo)':>9}")
+            continue
+        old_ms, new_ms = old_case["min_ms"], new_case["min_ms"]
+        change = new_ms / old_ms - 1 if old_ms else 0.0
+        flag = ""
+        if change > threshold and new_ms - old_ms > min_delta_ms:
+            flag = "  REGRESSÃO"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  melhora"
+        print(f"{name:<30} {old_ms:12.3f} {new_ms:12.3f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def _load(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_p = sub.add_parser("run", help="roda a suíte e grava o JSON")
+    run_p.add_argument("--scale", type=float, default=1.0, help="multiplica o tamanho das entradas sintéticas")
+    run_p.add_argument("--only", nargs="*", help="só casos cujo nome contém algum dos trechos")
+    run_p.add_argument("--out", type=Path, help="arquivo JSON (padrão: data/benchmarks/bench_<timestamp>.json)")
+    run_p.add_argument("--baseline", type=Path, help="JSON anterior para comparar ao final")
+    cmp_p = sub.add_parser("compare", help="compara dois JSONs e falha se houver regressão")
+    cmp_p.add_argument("base", type=Path)
+    cmp_p.add_argument("new", type=Path)
+    for p in (run_p, cmp_p):
+        p.add_argument("--threshold", type=float, default=0.15, help="regressão = menor tempo > base * (1 + limiar)")
+        p.add_argument("--min-delta-ms", type=float, default=0.0, help="ignora diferenças absolutas menores que isto")
+    args = parser.parse_args()
+
+    # Resumos de linhas ignoradas dos builders não interessam aqui.
+    logger.disable("src.mktfeeder_greyhounds.pipeline")
+
+    if args.command == "compare":
+        regressions = compare(_load(args.base), _load(args.new), args.threshold, args.min_delta_ms)
+    else:
+        report = run_suite(args.scale, args.only)
+        out = args.out or RESULTS_DIR / f"bench_{datetime.now():%Y-%m-%d_%H%M%S}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Resultados: {out}")
+        if args.baseline is None:
+            return
+        regressions = compare(_load(args.baseline), report, args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"{len(regressions)} caso(s) com regressão acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Backfill do FORECAST do Timeform para um intervalo de datas (um processo por data).
+
+Uso (na raiz do projeto):
+    python -m scripts.backfill --start 2024-05-01 --end 2024-05-31
+    python -m scripts.backfill --start 2024-05-01 --end 2024-05-07 --workers 4 --backend http
+    python -m scripts.backfill --start 2024-05-03 --force     # refaz um dia já gravado
+
+Gera ``timeform_forecast_YYYY-MM-DD`` por data. Dias já gravados são pulados; uma data
+interrompida é retomada do journal na próxima execução.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+# Garante que o projeto esteja no PYTHONPATH mesmo quando o script é iniciado via atalho.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.mktfeeder_greyhounds.pipeline.backfill import run as run_backfill
+from src.mktfeeder_greyhounds.logger import get_logger
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="primeiro dia (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="último dia (YYYY-MM-DD; padrão: --start)")
+    parser.add_argument("--workers", type=int, help="processos (padrão: BACKFILL_WORKERS)")
+    parser.add_argument("--backend", choices=("selenium", "http"), help="padrão: TIMEFORM_BACKEND")
+    parser.add_argument("--force", action="store_true", help="refaz dias que já têm o dataset gravado")
+    args = parser.parse_args()
+
+    logger = get_logger()
+    end = args.end or args.start
+    if end < args.start:
+        parser.error("--end anterior a --start")
+    results = run_backfill(args.start, end, workers=args.workers, backend=args.backend, force=args.force)
+    if any(result["error"] for result in results):
+        logger.warning("Há datas com falha; execute o mesmo comando para retomá-las.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
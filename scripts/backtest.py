@@ -0,0 +1,61 @@
+"""Backtest de prefixos/stakes BACK e LAY sobre o FORECAST histórico.
+
+Uso (na raiz do projeto):
+    python -m scripts.backtest --results data/results/results.csv
+    python -m scripts.backtest --since 2024-05-01 --back-pool A OR S --lay-pool D HP --stake-back 1 2 --stake-lay 1 2
+    python -m scripts.backtest --source warehouse --workers 4
+
+Sem ``--back-pool``/``--lay-pool`` a grade usa os subconjuntos dos prefixos do ``config.py``;
+sem ``--stake-back``/``--stake-lay``, os stakes do ``config.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Garante que o projeto esteja no PYTHONPATH mesmo quando o script é iniciado via atalho.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.mktfeeder_greyhounds.pipeline.backtest import run as run_backtest
+from src.mktfeeder_greyhounds.logger import get_logger
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=Path, help="CSV/Parquet com date, track, hhmm, dog_name, position, bsp")
+    parser.add_argument("--since", help="primeiro dia (YYYY-MM-DD)")
+    parser.add_argument("--until", help="último dia (YYYY-MM-DD)")
+    parser.add_argument("--source", choices=("files", "warehouse"), default="files")
+    parser.add_argument("--back-pool", nargs="*", help="prefixos candidatos para BACK")
+    parser.add_argument("--lay-pool", nargs="*", help="prefixos candidatos para LAY")
+    parser.add_argument("--stake-back", nargs="+", type=float)
+    parser.add_argument("--stake-lay", nargs="+", type=float)
+    parser.add_argument("--commission", type=float, help="comissão sobre ganhos (padrão: BACKTEST_COMMISSION)")
+    parser.add_argument("--workers", type=int, help="processos (0 = um por CPU; padrão: BACKTEST_WORKERS)")
+    parser.add_argument("--top", type=int, default=10, help="combinações exibidas no log")
+    args = parser.parse_args()
+
+    logger = get_logger()
+    table, out_path = run_backtest(
+        args.results,
+        since=args.since,
+        until=args.until,
+        source=args.source,
+        back_pool=args.back_pool,
+        lay_pool=args.lay_pool,
+        stakes_back=args.stake_back,
+        stakes_lay=args.stake_lay,
+        commission=args.commission,
+        workers=args.workers,
+    )
+    if table.empty:
+        return
+    logger.info("Melhores combinações (de {}):\n{}", out_path, table.head(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
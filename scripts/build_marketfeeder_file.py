@@ -1,10 +1,29 @@
+"""Gera os arquivos do MarketFeeder a partir do FORECAST do dia.
+
+Uso (na raiz do projeto):
+    python -m scripts.build_marketfeeder_file
+    python -m scripts.build_marketfeeder_file --profile    # cProfile/flamegraph/tracemalloc em data/profiles/
+"""
+
 from __future__ import annotations
 
+import argparse
+
 from src.mktfeeder_greyhounds.pipeline.build_marketfeeder_import import run
+from src.mktfeeder_greyhounds.logger import setup_logger
+from src.mktfeeder_greyhounds.utils.metrics import write_run_report
+from src.mktfeeder_greyhounds.utils.profiling import Profiler
 
 
 def main() -> None:
-    run()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", action="store_true", help="grava o perfil da etapa em data/profiles/")
+    args = parser.parse_args()
+
+    setup_logger()
+    with Profiler("build_marketfeeder_file", enabled=args.profile).stage("marketfeeder"):
+        run()
+    write_run_report("build_marketfeeder_file")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+"""Carrega o histórico de raw/forecast/auditoria no warehouse SQLite.
+
+Uso (na raiz do projeto):
+    python -m scripts.load_warehouse                      # todos os dias ainda não carregados/alterados
+    python -m scripts.load_warehouse --since 2024-05-01 --until 2024-05-31
+    python -m scripts.load_warehouse --force              # recarrega tudo
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Garante que o projeto esteja no PYTHONPATH mesmo quando o script é iniciado via atalho.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.mktfeeder_greyhounds.logger import setup_logger
+from src.mktfeeder_greyhounds.pipeline.load_warehouse import history_days, run as run_load
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", help="primeiro dia (YYYY-MM-DD)")
+    parser.add_argument("--until", help="último dia (YYYY-MM-DD)")
+    parser.add_argument("--force", action="store_true", help="recarrega mesmo os dias sem alteração")
+    args = parser.parse_args()
+
+    setup_logger()
+    days = [d for d in history_days() if (not args.since or d >= args.since) and (not args.until or d <= args.until)]
+    run_load(days, force=args.force, bulk=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Garante que o projeto esteja no PYTHONPATH mesmo quando o script é iniciado via atalho.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.mktfeeder_greyhounds.pipeline.daemon import run as run_daemon
+from src.mktfeeder_greyhounds.logger import get_logger
+from src.mktfeeder_greyhounds.utils.selenium_driver import set_browser_profile
+
+
+def main() -> None:
+    logger = get_logger()
+    set_browser_profile("run_daemon")
+    stats = run_daemon()
+    logger.info("Resumo do daemon: {}", stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,13 @@
+"""Fluxo completo do dia: scrape Timeform, TOP3/FORECAST, arquivo do MarketFeeder e warehouse.
+
+Uso (na raiz do projeto):
+    python -m scripts.run_daily
+    python -m scripts.run_daily --profile    # cProfile/flamegraph/tracemalloc por etapa em data/profiles/
+"""
+
 from __future__ import annotations
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -8,16 +16,41 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.mktfeeder_greyhounds.config import settings
 from src.mktfeeder_greyhounds.pipeline.daily_scrape import run as run_scrape
 from src.mktfeeder_greyhounds.pipeline.build_outputs import run as run_outputs
 from src.mktfeeder_greyhounds.pipeline.build_marketfeeder_import import run as run_marketfeeder
+from src.mktfeeder_greyhounds.pipeline.streaming import run as run_streaming
+from src.mktfeeder_greyhounds.pipeline.load_warehouse import run_autoload as load_warehouse
+from src.mktfeeder_greyhounds.utils.dates import today_str
+from src.mktfeeder_greyhounds.utils.metrics import stage, write_run_report
+from src.mktfeeder_greyhounds.utils.profiling import Profiler
+from src.mktfeeder_greyhounds.utils.selenium_driver import set_browser_profile
 from src.mktfeeder_greyhounds.logger import get_logger
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", action="store_true", help="grava perfis por etapa em data/profiles/")
+    args = parser.parse_args()
+
     logger = get_logger()
-    scrape_stats = run_scrape()
-    df_top3, df_forecast = run_outputs()
+    set_browser_profile("run_daily")
+    profiler = Profiler("run_daily", enabled=args.profile)
+    if settings.STREAMING_PUBLISH:
+        # No streaming, raspagem e publicação se intercalam: uma única etapa.
+        with stage("pipeline.streaming"), profiler.stage("streaming"):
+            scrape_stats, df_top3, df_forecast, marketfeeder_result = run_streaming()
+    else:
+        with stage("pipeline.scrape"), profiler.stage("scrape"):
+            scrape_stats = run_scrape()
+        with stage("pipeline.outputs"), profiler.stage("outputs"):
+            df_top3, df_forecast = run_outputs()
+        with stage("pipeline.marketfeeder"), profiler.stage("marketfeeder"):
+            marketfeeder_result = run_marketfeeder()
+    with stage("pipeline.warehouse"), profiler.stage("warehouse"):
+        load_warehouse(today_str())
+    write_run_report("run_daily")
     (
         fixed_path,
         hist_txt,
@@ -30,7 +63,7 @@ def main() -> None:
         exported_category_counts,
         ignored_by_category_total,
         ignored_category_counts,
-    ) = run_marketfeeder()
+    ) = marketfeeder_result
 
     logger.info(
         "Arquivos gerados: TOP3={} | FORECAST={} | MF_Fixo={} | MF_Hist={} | Audit={}",
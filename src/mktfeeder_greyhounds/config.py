@@ -1,45 +1,155 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
 def project_root() -> Path:
     """Retorna o diretório raiz do projeto (pasta MktFeeder)."""
     return Path(__file__).resolve().parents[2]
 
 
+def project_path(*parts: str | Path) -> Path:
+    """Caminho dentro do projeto, sem tocar no disco (quem grava cria o diretório)."""
+    return project_root().joinpath(*parts)
+
+
 def ensure_dir(*parts: str | Path) -> Path:
-    path = project_root().joinpath(*parts)
+    path = project_path(*parts)
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
 @dataclass(frozen=True)
 class Settings:
-    # Paths
-    DATA_DIR: Path = ensure_dir("data")
-    RAW_TIMEFORM_FORECAST_DIR: Path = ensure_dir("data", "raw", "timeform_forecast")
-    OUTPUT_TOP3_DIR: Path = ensure_dir("data", "output", "top3")
-    OUTPUT_FORECAST_DIR: Path = ensure_dir("data", "output", "forecast")
-    MARKETFEEDER_DIR: Path = ensure_dir("data", "output", "marketfeeder")
-    MARKETFEEDER_HISTORY_DIR: Path = ensure_dir("data", "output", "marketfeeder", "history")
+    # Paths (criados sob demanda na primeira gravação; importar a config não cria diretórios)
+    DATA_DIR: Path = project_path("data")
+    RAW_TIMEFORM_FORECAST_DIR: Path = project_path("data", "raw", "timeform_forecast")
+    RAW_BETFAIR_INDEX_DIR: Path = project_path("data", "raw", "betfair_index")
+    JOURNAL_DIR: Path = project_path("data", "raw", "journal")
+    OUTPUT_TOP3_DIR: Path = project_path("data", "output", "top3")
+    OUTPUT_FORECAST_DIR: Path = project_path("data", "output", "forecast")
+    MARKETFEEDER_DIR: Path = project_path("data", "output", "marketfeeder")
+    MARKETFEEDER_HISTORY_DIR: Path = project_path("data", "output", "marketfeeder", "history")
+    PAGE_CACHE_DIR: Path = project_path("data", "cache")
+    CHROME_PROFILE_DIR: Path = project_path("data", "chrome_profile")
 
     # Scraping
     BETFAIR_BASE_URL: str = "https://www.betfair.com/exchange/plus/"
     BETFAIR_GREYHOUND_RACING_URL: str = "https://www.betfair.com/exchange/plus/en/greyhound-racing-betting-4339"
     TIMEFORM_BASE_URL: str = "https://www.timeform.com/greyhound-racing"
+    USER_AGENT: str = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+    )
     SELENIUM_HEADLESS: bool = False
+    SELENIUM_PERSIST_PROFILE: bool = True
+    CHROMEDRIVER_PATH: str = ""  # vazio = resolvido pelo webdriver-manager (e lembrado em data/cache)
+    # Bloqueio de recursos via CDP (Network.setBlockedURLs): imagens, mídia, fontes e rastreadores.
+    SELENIUM_BLOCK_RESOURCES: bool = True
+    SELENIUM_BLOCKED_URL_PATTERNS: tuple[str, ...] = (
+        # imagens
+        "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",
+        # mídia / players
+        "*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*player.js*", "*brightcove*", "*jwplayer*",
+        # fontes
+        "*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+        # anúncios e rastreadores de terceiros
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+        "*adservice.google.*", "*facebook.net*", "*connect.facebook.*", "*hotjar.com*", "*scorecardresearch.com*",
+        "*quantserve.com*", "*criteo.*", "*taboola.com*", "*outbrain.com*", "*adnxs.com*", "*amazon-adsystem.com*",
+        "*bing.com/bat*", "*clarity.ms*", "*newrelic.com*", "*nr-data.net*", "*optimizely.com*",
+    )
+    # Padrões que NÃO devem ser bloqueados em determinado site: ((host, (padrões...)), ...)
+    SELENIUM_BLOCK_ALLOWLIST: tuple[tuple[str, tuple[str, ...]], ...] = (
+        ("www.betfair.com", ("*.svg*",)),
+    )
+    # Diagnóstico: lê o log de performance do Chrome a cada navegação (um round-trip extra por
+    # página). Ligar só em execuções de profiling.
+    SELENIUM_NETWORK_REPORT: bool = False
     SELENIUM_PAGELOAD_TIMEOUT_SEC: int = 45
     SELENIUM_IMPLICIT_WAIT_SEC: int = 5
     SELENIUM_EXPLICIT_WAIT_SEC: int = 15
     TIMEFORM_MIN_DELAY_SEC: float = 0.5
     TIMEFORM_MAX_DELAY_SEC: float = 1.0
+    # Delay adaptativo (AIMD): começa em TIMEFORM_MAX_DELAY_SEC; cada página saudável soma
+    # RATE_STEP ao ritmo (páginas/s) e page load lento, timeout ou extração falha (vazia/UNK)
+    # multiplicam o delay por BACKOFF, sempre entre FLOOR e CEILING.
+    # Desligado, volta ao sorteio fixo entre TIMEFORM_MIN_DELAY_SEC e TIMEFORM_MAX_DELAY_SEC.
+    TIMEFORM_ADAPTIVE_DELAY: bool = True
+    TIMEFORM_DELAY_FLOOR_SEC: float = 0.2
+    TIMEFORM_DELAY_CEILING_SEC: float = 10.0
+    TIMEFORM_RATE_STEP_PER_SEC: float = 0.05
+    TIMEFORM_DELAY_BACKOFF: float = 2.0
+    TIMEFORM_SLOW_PAGE_SEC: float = 6.0
+    TIMEFORM_WORKERS: int = 1
+    TIMEFORM_MAX_REQUESTS_PER_SEC: float = 2.0
+    # "selenium" (Chrome), "http" (requests + parser HTML) ou "async" (downloads concorrentes
+    # com token bucket); "http" e "async" caem no Selenium para páginas que não parseiam.
+    TIMEFORM_BACKEND: str = "selenium"
+    TIMEFORM_ASYNC_RATE_PER_SEC: float = 2.0
+    TIMEFORM_ASYNC_BURST: int = 4
+    TIMEFORM_ASYNC_CONCURRENCY: int = 8
+    HTTP_TIMEOUT_SEC: float = 20.0
+    HTTP_RETRIES: int = 2
+
+    # Incremental: reaproveita o raw do dia e só raspa corridas novas, UNK ou com forecast incompleto
+    INCREMENTAL_SCRAPE: bool = False
+
+    # Journal JSONL por corrida (retomada após crash); fsync em lotes de linhas ou segundos
+    JOURNAL_ENABLED: bool = True
+    JOURNAL_FSYNC_EVERY_ROWS: int = 10
+    JOURNAL_FSYNC_EVERY_SEC: float = 5.0
+
+    # Streaming: republica o import_selections.txt durante a raspagem (corridas mais próximas primeiro)
+    STREAMING_PUBLISH: bool = False
+    STREAM_PUBLISH_EVERY_RACES: int = 10
+    STREAM_PUBLISH_EVERY_SEC: float = 120.0
+
+    # Daemon (scripts.run_daemon): re-raspa cada corrida T-N minutos antes da largada e republica
+    DAEMON_REFRESH_OFFSETS_MIN: tuple[int, ...] = (60, 15)
+    DAEMON_WORKERS: int = 1
+    DAEMON_RELIST_EVERY_MIN: int = 60
+    DAEMON_MAX_IDLE_SEC: float = 60.0
+
+    # Backfill (scripts.backfill): um processo por data, com limite de page loads somado entre eles.
+    # A página de racecards de outra data precisa seguir o mesmo markup da home (lista de cards).
+    TIMEFORM_CARDS_BY_DATE_URL: str = "https://www.timeform.com/greyhound-racing/racecards/{date}"
+    BACKFILL_WORKERS: int = 2
+    BACKFILL_MAX_REQUESTS_PER_SEC: float = 2.0
+
+    # Cache de páginas (re-execuções no mesmo dia só vão à rede para entradas expiradas/ausentes)
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_TTL_SEC: int = 4 * 60 * 60
+    PAGE_CACHE_MAX_MB: float = 200.0
 
     # Export
     CSV_ENCODING: str = "utf-8-sig"
+    # "csv" ou "parquet" (requer pyarrow): raw/outputs/auditoria particionados por data
+    # em <dir>/date=YYYY-MM-DD/part-0.parquet; com STORAGE_CSV_EXPORT os CSVs continuam sendo gravados.
+    STORAGE_FORMAT: str = "csv"
+    STORAGE_CSV_EXPORT: bool = True
+    # Warehouse histórico (SQLite local): o dia é carregado ao fim de cada execução;
+    # o histórico completo é carregado com scripts.load_warehouse.
+    WAREHOUSE_PATH: Path = project_path("data", "warehouse.sqlite")
+    WAREHOUSE_AUTOLOAD: bool = True
+    # Métricas por etapa (p50/p95/max) em data/metrics/run_YYYY-MM-DD.json;
+    # METRICS_PROMETHEUS também grava data/metrics/mktfeeder.prom (textfile collector).
+    METRICS_ENABLED: bool = True
+    METRICS_DIR: Path = project_path("data", "metrics")
+    METRICS_PROMETHEUS: bool = False
+    # Saída do --profile (cProfile, pilhas "collapsed" e tracemalloc por etapa)
+    PROFILES_DIR: Path = project_path("data", "profiles")
     LOG_LEVEL: str = "INFO"
 
+    # Join Timeform x Betfair: o índice de mercados do dia é raspado junto com o Timeform e o
+    # FORECAST/auditoria ganham market_id e market_url (pista+horário exatos ou aproximados).
+    # None = automático: só com TIMEFORM_BACKEND="selenium" (o índice da Betfair exige o Chrome,
+    # que os backends http/async não abririam); True/False forçam.
+    MARKET_JOIN_ENABLED: bool | None = None
+    MARKET_JOIN_MIN_SIMILARITY: float = 0.8
+
     # Estratégia configurável
     STAKE_BACK: float = 1.0
     STAKE_LAY: float = 1.0
@@ -47,6 +157,12 @@ class Settings:
     LAY_CATEGORY_PREFIXES: tuple[str, ...] = ("D", "HP")
     KEEP_ALL_ACTIVE: bool = False
 
+    # Backtest (scripts.backtest): resultados locais com date, track, hhmm, dog_name, position, bsp
+    BACKTEST_RESULTS_PATH: Path = project_path("data", "results", "results.csv")
+    BACKTEST_DIR: Path = project_path("data", "output", "backtest")
+    BACKTEST_COMMISSION: float = 0.05
+    BACKTEST_WORKERS: int = 0  # 0 = um processo por CPU
+
     # Filtro de corridas passadas
     SKIP_PAST_RACES: bool = True
     PAST_RACE_GRACE_MINUTES: int = 2
@@ -54,5 +170,5 @@ class Settings:
 
 settings = Settings()
 
-__all__ = ["settings", "Settings", "ensure_dir", "project_root"]
+__all__ = ["settings", "Settings", "ensure_dir", "project_path", "project_root"]
 
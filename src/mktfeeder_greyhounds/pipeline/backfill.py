@@ -0,0 +1,173 @@
+"""Backfill do FORECAST do Timeform para um intervalo de datas.
+
+Cada data é raspada inteira por um processo do pool (``BACKFILL_WORKERS``), com o próprio
+Chrome (perfil ``backfill-N``) ou sessão HTTP; o total de page loads somado entre os
+processos fica limitado por ``BACKFILL_MAX_REQUESTS_PER_SEC`` (``SharedRateLimiter``).
+O resultado de cada data vai para o dataset ``timeform_forecast`` daquele dia.
+
+A retomada é por data: dias que já têm o dataset são pulados (salvo ``force``) e cada dia
+em andamento tem o próprio journal, então uma data interrompida continua de onde parou.
+Se alguma corrida falhar, o dia é gravado com o que houver mas o journal é mantido: a
+próxima execução volta a esse dia e só revisita as corridas que faltaram. Um dia sem
+nenhuma corrida (listagem vazia ou que não carregou) não é gravado e fica pendente.
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger, setup_logger
+from src.mktfeeder_greyhounds.scrapers.timeform import (
+    build_timeform_forecast_df,
+    scrape_timeform_forecast,
+    use_rate_limiter,
+)
+from src.mktfeeder_greyhounds.utils.files import dataset_days, save_dataset
+from src.mktfeeder_greyhounds.utils.journal import open_scrape_journal
+from src.mktfeeder_greyhounds.utils.rate_limit import SharedRateLimiter
+from src.mktfeeder_greyhounds.utils.selenium_driver import close_browser_session, set_browser_profile
+
+
+def date_range(start: date, end: date) -> List[date]:
+    """Datas de ``start`` a ``end`` (inclusive)."""
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+# Backend de cada processo (definido pelo initializer; o processo principal usa o do run).
+_WORKER_BACKEND = "selenium"
+
+
+def _worker_profile(worker_id: int) -> str:
+    return f"backfill-{worker_id}"
+
+
+def _init_worker(limiter: SharedRateLimiter, counter, backend: str) -> None:
+    """Prepara o processo: logs, limite global de page loads e um perfil de Chrome próprio."""
+    global _WORKER_BACKEND
+    setup_logger()
+    use_rate_limiter(limiter)
+    with counter.get_lock():
+        counter.value += 1
+        worker_id = counter.value
+    set_browser_profile(_worker_profile(worker_id))
+    _WORKER_BACKEND = backend
+
+
+def _has_journal(day: str) -> bool:
+    """Dia com journal pendente (execução interrompida ou corridas com falha)."""
+    journal = open_scrape_journal("timeform", day)
+    return journal is not None and journal.path.exists()
+
+
+def _backfill_day(day: str) -> Dict[str, object]:
+    """Raspa e grava um dia; erros voltam no resultado (o journal fica para a retomada)."""
+    started = time.monotonic()
+    journal = open_scrape_journal("timeform", day)
+    try:
+        rows, stats = scrape_timeform_forecast(
+            journal=journal,
+            race_date=date.fromisoformat(day),
+            workers=1,
+            backend=_WORKER_BACKEND,
+        )
+        if journal is not None:
+            # Com journal, o scraper só devolve as linhas que não couberam nele.
+            rows = itertools.chain(journal.rows(), rows)
+        df = build_timeform_forecast_df(rows)
+        failed = stats["failed"]
+        if df.empty:
+            # Sem dataset gravado o dia continua pendente (listagem vazia costuma ser falha de carga).
+            error = f"{failed} corridas com falha" if failed else "nenhuma corrida raspada"
+            return {"day": day, "races": 0, "failed": failed, "path": "", "error": error}
+        path = save_dataset(df, "timeform_forecast", day)
+        if journal is not None and not failed:
+            journal.discard()
+        error = f"{failed} corridas com falha" if failed else ""
+        return {"day": day, "races": len(df.index), "failed": failed, "path": str(path), "error": error}
+    except Exception as exc:
+        logger.error("Backfill {} falhou: {}", day, exc)
+        return {"day": day, "races": 0, "failed": 0, "path": "", "error": f"{type(exc).__name__}: {exc}"}
+    finally:
+        # Workers do pool saem sem rodar o atexit: o Chrome do processo é fechado aqui.
+        close_browser_session()
+        logger.info("Backfill {} em {:.1f}s", day, time.monotonic() - started)
+
+
+def run(
+    start: date,
+    end: date,
+    workers: int | None = None,
+    backend: str | None = None,
+    force: bool = False,
+) -> List[Dict[str, object]]:
+    """Raspa os dias de ``start`` a ``end`` e devolve o resultado de cada um, em ordem de data."""
+    global _WORKER_BACKEND
+    backend = backend or settings.TIMEFORM_BACKEND
+    if backend == "async":
+        # O download assíncrono tem token bucket próprio por processo; o limite global exige page loads síncronos.
+        logger.info("Backfill usa o backend http no lugar do async (limite global entre processos).")
+        backend = "http"
+
+    days = [day.isoformat() for day in date_range(start, end)]
+    saved = set() if force else set(dataset_days("timeform_forecast")) & set(days)
+    done = {day for day in saved if not _has_journal(day)}
+    pending = [day for day in days if day not in done]
+    if done:
+        logger.info("Backfill: {} dias já gravados, pulados (use --force para refazer).", len(done))
+    if not pending:
+        logger.info("Backfill: nada a fazer entre {} e {}.", start.isoformat(), end.isoformat())
+        return []
+
+    workers = max(1, min(workers or settings.BACKFILL_WORKERS, len(pending)))
+    logger.info(
+        "Backfill de {} dias ({} a {}) com {} processos | backend: {} | limite: {}/s",
+        len(pending),
+        pending[0],
+        pending[-1],
+        workers,
+        backend,
+        settings.BACKFILL_MAX_REQUESTS_PER_SEC,
+    )
+    started = time.monotonic()
+    if workers == 1:
+        _WORKER_BACKEND = backend
+        use_rate_limiter(SharedRateLimiter(settings.BACKFILL_MAX_REQUESTS_PER_SEC))
+        set_browser_profile(_worker_profile(1))
+        results = [_backfill_day(day) for day in pending]
+    else:
+        import multiprocessing
+
+        # spawn: cada processo sobe sem herdar threads/locks nem o Chrome do processo principal.
+        ctx = multiprocessing.get_context("spawn")
+        limiter = SharedRateLimiter(settings.BACKFILL_MAX_REQUESTS_PER_SEC, ctx)
+        counter = ctx.Value("i", 0)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(limiter, counter, backend),
+        ) as pool:
+            results = list(pool.map(_backfill_day, pending))
+
+    failed = [result for result in results if result["error"]]
+    for result in results:
+        if result["error"]:
+            logger.warning("{}: pendente, {} corridas gravadas ({})", result["day"], result["races"], result["error"])
+        else:
+            logger.info("{}: {} corridas -> {}", result["day"], result["races"], result["path"])
+    logger.info(
+        "Backfill concluído em {:.1f}s: {} dias completos, {} pendentes{}",
+        time.monotonic() - started,
+        len(results) - len(failed),
+        len(failed),
+        " (execute de novo para retomar)" if failed else "",
+    )
+    return results
+
+
+__all__ = ["date_range", "run"]
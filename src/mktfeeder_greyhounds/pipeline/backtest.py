@@ -0,0 +1,284 @@
+"""Backtest das estratégias BACK/LAY por prefixo de categoria.
+
+As seleções são montadas como no ``import_selections.txt`` (os três cães do Betting Forecast
+das corridas elegíveis, com a mesma regra de ``strategy_tags``) e liquidadas pelo BSP de um
+arquivo local de resultados. Cada combinação de prefixos é avaliada de uma vez para todos
+os pares de stake, e as combinações são distribuídas entre processos.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger
+from src.mktfeeder_greyhounds.pipeline.build_marketfeeder_import import strategy_tags
+from src.mktfeeder_greyhounds.utils.files import (
+    dataset_days,
+    load_dataset_days,
+    read_csv,
+    read_parquet,
+    write_dataframe,
+)
+from src.mktfeeder_greyhounds.utils.frames import as_text, column, map_unique
+from src.mktfeeder_greyhounds.utils.text import clean_dog_name, normalize_category, normalize_track_name
+
+
+Prefixes = Tuple[str, ...]
+PrefixPair = Tuple[Prefixes, Prefixes]
+
+_RESULT_COLUMNS = ("date", "track", "hhmm", "dog_name", "position", "bsp")
+
+
+@dataclass(frozen=True)
+class Bets:
+    """Seleções liquidadas, em ordem cronológica, prontas para a avaliação vetorizada."""
+
+    categories: Tuple[str, ...]
+    category_codes: np.ndarray  # índice em ``categories`` por seleção
+    back_unit: np.ndarray  # P&L de BACK com stake 1
+    lay_unit: np.ndarray  # P&L de LAY com stake 1 (stake do apostador)
+    dog_won: np.ndarray
+    races: int
+    unsettled: int
+
+
+def prefix_grid(back_pool: Sequence[str], lay_pool: Sequence[str]) -> List[PrefixPair]:
+    """Todos os subconjuntos dos prefixos de BACK x LAY (menos o par vazio, que não aposta)."""
+
+    def subsets(pool: Sequence[str]) -> List[Prefixes]:
+        unique = tuple(dict.fromkeys(normalize_category(p) for p in pool if normalize_category(p)))
+        return [combo for size in range(len(unique) + 1) for combo in itertools.combinations(unique, size)]
+
+    return [(back, lay) for back in subsets(back_pool) for lay in subsets(lay_pool) if back or lay]
+
+
+def load_history(since: str | None = None, until: str | None = None, *, source: str = "files") -> pd.DataFrame:
+    """FORECAST histórico (arquivos diários ou warehouse) no formato do ``forecast_YYYY-MM-DD.csv``."""
+    if source == "warehouse":
+        from src.mktfeeder_greyhounds.utils.warehouse import open_warehouse
+
+        warehouse = open_warehouse()
+        try:
+            return warehouse.races(start=since, end=until)
+        finally:
+            warehouse.close()
+    if source != "files":
+        raise ValueError(f"Fonte de histórico desconhecida: {source}")
+    days = [d for d in dataset_days("forecast") if (not since or d >= since) and (not until or d <= until)]
+    return load_dataset_days("forecast", days)
+
+
+def load_results(path: Path) -> pd.DataFrame:
+    """Resultados locais: uma linha por cão com ``date, track, hhmm, dog_name, position, bsp``."""
+    df = read_parquet(path) if path.suffix == ".parquet" else read_csv(path)
+    if df.empty:
+        raise ValueError(f"Arquivo de resultados vazio ou inexistente: {path}")
+    missing = [col for col in _RESULT_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Arquivo de resultados sem as colunas {missing}: {path}")
+    return df
+
+
+def _race_keys(df: pd.DataFrame) -> Dict[str, pd.Series]:
+    """Chave de junção com os resultados: data, pista normalizada e horário."""
+    return {
+        "date": as_text(column(df, "date")).str.slice(0, 10),
+        "track_key": map_unique(as_text(column(df, "track")), normalize_track_name),
+        "hhmm": as_text(column(df, "hhmm")).str.strip(),
+    }
+
+
+def prepare_bets(df_forecast: pd.DataFrame, df_results: pd.DataFrame, commission: float) -> Bets:
+    """Monta as seleções (três cães por corrida com forecast completo) e liquida cada uma pelo BSP."""
+    races = pd.DataFrame(
+        {
+            "category_norm": map_unique(as_text(column(df_forecast, "category_norm")), normalize_category),
+            **_race_keys(df_forecast),
+        }
+    )
+    for order_idx in range(3):
+        races[order_idx] = as_text(column(df_forecast, f"forecast_{order_idx + 1}")).str.strip()
+    # Corridas com forecast incompleto nunca são exportadas, qualquer que seja a categoria.
+    races = races[(races[0] != "") & (races[1] != "") & (races[2] != "")]
+    selections = races.melt(
+        id_vars=["category_norm", "date", "track_key", "hhmm"], value_vars=[0, 1, 2], var_name="order", value_name="dog_name"
+    )
+    selections["dog_key"] = map_unique(selections["dog_name"], clean_dog_name)
+
+    results = pd.DataFrame(_race_keys(df_results))
+    results["dog_key"] = map_unique(as_text(column(df_results, "dog_name")), clean_dog_name)
+    results["position"] = pd.to_numeric(column(df_results, "position"), errors="coerce")
+    results["bsp"] = pd.to_numeric(column(df_results, "bsp"), errors="coerce")
+    results = results.drop_duplicates(["date", "track_key", "hhmm", "dog_key"], keep="last")
+
+    keys = ["date", "track_key", "hhmm", "dog_key"]
+    settled = selections.merge(results, on=keys, how="left")
+    # Sem resultado, sem BSP ou BSP <= 1 (não corredor/void): fora do backtest.
+    valid = settled["position"].notna() & (settled["bsp"] > 1.0)
+    unsettled = int((~valid).sum())
+    settled = settled[valid].sort_values(["date", "hhmm", "track_key", "order"], kind="stable", ignore_index=True)
+
+    won = (settled["position"] == 1).to_numpy()
+    bsp = settled["bsp"].to_numpy(dtype=float)
+    codes, uniques = pd.factorize(settled["category_norm"], sort=False)
+    return Bets(
+        categories=tuple(uniques),
+        category_codes=codes,
+        back_unit=np.where(won, (bsp - 1.0) * (1.0 - commission), -1.0),
+        lay_unit=np.where(won, -(bsp - 1.0), 1.0 - commission),
+        dog_won=won,
+        races=len(races),
+        unsettled=unsettled,
+    )
+
+
+def _max_drawdown(cumulative: np.ndarray) -> np.ndarray:
+    """Maior queda a partir do pico (incluindo o zero inicial), por linha."""
+    peaks = np.maximum.accumulate(np.maximum(cumulative, 0.0), axis=1)
+    return (peaks - cumulative).max(axis=1, initial=0.0)
+
+
+def evaluate(
+    bets: Bets,
+    prefix_pairs: Iterable[PrefixPair],
+    stake_pairs: Sequence[Tuple[float, float]],
+) -> List[Dict[str, object]]:
+    """P&L, strike rate e drawdown de cada (prefixos, stakes)."""
+    stakes = np.asarray(stake_pairs, dtype=float).reshape(-1, 2)
+    categories = pd.Series(bets.categories, dtype=object)
+    rows: List[Dict[str, object]] = []
+    for back_prefixes, lay_prefixes in prefix_pairs:
+        tags = strategy_tags(categories, (("BACK", back_prefixes, 1.0), ("LAY", lay_prefixes, 1.0))).to_numpy()
+        is_back = (tags == "BACK")[bets.category_codes] if len(tags) else np.zeros(0, dtype=bool)
+        is_lay = (tags == "LAY")[bets.category_codes] if len(tags) else np.zeros(0, dtype=bool)
+        placed = is_back | is_lay
+        back_pnl = np.where(is_back, bets.back_unit, 0.0)[placed]
+        lay_pnl = np.where(is_lay, bets.lay_unit, 0.0)[placed]
+        # O P&L é linear nos stakes: uma matriz (pares de stake x apostas) cobre a grade toda.
+        cumulative = stakes[:, :1] * np.cumsum(back_pnl) + stakes[:, 1:] * np.cumsum(lay_pnl)
+        n_back, n_lay = int(is_back.sum()), int(is_lay.sum())
+        wins = int((is_back & bets.dog_won).sum() + (is_lay & ~bets.dog_won).sum())
+        pnl = cumulative[:, -1] if cumulative.shape[1] else np.zeros(len(stakes))
+        drawdown = _max_drawdown(cumulative) if cumulative.shape[1] else np.zeros(len(stakes))
+        for (stake_back, stake_lay), total, dd in zip(stakes, pnl, drawdown):
+            turnover = stake_back * n_back + stake_lay * n_lay
+            rows.append(
+                {
+                    "back_prefixes": "|".join(back_prefixes),
+                    "lay_prefixes": "|".join(lay_prefixes),
+                    "stake_back": float(stake_back),
+                    "stake_lay": float(stake_lay),
+                    "bets": n_back + n_lay,
+                    "back_bets": n_back,
+                    "lay_bets": n_lay,
+                    "wins": wins,
+                    "strike_rate": round(wins / (n_back + n_lay), 4) if n_back + n_lay else 0.0,
+                    "pnl": round(float(total), 2),
+                    "turnover": round(float(turnover), 2),
+                    "roi": round(float(total) / turnover, 4) if turnover else 0.0,
+                    "max_drawdown": round(float(dd), 2),
+                }
+            )
+    return rows
+
+
+# Cada processo recebe as apostas uma única vez (initializer), não a cada lote da grade.
+_WORKER_BETS: Bets | None = None
+
+
+def _init_worker(bets: Bets) -> None:
+    global _WORKER_BETS
+    _WORKER_BETS = bets
+
+
+def _evaluate_chunk(args: Tuple[List[PrefixPair], List[Tuple[float, float]]]) -> List[Dict[str, object]]:
+    prefix_pairs, stake_pairs = args
+    assert _WORKER_BETS is not None
+    return evaluate(_WORKER_BETS, prefix_pairs, stake_pairs)
+
+
+def run_grid(
+    bets: Bets,
+    prefix_pairs: Sequence[PrefixPair],
+    stake_pairs: Sequence[Tuple[float, float]],
+    workers: int = 0,
+) -> pd.DataFrame:
+    """Avalia a grade inteira (em ``workers`` processos; 0 = um por CPU) e ordena por P&L."""
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(prefix_pairs)))
+    if workers == 1:
+        rows = evaluate(bets, prefix_pairs, stake_pairs)
+    else:
+        # Lotes menores que a fatia de cada processo equilibram combinações mais caras.
+        size = max(1, len(prefix_pairs) // (workers * 4))
+        chunks = [(list(prefix_pairs[i : i + size]), list(stake_pairs)) for i in range(0, len(prefix_pairs), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(bets,)) as pool:
+            rows = [row for chunk_rows in pool.map(_evaluate_chunk, chunks) for row in chunk_rows]
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    return df.sort_values(["pnl", "max_drawdown"], ascending=[False, True], kind="stable", ignore_index=True)
+
+
+def run(
+    results_path: Path | None = None,
+    *,
+    since: str | None = None,
+    until: str | None = None,
+    source: str = "files",
+    back_pool: Sequence[str] | None = None,
+    lay_pool: Sequence[str] | None = None,
+    stakes_back: Sequence[float] | None = None,
+    stakes_lay: Sequence[float] | None = None,
+    commission: float | None = None,
+    workers: int | None = None,
+) -> Tuple[pd.DataFrame, Path | None]:
+    """Backtest da grade sobre o histórico; grava o CSV em ``BACKTEST_DIR`` e retorna (tabela, caminho)."""
+    results_path = results_path or settings.BACKTEST_RESULTS_PATH
+    commission = settings.BACKTEST_COMMISSION if commission is None else commission
+    prefix_pairs = prefix_grid(
+        settings.BACK_CATEGORY_PREFIXES if back_pool is None else back_pool,
+        settings.LAY_CATEGORY_PREFIXES if lay_pool is None else lay_pool,
+    )
+    stake_pairs = list(
+        itertools.product(stakes_back or (settings.STAKE_BACK,), stakes_lay or (settings.STAKE_LAY,))
+    )
+
+    started = time.perf_counter()
+    df_forecast = load_history(since, until, source=source)
+    if df_forecast.empty:
+        logger.warning("Nenhum FORECAST histórico encontrado ({} a {}, fonte={}).", since or "início", until or "fim", source)
+        return pd.DataFrame(), None
+    bets = prepare_bets(df_forecast, load_results(results_path), commission)
+    logger.info(
+        "Backtest: {} corridas com forecast completo | {} seleções liquidadas | {} sem resultado/BSP",
+        bets.races,
+        len(bets.category_codes),
+        bets.unsettled,
+    )
+
+    table = run_grid(bets, prefix_pairs, stake_pairs, settings.BACKTEST_WORKERS if workers is None else workers)
+    out_path = settings.BACKTEST_DIR / f"backtest_{since or 'inicio'}_{until or 'fim'}.csv"
+    write_dataframe(table, out_path)
+    logger.info(
+        "Backtest: {} combinações ({} de prefixos x {} de stakes) em {:.1f}s -> {}",
+        len(table),
+        len(prefix_pairs),
+        len(stake_pairs),
+        time.perf_counter() - started,
+        out_path,
+    )
+    return table, out_path
+
+
+__all__ = ["Bets", "prefix_grid", "load_history", "load_results", "prepare_bets", "evaluate", "run_grid", "run"]
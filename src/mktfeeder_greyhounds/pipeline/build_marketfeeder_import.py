@@ -1,115 +1,168 @@
 from __future__ import annotations
 
+import itertools
+import re
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterable, Mapping
+
 import pandas as pd
 
 from src.mktfeeder_greyhounds.config import settings
-from src.mktfeeder_greyhounds.logger import get_logger
+from src.mktfeeder_greyhounds.logger import logger, setup_logger
+from src.mktfeeder_greyhounds.pipeline.market_join import market_id_from_url
 from src.mktfeeder_greyhounds.utils.dates import today_str
-from src.mktfeeder_greyhounds.utils.files import atomic_write_text, read_csv, write_dataframe
+from src.mktfeeder_greyhounds.utils.files import atomic_write_text, dataset_csv_path, load_dataset, save_dataset
+from src.mktfeeder_greyhounds.utils.frames import as_text, column, counts_in_order, map_unique
+from src.mktfeeder_greyhounds.utils.metrics import stage
 from src.mktfeeder_greyhounds.utils.text import normalize_category, normalize_spaces
 
-logger = get_logger()
+
+@lru_cache(maxsize=None)
+def _prefix_rule(prefixes: tuple[str, ...]) -> re.Pattern[str] | None:
+    """Compila os prefixos numa única regex ancorada (``re.match``); None se não houver prefixos."""
+    if not prefixes:
+        return None
+    return re.compile("|".join(re.escape(prefix) for prefix in prefixes))
 
 
 def _strategy_for_category(category_norm: str) -> tuple[str | None, float | None]:
     cat = normalize_category(category_norm)
-    if any(cat.startswith(prefix) for prefix in settings.BACK_CATEGORY_PREFIXES):
+    back_rule = _prefix_rule(tuple(settings.BACK_CATEGORY_PREFIXES))
+    if back_rule is not None and back_rule.match(cat):
         return "BACK", settings.STAKE_BACK
-    if any(cat.startswith(prefix) for prefix in settings.LAY_CATEGORY_PREFIXES):
+    lay_rule = _prefix_rule(tuple(settings.LAY_CATEGORY_PREFIXES))
+    if lay_rule is not None and lay_rule.match(cat):
         return "LAY", settings.STAKE_LAY
     return None, None
 
 
-def _format_line(track: str, hhmm: str, dog_name: str, strategy_tag: str, stake: float) -> str:
-    dog = normalize_spaces(dog_name)
-    return f"[{hhmm} {track}]{dog}\t\"{strategy_tag}\"\t{stake}"
+StrategyRules = tuple[tuple[str, tuple[str, ...], float | None], ...]
+
+
+def _strategy_rules() -> StrategyRules:
+    """(tag, prefixos, stake) em ordem de prioridade, como em ``_strategy_for_category``."""
+    return (
+        ("BACK", tuple(settings.BACK_CATEGORY_PREFIXES), settings.STAKE_BACK),
+        ("LAY", tuple(settings.LAY_CATEGORY_PREFIXES), settings.STAKE_LAY),
+    )
+
+
+def strategy_tags(categories: pd.Series, rules: StrategyRules | None = None) -> pd.Series:
+    """Mesma regra de ``_strategy_for_category`` aplicada à coluna inteira (None = não elegível).
+
+    ``rules`` troca os prefixos/stakes do ``settings`` (usado pelo backtest).
+    """
+    tags = pd.Series([None] * len(categories), index=categories.index, dtype=object)
+    undecided = pd.Series(True, index=categories.index)
+    for tag, prefixes, stake in _strategy_rules() if rules is None else rules:
+        rule = _prefix_rule(tuple(prefixes))
+        if rule is None:
+            continue
+        hit = undecided & categories.str.match(rule).astype(bool)
+        if stake is not None:
+            tags[hit] = tag
+        undecided &= ~hit
+    return tags
 
 
 def _load_today_forecast() -> pd.DataFrame:
-    path = settings.OUTPUT_FORECAST_DIR / f"forecast_{today_str()}.csv"
-    df = read_csv(path)
+    df = load_dataset("forecast", today_str())
     if df.empty:
-        logger.warning("FORECAST do dia vazio ou inexistente: {}", path)
+        logger.warning("FORECAST do dia vazio ou inexistente: {}", dataset_csv_path("forecast", today_str()))
     return df
 
 
-def _build_lines_and_audit(
+def build_lines_and_audit(
     df_forecast: pd.DataFrame,
-) -> tuple[list[str], list[dict[str, object]], int, dict[str, int], dict[str, int], dict[str, int], int, dict[str, int]]:
-    lines: list[str] = []
-    audit_rows: list[dict[str, object]] = []
-    skipped_forecast_incomplete = 0
-    counts_by_strategy: dict[str, int] = {}
-    races_by_strategy: dict[str, int] = {}
-    exported_category_counts: dict[str, int] = {}
-    ignored_by_category_total = 0
-    ignored_category_counts: dict[str, int] = {}
-    records: list[dict[str, object]] = []
-
-    for _, row in df_forecast.iterrows():
-        track = normalize_spaces(str(row.get("track") or ""))
-        hhmm = str(row.get("hhmm") or "")
-        category_norm = normalize_category(str(row.get("category_norm") or ""))
-        category_raw = normalize_spaces(str(row.get("category_raw") or ""))
-        strategy_tag, stake = _strategy_for_category(category_norm)
-        if not strategy_tag or stake is None:
-            ignored_by_category_total += 1
-            ignored_category_counts[category_norm] = ignored_category_counts.get(category_norm, 0) + 1
-            logger.debug("Corrida ignorada por categoria: {} {}", track, category_norm)
-            continue
+) -> tuple[list[str], pd.DataFrame, int, dict[str, int], dict[str, int], dict[str, int], int, dict[str, int]]:
+    races = pd.DataFrame(
+        {
+            "track": map_unique(as_text(column(df_forecast, "track")), normalize_spaces),
+            "hhmm": as_text(column(df_forecast, "hhmm")),
+            "category_raw": map_unique(as_text(column(df_forecast, "category_raw")), normalize_spaces),
+            "category_norm": map_unique(as_text(column(df_forecast, "category_norm")), normalize_category),
+        }
+    )
+    for order_idx in range(3):
+        races[order_idx] = as_text(column(df_forecast, f"forecast_{order_idx + 1}")).str.strip()
+    races["strategy_tag"] = strategy_tags(races["category_norm"])
+    # FORECAST com join de mercados: a auditoria leva o mercado Betfair de cada seleção.
+    # O id é relido da URL (no CSV, "1.220522030" voltaria como float e perderia o zero final).
+    market_cols = []
+    if "market_url" in df_forecast.columns:
+        urls = column(df_forecast, "market_url")
+        races["market_url"] = as_text(urls.where(urls.notna(), None))
+        races["market_id"] = map_unique(races["market_url"], market_id_from_url)
+        market_cols = ["market_id", "market_url"]
 
-        dogs = [
-            str(row.get("forecast_1") or "").strip(),
-            str(row.get("forecast_2") or "").strip(),
-            str(row.get("forecast_3") or "").strip(),
-        ]
-        if not dogs[0] or any(not d for d in dogs):
-            logger.info("Corrida ignorada por forecast incompleto: {} {}", track, hhmm)
-            skipped_forecast_incomplete += 1
-            continue
+    eligible = races["strategy_tag"].notna()
+    ignored_category_counts = counts_in_order(races.loc[~eligible, "category_norm"])
+    ignored_by_category_total = int((~eligible).sum())
+    if ignored_by_category_total:
+        logger.debug("Corridas ignoradas por categoria: {} | categorias: {}", ignored_by_category_total, ignored_category_counts)
+
+    complete = eligible & (races[0] != "") & (races[1] != "") & (races[2] != "")
+    incomplete = eligible & ~complete
+    skipped_forecast_incomplete = int(incomplete.sum())
+    if skipped_forecast_incomplete:
+        sample = "; ".join(
+            f"{track} {hhmm}" for track, hhmm in races.loc[incomplete, ["track", "hhmm"]].head(5).itertuples(index=False)
+        )
+        logger.info("Corridas ignoradas por forecast incompleto: {} | ex.: {}", skipped_forecast_incomplete, sample)
+
+    exported = races[complete]
+    races_by_strategy = counts_in_order(exported["strategy_tag"])
+    counts_by_strategy = {tag: count * 3 for tag, count in races_by_strategy.items()}
+    exported_category_counts = counts_in_order(exported.loc[exported["category_norm"] != "", "category_norm"])
+
+    # Uma linha por cão (Forecast1..3); o sort estável por horário, track e ordem
+    # preserva a ordem do FORECAST entre corridas empatadas.
+    selections = exported.melt(
+        id_vars=["track", "hhmm", "category_raw", "category_norm", "strategy_tag", *market_cols],
+        value_vars=[0, 1, 2],
+        var_name="order",
+        value_name="dog_name",
+    )
+    selections = selections.sort_values(["hhmm", "track", "order"], kind="stable", ignore_index=True)
+    selections["dog_name"] = map_unique(selections["dog_name"], normalize_spaces)
+    stakes = {"BACK": settings.STAKE_BACK, "LAY": settings.STAKE_LAY}
+    stake_text = selections["strategy_tag"].map({tag: f"{stake}" for tag, stake in stakes.items()})
 
-        races_by_strategy[strategy_tag] = races_by_strategy.get(strategy_tag, 0) + 1
-        if category_norm:
-            exported_category_counts[category_norm] = exported_category_counts.get(category_norm, 0) + 1
-        for order_idx, dog in enumerate(dogs):
-            records.append(
-                {
-                    "track": track,
-                    "hhmm": hhmm,
-                    "category_raw": category_raw,
-                    "category_norm": category_norm,
-                    "dog_name": normalize_spaces(dog),
-                    "strategy_tag": strategy_tag,
-                    "stake": stake,
-                    "order": order_idx,
-                }
-            )
-            counts_by_strategy[strategy_tag] = counts_by_strategy.get(strategy_tag, 0) + 1
-
-    # Ordena por horário e, em seguida, por track e ordem (Forecast1..3)
-    sorted_records = sorted(records, key=lambda r: (r["hhmm"], r["track"], r["order"]))
-    for rec in sorted_records:
-        line = _format_line(rec["track"], rec["hhmm"], rec["dog_name"], rec["strategy_tag"], rec["stake"])
-        lines.append(line)
-        audit_rows.append(
+    lines = (
+        "["
+        + selections["hhmm"]
+        + " "
+        + selections["track"]
+        + "]"
+        + selections["dog_name"]
+        + '\t"'
+        + selections["strategy_tag"]
+        + '"\t'
+        + stake_text
+    ).tolist()
+    if selections.empty:
+        audit = pd.DataFrame()
+    else:
+        audit = pd.DataFrame(
             {
                 "date": today_str(),
-                "track": rec["track"],
-                "hhmm": rec["hhmm"],
-                "category_raw": rec["category_raw"],
-                "category_norm": rec["category_norm"],
-                "dog_name": rec["dog_name"],
-                "strategy_tag": rec["strategy_tag"],
-                "stake": rec["stake"],
+                "track": selections["track"],
+                "hhmm": selections["hhmm"],
+                "category_raw": selections["category_raw"],
+                "category_norm": selections["category_norm"],
+                "dog_name": selections["dog_name"],
+                "strategy_tag": selections["strategy_tag"],
+                "stake": selections["strategy_tag"].map(stakes),
+                **{col: selections[col] for col in market_cols},
             }
         )
     if settings.KEEP_ALL_ACTIVE:
         lines.append("#all_active#")
     return (
         lines,
-        audit_rows,
+        audit,
         skipped_forecast_incomplete,
         counts_by_strategy,
         races_by_strategy,
@@ -119,7 +172,65 @@ def _build_lines_and_audit(
     )
 
 
-def _write_marketfeeder_files(lines: list[str], audit_rows: list[dict[str, object]]) -> tuple[Path, Path, Path]:
+def _text(value: object) -> str:
+    """Escalar de ``as_text``: ``str(v or "")``."""
+    return str(value or "")
+
+
+def race_selections(race: Mapping[str, object], market_url: str | None = None) -> list[dict[str, object]]:
+    """Seleções de uma corrida do FORECAST (streaming), com as mesmas regras de ``build_lines_and_audit``.
+
+    Cada seleção traz a linha do MarketFeeder (``line``), a chave de ordenação (``sort_key``) e
+    as colunas da auditoria, sem ``date``. Com ``market_url`` (inclusive ""), a auditoria leva o mercado.
+    Corrida não elegível ou com forecast incompleto -> lista vazia.
+    """
+    category_norm = normalize_category(_text(race.get("category_norm")))
+    strategy_tag, stake = _strategy_for_category(category_norm)
+    if not strategy_tag or stake is None:
+        return []
+    dogs = [_text(race.get(f"forecast_{i}")).strip() for i in (1, 2, 3)]
+    if not all(dogs):
+        return []
+    track = normalize_spaces(_text(race.get("track")))
+    hhmm = _text(race.get("hhmm"))
+    market = {} if market_url is None else {"market_id": market_id_from_url(market_url), "market_url": market_url}
+    selections = []
+    for order_idx, dog in enumerate(dogs):
+        dog_name = normalize_spaces(dog)
+        selections.append(
+            {
+                "sort_key": (hhmm, track, order_idx),
+                "line": f"[{hhmm} {track}]{dog_name}\t\"{strategy_tag}\"\t{stake}",
+                "track": track,
+                "hhmm": hhmm,
+                "category_raw": normalize_spaces(_text(race.get("category_raw"))),
+                "category_norm": category_norm,
+                "dog_name": dog_name,
+                "strategy_tag": strategy_tag,
+                "stake": stake,
+                **market,
+            }
+        )
+    return selections
+
+
+def render_selections(races: Iterable[list[dict[str, object]]]) -> tuple[list[str], pd.DataFrame]:
+    """Linhas e auditoria a partir das seleções de ``race_selections`` (corridas na ordem do FORECAST)."""
+    selections = sorted(itertools.chain.from_iterable(races), key=lambda sel: sel["sort_key"])
+    lines = [sel["line"] for sel in selections]
+    day = today_str()
+    audit = pd.DataFrame(
+        [
+            {"date": day, **{col: value for col, value in sel.items() if col not in ("sort_key", "line")}}
+            for sel in selections
+        ]
+    )
+    if settings.KEEP_ALL_ACTIVE:
+        lines.append("#all_active#")
+    return lines, audit
+
+
+def write_marketfeeder_files(lines: list[str], audit: pd.DataFrame) -> tuple[Path, Path, Path]:
     base_dir = settings.MARKETFEEDER_DIR
     hist_dir = settings.MARKETFEEDER_HISTORY_DIR
     today = today_str()
@@ -127,21 +238,23 @@ def _write_marketfeeder_files(lines: list[str], audit_rows: list[dict[str, objec
     fixed_path = base_dir / "import_selections.txt"
     tmp_path = base_dir / "import_selections.tmp"
     hist_txt = hist_dir / f"import_selections_{today}.txt"
-    audit_csv = hist_dir / f"import_selections_{today}_audit.csv"
+    audit_csv = dataset_csv_path("marketfeeder_audit", today)
 
     content = "\n".join(lines)
     # escreve tmp e depois substitui o fixo
-    atomic_write_text(tmp_path, content)
-    if fixed_path.exists():
-        fixed_path.unlink()
-    tmp_path.replace(fixed_path)
+    with stage("marketfeeder.publish"):
+        atomic_write_text(tmp_path, content)
+        if fixed_path.exists():
+            fixed_path.unlink()
+        tmp_path.replace(fixed_path)
 
     atomic_write_text(hist_txt, content)
-    write_dataframe(pd.DataFrame(audit_rows), audit_csv)
+    # A auditoria é para leitura humana: o CSV é sempre gravado (e o Parquet, se ativo).
+    save_dataset(audit, "marketfeeder_audit", today, csv=True)
     return fixed_path, hist_txt, audit_csv
 
 
-def run() -> tuple[
+RunResult = tuple[
     Path | None,
     Path | None,
     Path | None,
@@ -153,22 +266,22 @@ def run() -> tuple[
     dict[str, int],
     int,
     dict[str, int],
-]:
-    df_forecast = _load_today_forecast()
-    if df_forecast.empty:
-        logger.warning("Nenhum FORECAST para gerar arquivos do MarketFeeder.")
-        return None, None, None, 0, 0, 0, {}, {}, {}, 0, {}
+]
 
-    (
-        lines,
-        audit_rows,
-        skipped_forecast_incomplete,
-        counts_by_strategy,
-        races_by_strategy,
-        exported_category_counts,
-        ignored_by_category_total,
-        ignored_category_counts,
-    ) = _build_lines_and_audit(df_forecast)
+
+def publish(df_forecast: pd.DataFrame) -> RunResult:
+    """Gera as linhas a partir de um FORECAST já carregado e publica os arquivos."""
+    with stage("marketfeeder.build"):
+        (
+            lines,
+            audit,
+            skipped_forecast_incomplete,
+            counts_by_strategy,
+            races_by_strategy,
+            exported_category_counts,
+            ignored_by_category_total,
+            ignored_category_counts,
+        ) = build_lines_and_audit(df_forecast)
     if not lines:
         logger.warning("Nenhuma seleção elegível para exportar ao MarketFeeder.")
         return (
@@ -185,7 +298,7 @@ def run() -> tuple[
             ignored_category_counts,
         )
 
-    fixed_path, hist_txt, audit_csv = _write_marketfeeder_files(lines, audit_rows)
+    fixed_path, hist_txt, audit_csv = write_marketfeeder_files(lines, audit)
     logger.info("Arquivo fixo MarketFeeder atualizado: {}", fixed_path)
     logger.info("Histórico diário salvo: {}", hist_txt)
     logger.info("Auditoria salva: {}", audit_csv)
@@ -211,6 +324,27 @@ def run() -> tuple[
     )
 
 
+def run() -> RunResult:
+    df_forecast = _load_today_forecast()
+    if df_forecast.empty:
+        logger.warning("Nenhum FORECAST para gerar arquivos do MarketFeeder.")
+        return None, None, None, 0, 0, 0, {}, {}, {}, 0, {}
+
+    return publish(df_forecast)
+
+
+__all__ = [
+    "strategy_tags",
+    "build_lines_and_audit",
+    "race_selections",
+    "render_selections",
+    "write_marketfeeder_files",
+    "publish",
+    "run",
+]
+
+
 if __name__ == "__main__":
+    setup_logger()
     run()
 
@@ -1,81 +1,148 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Mapping
+
 import pandas as pd
 
-from src.mktfeeder_greyhounds.config import settings
-from src.mktfeeder_greyhounds.logger import get_logger
+from src.mktfeeder_greyhounds.logger import logger, setup_logger
+from src.mktfeeder_greyhounds.pipeline.market_join import attach_markets, market_join_enabled
 from src.mktfeeder_greyhounds.utils.dates import iso_to_hhmm
-from src.mktfeeder_greyhounds.utils.files import read_csv, write_dataframe
+from src.mktfeeder_greyhounds.utils.files import dataset_csv_path, load_dataset, save_dataset
+from src.mktfeeder_greyhounds.utils.frames import as_text, column, first_truthy, map_unique, truthy
 from src.mktfeeder_greyhounds.utils.text import normalize_category, normalize_spaces
 
 
 def _load_today_timeform() -> pd.DataFrame:
     today_str = date.today().isoformat()
-    path = settings.RAW_TIMEFORM_FORECAST_DIR / f"timeform_forecast_{today_str}.csv"
-    df = read_csv(path)
+    df = load_dataset("timeform_forecast", today_str)
     if df.empty:
-        logger.warning("Arquivo de timeform_forecast vazio ou inexistente: {}", path)
+        logger.warning("Arquivo de timeform_forecast vazio ou inexistente: {}", dataset_csv_path("timeform_forecast", today_str))
     return df
 
 
-def _build_top3(df_raw: pd.DataFrame) -> pd.DataFrame:
-    rows = []
-    for _, row in df_raw.iterrows():
-        dog1 = normalize_spaces(str(row.get("TimeformTop1") or "")).strip()
-        dog2 = normalize_spaces(str(row.get("TimeformTop2") or "")).strip()
-        dog3 = normalize_spaces(str(row.get("TimeformTop3") or "")).strip()
-        if not (dog1 and dog2 and dog3):
-            logger.warning("Corrida ignorada (top3 incompleto): {} {}", row.get("track"), row.get("hhmm") or row.get("race_time_iso"))
-            continue
-        hhmm_val = str(row.get("hhmm") or "") or iso_to_hhmm(str(row.get("race_time_iso") or ""))
-        rows.append(
-            {
-                "date": str(row.get("date") or date.today().isoformat()),
-                "track": normalize_spaces(str(row.get("track") or "")),
-                "hhmm": hhmm_val,
-                "category_raw": normalize_spaces(str(row.get("category_raw") or "")),
-                "category_norm": normalize_category(str(row.get("category_norm") or "")),
-                "dog_1": dog1,
-                "dog_2": dog2,
-                "dog_3": dog3,
-            }
-        )
-    return pd.DataFrame(rows)
-
-
-def _build_forecast(df_raw: pd.DataFrame) -> pd.DataFrame:
-    rows = []
-    for _, row in df_raw.iterrows():
-        f1 = row.get("Forecast1") or row.get("forecast_1") or ""
-        f2 = row.get("Forecast2") or row.get("forecast_2") or ""
-        f3 = row.get("Forecast3") or row.get("forecast_3") or ""
-        if not f1:
-            logger.warning("Corrida ignorada (forecast vazio): {} {}", row.get("track"), row.get("hhmm"))
-            continue
-        if not (f2 and f3):
-            logger.warning("Corrida ignorada (forecast incompleto): {} {}", row.get("track"), row.get("hhmm"))
-            continue
-        rows.append(
-            {
-                "date": row.get("date"),
-                "track": row.get("track"),
-                "hhmm": row.get("hhmm"),
-                "category_raw": row.get("category_raw"),
-                "category_norm": row.get("category_norm"),
-                "forecast_1": f1,
-                "forecast_2": f2,
-                "forecast_3": f3,
-                "forecast_1_odds": row.get("Forecast1Odds") or row.get("forecast_1_odds"),
-                "forecast_2_odds": row.get("Forecast2Odds") or row.get("forecast_2_odds"),
-                "forecast_3_odds": row.get("Forecast3Odds") or row.get("forecast_3_odds"),
-            }
-        )
-    return pd.DataFrame(rows)
+_SKIP_SAMPLE = 5
+
+
+def _spaces(text: pd.Series) -> pd.Series:
+    return map_unique(text, normalize_spaces)
+
+
+def _category(text: pd.Series) -> pd.Series:
+    return map_unique(text, normalize_category)
+
+
+def _log_skipped(reason: str, df_raw: pd.DataFrame, skipped: pd.Series, when: pd.Series) -> None:
+    total = int(skipped.sum())
+    if not total:
+        return
+    tracks = column(df_raw, "track")[skipped].head(_SKIP_SAMPLE)
+    sample = "; ".join(f"{track} {hhmm}" for track, hhmm in zip(tracks, when[skipped].head(_SKIP_SAMPLE)))
+    logger.warning("Corridas ignoradas ({}): {} | ex.: {}", reason, total, sample)
+
+
+def _frame(columns: dict[str, pd.Series], keep: pd.Series) -> pd.DataFrame:
+    """Monta o DataFrame de saída com a mesma inferência de tipos de ``pd.DataFrame(list_of_dicts)``."""
+    if not keep.any():
+        return pd.DataFrame()
+    return pd.DataFrame({name: values[keep].tolist() for name, values in columns.items()})
+
+
+def build_top3(df_raw: pd.DataFrame) -> pd.DataFrame:
+    if df_raw.empty:
+        return pd.DataFrame()
+    dogs = [_spaces(as_text(column(df_raw, f"TimeformTop{i}"))) for i in (1, 2, 3)]
+    keep = (dogs[0] != "") & (dogs[1] != "") & (dogs[2] != "")
+    when = first_truthy(column(df_raw, "hhmm"), column(df_raw, "race_time_iso"))
+    _log_skipped("top3 incompleto", df_raw, ~keep, when)
+
+    hhmm = as_text(column(df_raw, "hhmm"))
+    from_iso = keep & (hhmm == "")
+    if from_iso.any():
+        hhmm[from_iso] = as_text(column(df_raw, "race_time_iso"))[from_iso].map(iso_to_hhmm)
+    day = as_text(column(df_raw, "date"))
+    return _frame(
+        {
+            "date": day.mask(day == "", date.today().isoformat()),
+            "track": _spaces(as_text(column(df_raw, "track"))),
+            "hhmm": hhmm,
+            "category_raw": _spaces(as_text(column(df_raw, "category_raw"))),
+            "category_norm": _category(as_text(column(df_raw, "category_norm"))),
+            "dog_1": dogs[0],
+            "dog_2": dogs[1],
+            "dog_3": dogs[2],
+        },
+        keep,
+    )
+
+
+def build_forecast(df_raw: pd.DataFrame) -> pd.DataFrame:
+    if df_raw.empty:
+        return pd.DataFrame()
+    empty = pd.Series("", index=df_raw.index, dtype=object)
+    names = [
+        first_truthy(column(df_raw, f"Forecast{i}"), column(df_raw, f"forecast_{i}"), empty) for i in (1, 2, 3)
+    ]
+    has = [truthy(values) for values in names]
+    hhmm = column(df_raw, "hhmm")
+    _log_skipped("forecast vazio", df_raw, ~has[0], hhmm)
+    _log_skipped("forecast incompleto", df_raw, has[0] & ~(has[1] & has[2]), hhmm)
+    keep = has[0] & has[1] & has[2]
+    return _frame(
+        {
+            "date": column(df_raw, "date"),
+            "track": column(df_raw, "track"),
+            "hhmm": hhmm,
+            "category_raw": column(df_raw, "category_raw"),
+            "category_norm": column(df_raw, "category_norm"),
+            "forecast_1": names[0],
+            "forecast_2": names[1],
+            "forecast_3": names[2],
+            "forecast_1_odds": first_truthy(column(df_raw, "Forecast1Odds"), column(df_raw, "forecast_1_odds")),
+            "forecast_2_odds": first_truthy(column(df_raw, "Forecast2Odds"), column(df_raw, "forecast_2_odds")),
+            "forecast_3_odds": first_truthy(column(df_raw, "Forecast3Odds"), column(df_raw, "forecast_3_odds")),
+        },
+        keep,
+    )
+
+
+def forecast_row(row: Mapping[str, object]) -> dict | None:
+    """``build_forecast`` de uma única linha raw (streaming); None se o forecast estiver incompleto."""
+    names = [row.get(f"Forecast{i}") or row.get(f"forecast_{i}") or "" for i in (1, 2, 3)]
+    if not all(names):
+        return None
+    return {
+        "date": row.get("date"),
+        "track": row.get("track"),
+        "hhmm": row.get("hhmm"),
+        "category_raw": row.get("category_raw"),
+        "category_norm": row.get("category_norm"),
+        "forecast_1": names[0],
+        "forecast_2": names[1],
+        "forecast_3": names[2],
+        "forecast_1_odds": row.get("Forecast1Odds") or row.get("forecast_1_odds"),
+        "forecast_2_odds": row.get("Forecast2Odds") or row.get("forecast_2_odds"),
+        "forecast_3_odds": row.get("Forecast3Odds") or row.get("forecast_3_odds"),
+    }
+
+
+def write_outputs(df_raw: pd.DataFrame, today_str: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Gera e salva TOP3/FORECAST a partir de um raw já carregado (arquivo ou memória)."""
+    df_top3 = build_top3(df_raw)
+    df_forecast = build_forecast(df_raw)
+    if market_join_enabled() and not df_forecast.empty:
+        df_forecast = attach_markets(df_forecast, today_str)
+
+    top3_path = save_dataset(df_top3, "top3", today_str)
+    forecast_path = save_dataset(df_forecast, "forecast", today_str)
+
+    logger.info("TOP3 salvo em {}", top3_path)
+    logger.info("FORECAST salvo em {}", forecast_path)
+
+    return df_top3, df_forecast
 
 
 def run() -> tuple[pd.DataFrame, pd.DataFrame]:
-    logger = get_logger()
     today_str = date.today().isoformat()
 
     df_raw = _load_today_timeform()
@@ -83,21 +150,13 @@ def run() -> tuple[pd.DataFrame, pd.DataFrame]:
         logger.warning("Sem dados de timeform_forecast para gerar outputs.")
         return pd.DataFrame(), pd.DataFrame()
 
-    df_top3 = _build_top3(df_raw)
-    df_forecast = _build_forecast(df_raw)
+    return write_outputs(df_raw, today_str)
 
-    top3_path = settings.OUTPUT_TOP3_DIR / f"top3_{today_str}.csv"
-    forecast_path = settings.OUTPUT_FORECAST_DIR / f"forecast_{today_str}.csv"
 
-    write_dataframe(df_top3, top3_path)
-    write_dataframe(df_forecast, forecast_path)
-
-    logger.info("TOP3 salvo em {}", top3_path)
-    logger.info("FORECAST salvo em {}", forecast_path)
-
-    return df_top3, df_forecast
+__all__ = ["build_top3", "build_forecast", "forecast_row", "write_outputs", "run"]
 
 
 if __name__ == "__main__":
+    setup_logger()
     run()
 
@@ -0,0 +1,219 @@
+"""Modo daemon: mantém o import_selections.txt atualizado ao longo do dia.
+
+Depois da raspagem inicial (mesmo fluxo do streaming), cada corrida é re-raspada em
+``DAEMON_REFRESH_OFFSETS_MIN`` minutos antes da largada e o arquivo do MarketFeeder é
+republicado após cada refresh.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger
+from src.mktfeeder_greyhounds.pipeline import build_outputs, load_warehouse, streaming
+from src.mktfeeder_greyhounds.pipeline.daily_scrape import cell_text, load_existing_raw, row_key
+from src.mktfeeder_greyhounds.pipeline.market_join import load_market_index, market_join_enabled
+from src.mktfeeder_greyhounds.scrapers.timeform import TimeformRefresher, build_timeform_forecast_df
+from src.mktfeeder_greyhounds.utils.dates import hhmm_to_today_iso
+from src.mktfeeder_greyhounds.utils.files import save_dataset
+from src.mktfeeder_greyhounds.utils.metrics import write_run_report
+from src.mktfeeder_greyhounds.utils.page_cache import get_page_cache
+from src.mktfeeder_greyhounds.utils.selenium_driver import log_network_summary
+
+
+RaceKey = Tuple[str, str]
+
+
+def _off_time(race_time_iso: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(race_time_iso)
+    except (TypeError, ValueError):
+        return None
+
+
+class RefreshScheduler:
+    """Fila de prioridade de refreshes ordenada pelo disparo (largada - offset).
+
+    Cada par (corrida, offset) entra na fila uma única vez, então reagendar após uma nova
+    listagem dos cards é idempotente. Corridas já largadas há mais de ``grace_minutes``
+    saem da fila quando são alcançadas.
+    """
+
+    def __init__(self, offsets_min: Iterable[int], grace_minutes: int) -> None:
+        self._offsets = sorted({int(o) for o in offsets_min if int(o) >= 0}, reverse=True)
+        self._grace = timedelta(minutes=grace_minutes)
+        self._heap: List[Tuple[datetime, int, datetime, RaceKey, int]] = []
+        self._seq = itertools.count()
+        self._scheduled: set[Tuple[RaceKey, int]] = set()
+        self._last_off_time: datetime | None = None
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, key: RaceKey, off_time: datetime, now: datetime) -> int:
+        """Agenda os offsets ainda no futuro; retorna quantos foram adicionados."""
+        if self._last_off_time is None or off_time > self._last_off_time:
+            self._last_off_time = off_time
+        added = 0
+        for offset in self._offsets:
+            if (key, offset) in self._scheduled:
+                continue
+            due = off_time - timedelta(minutes=offset)
+            if due <= now:
+                continue
+            heapq.heappush(self._heap, (due, next(self._seq), off_time, key, offset))
+            self._scheduled.add((key, offset))
+            added += 1
+        return added
+
+    def next_due(self) -> datetime | None:
+        return self._heap[0][0] if self._heap else None
+
+    def exhausted(self, now: datetime) -> bool:
+        """Fila vazia e a última corrida conhecida do dia já largou."""
+        if self._heap or self._last_off_time is None:
+            return False
+        return self._last_off_time < now - self._grace
+
+    def pop_due(self, now: datetime) -> List[Tuple[RaceKey, int]]:
+        """Remove os refreshes vencidos; offsets acumulados da mesma corrida viram um único refresh."""
+        due: Dict[RaceKey, int] = {}
+        while self._heap and self._heap[0][0] <= now:
+            _, _, off_time, key, offset = heapq.heappop(self._heap)
+            if off_time < now - self._grace:
+                self.dropped += 1
+                logger.debug("Corrida {} {} largou; refresh T-{} descartado.", key[0], key[1], offset)
+                continue
+            due[key] = offset
+        return list(due.items())
+
+
+def _schedule_cards(
+    scheduler: RefreshScheduler,
+    cards_by_key: Dict[RaceKey, Dict[str, str]],
+    cards: List[Dict[str, str]],
+) -> int:
+    now = datetime.now()
+    added = 0
+    for card in cards:
+        key = row_key(card)
+        if not (key[0] and key[1] and card.get("url")):
+            continue
+        off_time = _off_time(hhmm_to_today_iso(key[1]))
+        if off_time is None:
+            continue
+        cards_by_key[key] = card
+        added += scheduler.schedule(key, off_time, now)
+    return added
+
+
+def _refresh(refresher: TimeformRefresher, card: Dict[str, str], offset: int) -> Dict[str, object] | None:
+    try:
+        return refresher.refresh(card)
+    except Exception as exc:
+        logger.warning("Falha no refresh T-{} de {} {}: {}", offset, card.get("track_name"), card.get("hhmm"), exc)
+        return None
+
+
+def _save_raw(publisher: streaming.StreamingPublisher, today_str: str) -> None:
+    save_dataset(build_timeform_forecast_df(publisher.rows()), "timeform_forecast", today_str)
+
+
+def run() -> dict:
+    """Raspagem inicial + refreshes agendados até a última corrida do dia sair da fila."""
+    today_str = date.today().isoformat()
+    scrape_stats, _, _, _ = streaming.run()
+
+    # Os refreshes republicam a auditoria: com o join ligado, ela mantém o mercado de cada seleção.
+    markets = load_market_index(today_str) if market_join_enabled() else None
+    publisher = streaming.StreamingPublisher(1, float("inf"), seed_rows=load_existing_raw(today_str), markets=markets)
+    scheduler = RefreshScheduler(settings.DAEMON_REFRESH_OFFSETS_MIN, settings.PAST_RACE_GRACE_MINUTES)
+    cards_by_key: Dict[RaceKey, Dict[str, str]] = {}
+    workers = max(1, settings.DAEMON_WORKERS)
+    refresher = TimeformRefresher(workers)
+    relist_every = timedelta(minutes=max(1, settings.DAEMON_RELIST_EVERY_MIN))
+    next_relist = datetime.now()
+    refreshed = 0
+
+    logger.info(
+        "Daemon iniciado: refresh em T-{} min | {} worker(s) | nova listagem a cada {}.",
+        "/".join(str(o) for o in settings.DAEMON_REFRESH_OFFSETS_MIN),
+        workers,
+        relist_every,
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="daemon") as pool:
+            while date.today().isoformat() == today_str:
+                now = datetime.now()
+                if now >= next_relist:
+                    added = _schedule_cards(scheduler, cards_by_key, refresher.list_cards())
+                    next_relist = now + relist_every
+                    logger.info("Cards listados: {} refreshes novos | {} na fila.", added, len(scheduler))
+
+                batch = [(cards_by_key[key], offset) for key, offset in scheduler.pop_due(now)]
+                if batch:
+                    results = pool.map(lambda item: (item, _refresh(refresher, *item)), batch)
+                    for (card, offset), row in results:
+                        if row is None:
+                            continue
+                        publisher.add(row, force=True)
+                        refreshed += 1
+                        logger.info(
+                            "Refresh T-{} {} {}: categoria={} | forecast={}",
+                            offset,
+                            card.get("track_name"),
+                            card.get("hhmm"),
+                            row.get("category_norm"),
+                            ", ".join(cell_text(row.get(f"Forecast{i}")) for i in range(1, 4)),
+                        )
+                    _save_raw(publisher, today_str)
+                    continue
+
+                if scheduler.exhausted(now):
+                    break
+                next_due = scheduler.next_due()
+                wake = min(next_due, next_relist) if next_due is not None else next_relist
+                time.sleep(min(settings.DAEMON_MAX_IDLE_SEC, max(0.5, (wake - datetime.now()).total_seconds())))
+    except KeyboardInterrupt:
+        logger.info("Daemon interrompido pelo usuário.")
+    finally:
+        refresher.close()
+        publisher.close()
+        df_raw = build_timeform_forecast_df(publisher.rows())
+        if not df_raw.empty:
+            save_dataset(df_raw, "timeform_forecast", today_str)
+            build_outputs.write_outputs(df_raw, today_str)
+        load_warehouse.run_autoload(today_str)
+        cache = get_page_cache()
+        if cache is not None:
+            cache.log_summary()
+        log_network_summary()
+        write_run_report("daemon", today_str)
+
+    stats = dict(scrape_stats or {})
+    stats.update(
+        {
+            "refreshed": refreshed,
+            "refresh_failed": refresher.counters["failed"],
+            "dropped_past": scheduler.dropped,
+            "publishes": publisher.publishes,
+        }
+    )
+    logger.info(
+        "Daemon encerrado. Refreshes: {} | falhas: {} | descartados (largada passada): {} | publicações: {}",
+        stats["refreshed"],
+        stats["refresh_failed"],
+        stats["dropped_past"],
+        stats["publishes"],
+    )
+    return stats
+
+
+__all__ = ["RefreshScheduler", "run"]
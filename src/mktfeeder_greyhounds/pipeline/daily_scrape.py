@@ -1,27 +1,108 @@
 from __future__ import annotations
 
+import itertools
 from datetime import date
+from typing import Callable, Iterable, Iterator
+
 import pandas as pd
 
 from src.mktfeeder_greyhounds.config import settings
 from src.mktfeeder_greyhounds.logger import get_logger
-from src.mktfeeder_greyhounds.scrapers.timeform import build_timeform_forecast_df, scrape_timeform_forecast
-from src.mktfeeder_greyhounds.utils.files import write_dataframe
+from src.mktfeeder_greyhounds.pipeline.market_join import market_join_enabled, save_betfair_index
+from src.mktfeeder_greyhounds.scrapers.timeform import iter_timeform_forecast_frames, scrape_timeform_forecast
+from src.mktfeeder_greyhounds.utils.files import load_dataset, save_dataset_chunks
+from src.mktfeeder_greyhounds.utils.journal import ScrapeJournal, open_scrape_journal
+from src.mktfeeder_greyhounds.utils.page_cache import get_page_cache
+from src.mktfeeder_greyhounds.utils.selenium_driver import log_network_summary
+from src.mktfeeder_greyhounds.utils.text import normalization_cache_info
+
+_FORECAST_COLS = ("Forecast1", "Forecast2", "Forecast3")
+
+
+def cell_text(value: object) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+def row_key(row: dict) -> tuple[str, str]:
+    return cell_text(row.get("track_key")), cell_text(row.get("hhmm"))
+
+
+def is_complete(row: dict) -> bool:
+    if cell_text(row.get("category_norm")) in ("", "UNK"):
+        return False
+    return all(cell_text(row.get(col)) for col in _FORECAST_COLS)
+
+
+def load_existing_raw(day: str) -> list[dict]:
+    df = load_dataset("timeform_forecast", day)
+    return df.to_dict("records") if not df.empty else []
+
+
+def _fresh_rows(journal: ScrapeJournal | None, unjournaled: list[dict]) -> Iterator[dict]:
+    """Linhas raspadas agora: lidas do journal em fluxo (inclui as retomadas de uma execução
+    interrompida), mais as que não puderam ser gravadas nele."""
+    if journal is None:
+        return iter(unjournaled)
+    return itertools.chain(journal.rows(), unjournaled)
+
+
+def _merge_rows(existing: list[dict], fresh: Callable[[], Iterable[dict]]) -> Iterator[dict]:
+    """Substitui as linhas re-raspadas na posição original e acrescenta as novas no final.
+
+    ``fresh`` é lido duas vezes; só as linhas que substituem uma existente ficam em memória.
+    """
+    existing_keys = {row_key(row) for row in existing}
+    replaced = {key: row for row in fresh() if (key := row_key(row)) in existing_keys}
+    for row in existing:
+        yield replaced.get(row_key(row), row)
+    for row in fresh():
+        if row_key(row) not in existing_keys:
+            yield row
 
 
 def run() -> dict:
     logger = get_logger()
     today_str = date.today().isoformat()
+    existing: list[dict] = []
+    skip_keys: set[tuple[str, str]] = set()
+    if settings.INCREMENTAL_SCRAPE:
+        existing = load_existing_raw(today_str)
+        skip_keys = {row_key(row) for row in existing if is_complete(row)}
+        logger.info(
+            "Raw existente: {} corridas ({} completas, {} a revisitar).",
+            len(existing),
+            len(skip_keys),
+            len(existing) - len(skip_keys),
+        )
+
+    if market_join_enabled():
+        logger.info("Coletando índice de mercados Betfair...")
+        save_betfair_index(today_str)
 
     logger.info("Coletando Timeform (forecast + verdict)...")
-    updates, scrape_stats = scrape_timeform_forecast()
-    df_forecast = build_timeform_forecast_df(updates)
-    forecast_raw_path = settings.RAW_TIMEFORM_FORECAST_DIR / f"timeform_forecast_{today_str}.csv"
-    write_dataframe(df_forecast, forecast_raw_path)
+    journal = open_scrape_journal("timeform", today_str)
+    unjournaled, scrape_stats = scrape_timeform_forecast(skip_keys=skip_keys, journal=journal)
+    # O raw é gravado em blocos enquanto o journal é lido: o dia não fica inteiro em memória.
+    if existing:
+        rows = _merge_rows(existing, lambda: _fresh_rows(journal, unjournaled))
+    else:
+        rows = _fresh_rows(journal, unjournaled)
+    forecast_raw_path = save_dataset_chunks(iter_timeform_forecast_frames(rows), "timeform_forecast", today_str)
     logger.info("timeform_forecast salvo em {}", forecast_raw_path)
+    if journal is not None:
+        journal.discard()
+    cache = get_page_cache()
+    if cache is not None:
+        cache.log_summary()
+    log_network_summary()
+    logger.info("Cache de normalização de nomes: {}", normalization_cache_info())
     return scrape_stats
 
 
+__all__ = ["cell_text", "row_key", "is_complete", "load_existing_raw", "run"]
+
+
 if __name__ == "__main__":
     run()
-
@@ -0,0 +1,86 @@
+"""Carga do warehouse histórico a partir dos datasets diários (raw, forecast e auditoria).
+
+Cada (fonte, dia) só é recarregado quando o arquivo mudou desde a última carga, então a
+execução diária e a carga completa do histórico podem rodar quantas vezes for preciso.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger
+from src.mktfeeder_greyhounds.utils.files import dataset_days, dataset_path, load_dataset
+from src.mktfeeder_greyhounds.utils.warehouse import Warehouse, open_warehouse
+
+
+def history_days() -> list[str]:
+    """Dias com algum arquivo que alimenta o warehouse."""
+    days: set[str] = set()
+    for source in ("timeform_forecast", "forecast", "marketfeeder_audit"):
+        days.update(dataset_days(source))
+    return sorted(days)
+
+
+def _sources_for_day(day: str) -> list[str]:
+    # O raw tem todas as corridas do dia; o forecast_*.csv só entra se o raw não existir mais.
+    race_source = "timeform_forecast" if dataset_path("timeform_forecast", day).exists() else "forecast"
+    return [race_source, "marketfeeder_audit"]
+
+
+def ingest_day(warehouse: Warehouse, day: str, *, force: bool = False) -> Dict[str, int]:
+    """Carrega as fontes do dia que mudaram; retorna linhas gravadas por fonte."""
+    loaded: Dict[str, int] = {}
+    for source in _sources_for_day(day):
+        path = dataset_path(source, day)
+        if not path.exists():
+            continue
+        mtime = path.stat().st_mtime
+        if not force and warehouse.ingested_mtime(source, day) == mtime:
+            continue
+        loaded[source] = warehouse.load_day(source, day, load_dataset(source, day), path, mtime)
+    return loaded
+
+
+def run(days: Iterable[str] | None = None, *, force: bool = False, bulk: bool = False) -> Dict[str, int]:
+    """Carrega ``days`` (todos os dias com arquivos, se None) no warehouse."""
+    days = history_days() if days is None else list(days)
+    started = time.perf_counter()
+    warehouse = open_warehouse()
+    if bulk:
+        warehouse.bulk_mode()
+    stats = {"days": len(days), "days_loaded": 0, "rows": 0}
+    try:
+        for day in days:
+            loaded = ingest_day(warehouse, day, force=force)
+            if loaded:
+                stats["days_loaded"] += 1
+                stats["rows"] += sum(loaded.values())
+                logger.debug("Warehouse {}: {}", day, loaded)
+    finally:
+        warehouse.close()
+    logger.info(
+        "Warehouse {}: {} dia(s) verificados | {} recarregados | {} linhas em {:.1f}s",
+        settings.WAREHOUSE_PATH,
+        stats["days"],
+        stats["days_loaded"],
+        stats["rows"],
+        time.perf_counter() - started,
+    )
+    return stats
+
+
+def run_autoload(day: str) -> Dict[str, int] | None:
+    """Carga incremental ao fim de uma execução do pipeline (respeita ``WAREHOUSE_AUTOLOAD``)."""
+    if not settings.WAREHOUSE_AUTOLOAD:
+        return None
+    try:
+        return run([day])
+    except Exception as exc:
+        # O warehouse é derivado dos arquivos do dia: uma falha aqui não pode derrubar a exportação.
+        logger.warning("Falha ao carregar o dia {} no warehouse: {}", day, exc)
+        return None
+
+
+__all__ = ["history_days", "ingest_day", "run", "run_autoload"]
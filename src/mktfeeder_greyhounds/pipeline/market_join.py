@@ -0,0 +1,224 @@
+"""Junta as corridas do Timeform aos mercados do índice Betfair (``market_id``/``market_url``).
+
+O índice Betfair do dia é raspado junto com o Timeform e gravado como dataset
+``betfair_index``. Os mercados ficam num dict por (``normalize_track_name(pista)``, hhmm):
+cada corrida do FORECAST é resolvida em O(1). Sem par exato, a busca cai num bloco
+pequeno — mercados com o mesmo horário ±1 min — e fica com a pista de chave mais parecida
+(ex.: "Shelbourne" x "Shelbourne Park"), desde que a semelhança alcance
+``MARKET_JOIN_MIN_SIMILARITY``.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger
+from src.mktfeeder_greyhounds.utils.files import load_dataset, save_dataset
+from src.mktfeeder_greyhounds.utils.frames import as_text, column, map_unique
+from src.mktfeeder_greyhounds.utils.text import normalize_track_name
+
+MARKET_COLUMNS = ("market_id", "market_url", "market_match")
+_MARKET_ID_RE = re.compile(r"/market/(\d+\.\d+)")
+_HHMM_RE = re.compile(r"^(\d{1,2}):(\d{2})$")
+# Horários vizinhos consultados no casamento aproximado, na ordem de preferência.
+_FUZZY_MINUTE_OFFSETS = (0, -1, 1)
+
+
+def market_join_enabled() -> bool:
+    """``MARKET_JOIN_ENABLED``; em ``None``, só quando o backend do Timeform já usa o Chrome."""
+    if settings.MARKET_JOIN_ENABLED is None:
+        return settings.TIMEFORM_BACKEND == "selenium"
+    return settings.MARKET_JOIN_ENABLED
+
+
+def market_id_from_url(url: str) -> str:
+    """``.../market/1.229451864`` -> ``"1.229451864"`` ("" se a URL não trouxer o id)."""
+    match = _MARKET_ID_RE.search(url or "")
+    return match.group(1) if match else ""
+
+
+def _minutes(hhmm: str) -> int | None:
+    match = _HHMM_RE.match((hhmm or "").strip())
+    if not match:
+        return None
+    return int(match.group(1)) * 60 + int(match.group(2))
+
+
+def _similarity(a: str, b: str) -> float:
+    """1.0 para chaves iguais; 0.95 se as palavras de uma contêm as da outra; senão difflib."""
+    a, b = a.lower(), b.lower()
+    if a == b:
+        return 1.0
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if tokens_a and tokens_b and (tokens_a <= tokens_b or tokens_b <= tokens_a):
+        return 0.95
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _clean_text(values: pd.Series) -> pd.Series:
+    """``as_text`` tratando NaN (células vazias lidas do CSV) como vazio."""
+    return as_text(values.where(values.notna(), None))
+
+
+def _clean_value(value: object) -> str:
+    """``_clean_text`` de um valor só."""
+    return "" if value is None or pd.isna(value) else str(value or "")
+
+
+@dataclass(frozen=True)
+class Market:
+    track_key: str
+    hhmm: str
+    market_id: str
+    market_url: str
+
+
+class MarketIndex:
+    """Mercados do dia por (track_key, hhmm), com blocos por minuto para o casamento aproximado."""
+
+    def __init__(self, markets: Iterable[Market], min_similarity: float) -> None:
+        self._min_similarity = min_similarity
+        self._exact: Dict[Tuple[str, str], Market] = {}
+        self._by_minute: Dict[int, List[Market]] = {}
+        for market in markets:
+            self._exact.setdefault((market.track_key, market.hhmm), market)
+            minute = _minutes(market.hhmm)
+            if minute is not None:
+                self._by_minute.setdefault(minute, []).append(market)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    @classmethod
+    def from_frame(cls, df_index: pd.DataFrame, min_similarity: float) -> "MarketIndex":
+        """Monta o índice a partir do dataset ``betfair_index`` (saída de ``scrape_betfair_index``)."""
+        if df_index.empty:
+            return cls([], min_similarity)
+        keys = map_unique(_clean_text(column(df_index, "track_name")), normalize_track_name)
+        labels = _clean_text(column(df_index, "race_time_label")).str.strip()
+        urls = _clean_text(column(df_index, "race_url"))
+        markets = (
+            Market(key, hhmm, market_id_from_url(url), url)
+            for key, hhmm, url in zip(keys, labels, urls)
+            if key and hhmm and url
+        )
+        return cls(markets, min_similarity)
+
+    def lookup(self, track_key: str, hhmm: str) -> Tuple[Market | None, str]:
+        """(mercado, "exact" | "fuzzy") ou (None, "")."""
+        market = self._exact.get((track_key, hhmm))
+        if market is not None:
+            return market, "exact"
+        minute = _minutes(hhmm)
+        if minute is None or not track_key:
+            return None, ""
+        best, best_score = None, 0.0
+        for offset in _FUZZY_MINUTE_OFFSETS:
+            for candidate in self._by_minute.get(minute + offset, ()):
+                score = _similarity(track_key, candidate.track_key)
+                # Empate fica com o horário preferido (mesmo minuto antes de ±1).
+                if score >= self._min_similarity and score > best_score:
+                    best, best_score = candidate, score
+        return (best, "fuzzy") if best is not None else (None, "")
+
+    def market_url(self, track: object, hhmm: object) -> str:
+        """URL do mercado de uma corrida avulsa, com a mesma limpeza de ``join_markets`` ("" sem mercado)."""
+        market, _ = self.lookup(normalize_track_name(_clean_value(track)), _clean_value(hhmm).strip())
+        return market.market_url if market else ""
+
+
+def join_markets(df_forecast: pd.DataFrame, index: MarketIndex) -> Tuple[pd.DataFrame, Dict[str, object]]:
+    """Acrescenta ``market_id``/``market_url``/``market_match`` ao FORECAST e devolve o relatório do casamento."""
+    df = df_forecast.copy()
+    tracks = _clean_text(column(df, "track"))
+    keys = map_unique(tracks, normalize_track_name)
+    hhmm = _clean_text(column(df, "hhmm")).str.strip()
+    resolved = {pair: index.lookup(*pair) for pair in dict.fromkeys(zip(keys, hhmm))}
+    matches = [resolved[pair] for pair in zip(keys, hhmm)]
+    df["market_id"] = [market.market_id if market else "" for market, _ in matches]
+    df["market_url"] = [market.market_url if market else "" for market, _ in matches]
+    df["market_match"] = [how for _, how in matches]
+
+    how = df["market_match"]
+    report: Dict[str, object] = {
+        "races": len(df.index),
+        "markets": len(index),
+        "exact": int((how == "exact").sum()),
+        "fuzzy": int((how == "fuzzy").sum()),
+        "unmatched": int((how == "").sum()),
+    }
+    report["match_rate"] = round((report["exact"] + report["fuzzy"]) / report["races"], 4) if report["races"] else 0.0
+
+    # Um aviso por par de pistas (não por corrida): basta para revisar nomes divergentes.
+    fuzzy_tracks = Counter(
+        (track, resolved[(key, time)][0].track_key)
+        for track, key, time, kind in zip(tracks, keys, hhmm, how)
+        if kind == "fuzzy"
+    )
+    for (track, market_track), count in sorted(fuzzy_tracks.items()):
+        logger.info("Mercado Betfair aproximado: {} -> {} ({} corridas)", track, market_track, count)
+    unmatched = df.loc[how == "", ["track", "hhmm"]].head(5)
+    logger.info(
+        "Mercados Betfair: {}/{} corridas ({:.1%}) | exatos: {} | aproximados: {} | sem mercado: {}{}",
+        report["exact"] + report["fuzzy"],
+        report["races"],
+        report["match_rate"],
+        report["exact"],
+        report["fuzzy"],
+        report["unmatched"],
+        " | ex.: " + "; ".join(f"{t} {h}" for t, h in unmatched.itertuples(index=False)) if len(unmatched) else "",
+    )
+    return df, report
+
+
+def load_market_index(day: str) -> MarketIndex:
+    """Índice de mercados a partir do dataset ``betfair_index`` gravado para o dia (vazio se não houver)."""
+    return MarketIndex.from_frame(load_dataset("betfair_index", day), settings.MARKET_JOIN_MIN_SIMILARITY)
+
+
+def attach_markets(df_forecast: pd.DataFrame, day: str) -> pd.DataFrame:
+    """Junta o FORECAST ao índice Betfair gravado para o dia (colunas vazias se não houver índice)."""
+    index = load_market_index(day)
+    if not len(index):
+        logger.warning("Índice Betfair do dia ausente: FORECAST sem market_id/market_url.")
+        df = df_forecast.copy()
+        for col in MARKET_COLUMNS:
+            df[col] = ""
+        return df
+    df, _ = join_markets(df_forecast, index)
+    return df
+
+
+def save_betfair_index(day: str) -> int:
+    """Raspa e grava o índice Betfair do dia; falhas só geram aviso. Retorna o total de mercados."""
+    # Import local: o selenium só é carregado quando o índice é de fato raspado.
+    from src.mktfeeder_greyhounds.scrapers.betfair_index import scrape_betfair_index
+
+    try:
+        rows = scrape_betfair_index()
+    except Exception as exc:
+        logger.warning("Falha ao raspar o índice Betfair (join de mercados): {}", exc)
+        return 0
+    if rows:
+        path = save_dataset(pd.DataFrame(rows), "betfair_index", day)
+        logger.info("Índice Betfair salvo em {} ({} mercados)", path, len(rows))
+    return len(rows)
+
+
+__all__ = [
+    "Market",
+    "MarketIndex",
+    "attach_markets",
+    "join_markets",
+    "load_market_index",
+    "market_id_from_url",
+    "market_join_enabled",
+    "save_betfair_index",
+]
@@ -0,0 +1,193 @@
+"""Pipeline em streaming: publica o arquivo do MarketFeeder enquanto a raspagem avança."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger
+from src.mktfeeder_greyhounds.pipeline import build_marketfeeder_import, build_outputs
+from src.mktfeeder_greyhounds.pipeline.daily_scrape import is_complete, load_existing_raw, row_key
+from src.mktfeeder_greyhounds.pipeline.market_join import MarketIndex, market_join_enabled, save_betfair_index
+from src.mktfeeder_greyhounds.scrapers.timeform import build_timeform_forecast_df, scrape_timeform_forecast
+from src.mktfeeder_greyhounds.utils.files import save_dataset
+from src.mktfeeder_greyhounds.utils.journal import open_scrape_journal
+from src.mktfeeder_greyhounds.utils.page_cache import get_page_cache
+from src.mktfeeder_greyhounds.utils.selenium_driver import log_network_summary
+from src.mktfeeder_greyhounds.utils.text import normalization_cache_info
+
+
+class StreamingPublisher:
+    """Acumula as linhas raw e republica o arquivo fixo a cada N corridas ou T segundos.
+
+    Cada linha vira as seleções da corrida assim que chega, na thread de quem chamou ``add``;
+    uma publicação só ordena as seleções já prontas. As linhas são indexadas por
+    (track_key, hhmm): uma corrida re-raspada substitui a anterior. ``add`` pode ser chamado
+    de várias threads de worker: o lock só protege o estado e a gravação dos arquivos acontece
+    fora dele. Linhas paradas há T segundos são publicadas por um timer; ``close`` publica o
+    que faltar. Com ``markets`` (o índice Betfair do dia), cada corrida é juntada ao seu
+    mercado e a auditoria mantém ``market_id``/``market_url``, como na publicação final.
+    """
+
+    def __init__(
+        self,
+        every_races: int,
+        every_sec: float,
+        seed_rows: list[dict] | None = None,
+        markets: MarketIndex | None = None,
+    ) -> None:
+        self._every_races = max(1, every_races)
+        self._every_sec = every_sec
+        self._markets = markets
+        self._rows: dict[tuple[str, str], dict] = {}
+        self._selections: dict[tuple[str, str], list[dict]] = {}
+        for row in seed_rows or []:
+            self._rows[row_key(row)] = row
+            self._selections[row_key(row)] = self._race_selections(row)
+        self._pending = 0
+        self._last_publish = time.monotonic()
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._closed = False
+        self._version = 0
+        self._write_lock = threading.Lock()
+        self._written = 0
+        self.publishes = 0
+
+    def _race_selections(self, row: dict) -> list[dict]:
+        race = build_outputs.forecast_row(row)
+        if race is None:
+            return []
+        market_url = None if self._markets is None else self._markets.market_url(race["track"], race["hhmm"])
+        return build_marketfeeder_import.race_selections(race, market_url)
+
+    def add(self, row: dict, force: bool = False) -> None:
+        """Registra a linha; ``force`` republica imediatamente (refresh do daemon)."""
+        key = row_key(row)
+        selections = self._race_selections(row)
+        with self._lock:
+            self._rows[key] = row
+            self._selections[key] = selections
+            self._pending += 1
+            due_by_count = self._pending >= self._every_races
+            due_by_time = time.monotonic() - self._last_publish >= self._every_sec
+            if force or due_by_count or due_by_time:
+                snapshot = self._snapshot_locked()
+            else:
+                snapshot = None
+                self._arm_timer_locked()
+        if snapshot is not None:
+            self._publish(*snapshot)
+
+    def rows(self) -> list[dict]:
+        with self._lock:
+            return list(self._rows.values())
+
+    def flush(self) -> None:
+        """Publica as linhas ainda não publicadas (chamado pelo timer e por ``close``)."""
+        with self._lock:
+            snapshot = self._snapshot_locked() if self._pending else None
+        if snapshot is not None:
+            self._publish(*snapshot)
+
+    def close(self) -> None:
+        """Para o timer e publica o que faltar."""
+        with self._lock:
+            self._closed = True
+        self.flush()
+
+    def _arm_timer_locked(self) -> None:
+        if self._timer is not None or self._closed or not math.isfinite(self._every_sec):
+            return
+        wait = max(0.0, self._every_sec - (time.monotonic() - self._last_publish))
+        self._timer = threading.Timer(wait, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _snapshot_locked(self) -> tuple[int, list[list[dict]]]:
+        self._pending = 0
+        self._last_publish = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._version += 1
+        return self._version, list(self._selections.values())
+
+    def _publish(self, version: int, races: list[list[dict]]) -> None:
+        with self._write_lock:
+            # Duas threads podem publicar ao mesmo tempo: um snapshot antigo não sobrescreve um novo.
+            if version <= self._written:
+                return
+            self._written = version
+            lines, audit = build_marketfeeder_import.render_selections(races)
+            if not lines:
+                return
+            fixed_path, _, _ = build_marketfeeder_import.write_marketfeeder_files(lines, audit)
+            self.publishes += 1
+            logger.info(
+                "Publicação parcial #{}: {} corridas raspadas | {} seleções em {}",
+                self.publishes,
+                len(races),
+                len(lines),
+                fixed_path,
+            )
+
+
+def run() -> tuple[dict, pd.DataFrame, pd.DataFrame, build_marketfeeder_import.RunResult]:
+    """Raspa (corridas mais próximas primeiro) publicando progressivamente; no final grava
+    raw, TOP3, FORECAST e a publicação definitiva do MarketFeeder."""
+    today_str = date.today().isoformat()
+    existing: list[dict] = []
+    skip_keys: set[tuple[str, str]] = set()
+    if settings.INCREMENTAL_SCRAPE:
+        existing = load_existing_raw(today_str)
+        skip_keys = {row_key(row) for row in existing if is_complete(row)}
+
+    publisher = StreamingPublisher(
+        settings.STREAM_PUBLISH_EVERY_RACES,
+        settings.STREAM_PUBLISH_EVERY_SEC,
+        seed_rows=existing,
+    )
+    logger.info("Coletando Timeform em streaming (publicação progressiva do MarketFeeder)...")
+    journal = open_scrape_journal("timeform", today_str)
+    try:
+        _, scrape_stats = scrape_timeform_forecast(
+            skip_keys=skip_keys, on_row=publisher.add, soonest_first=True, journal=journal
+        )
+    finally:
+        # As últimas corridas saem já, sem esperar o índice Betfair e a gravação final.
+        publisher.close()
+
+    df_raw = build_timeform_forecast_df(publisher.rows())
+    forecast_raw_path = save_dataset(df_raw, "timeform_forecast", today_str)
+    logger.info("timeform_forecast salvo em {}", forecast_raw_path)
+    if journal is not None:
+        journal.discard()
+    cache = get_page_cache()
+    if cache is not None:
+        cache.log_summary()
+    log_network_summary()
+    logger.info("Cache de normalização de nomes: {}", normalization_cache_info())
+
+    if df_raw.empty:
+        logger.warning("Sem dados de timeform_forecast para gerar outputs.")
+        return scrape_stats, pd.DataFrame(), pd.DataFrame(), (None, None, None, 0, 0, 0, {}, {}, {}, 0, {})
+
+    # As publicações parciais não usam o índice Betfair: ele só é raspado agora, para a
+    # gravação final, e não atrasa a primeira publicação.
+    if market_join_enabled():
+        logger.info("Coletando índice de mercados Betfair...")
+        save_betfair_index(today_str)
+    df_top3, df_forecast = build_outputs.write_outputs(df_raw, today_str)
+    if df_forecast.empty:
+        logger.warning("Nenhum FORECAST para gerar arquivos do MarketFeeder.")
+        return scrape_stats, df_top3, df_forecast, (None, None, None, 0, 0, 0, {}, {}, {}, 0, {})
+    return scrape_stats, df_top3, df_forecast, build_marketfeeder_import.publish(df_forecast)
+
+
+__all__ = ["StreamingPublisher", "run"]
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import json
+from datetime import date
 from typing import Dict, List
-from urllib.parse import urljoin
 
 from loguru import logger
 from selenium.webdriver.common.by import By
@@ -10,8 +11,10 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException
 
 from src.mktfeeder_greyhounds.config import settings
-from src.mktfeeder_greyhounds.utils.dates import hhmm_to_today_iso
-from src.mktfeeder_greyhounds.utils.selenium_driver import build_chrome_driver
+from src.mktfeeder_greyhounds.scrapers.betfair_parse import parse_betfair_index
+from src.mktfeeder_greyhounds.utils.metrics import stage
+from src.mktfeeder_greyhounds.utils.page_cache import get_page_cache
+from src.mktfeeder_greyhounds.utils.selenium_driver import get_browser_session, navigate
 
 
 def _try_click_cookie_button(driver) -> bool:
@@ -34,6 +37,12 @@ def _try_click_cookie_button(driver) -> bool:
 
 
 def _accept_cookies(driver) -> None:
+    try:
+        if driver.get_cookie("OptanonAlertBoxClosed"):
+            logger.debug("Consentimento de cookies (Betfair) ja registrado no perfil.")
+            return
+    except Exception:
+        pass
     if _try_click_cookie_button(driver):
         logger.debug("Cookies aceitos no documento principal.")
         return
@@ -51,21 +60,39 @@ def _accept_cookies(driver) -> None:
     logger.debug("Botao de cookies nao encontrado ou ja aceito.")
 
 
+# Um único execute_script: acha a aba GB & IRE e só clica se ela não estiver ativa.
+_SELECT_TAB_JS = """
+const tabs = document.querySelectorAll('li.country-tab, .country-tab');
+for (const tab of tabs) {
+  const label = (tab.textContent || '').replace(/\\s+/g, ' ');
+  if (label.includes('GB') && label.includes('IRE')) {
+    if (tab.classList.contains('active')) {
+      return document.querySelector('.meeting-label') ? 'ready' : 'active';
+    }
+    tab.click();
+    return 'clicked';
+  }
+}
+return tabs.length ? 'missing' : 'absent';
+"""
+
+
 def _select_gb_ire_tab(driver) -> None:
+    """Seleciona a aba GB & IRE; com a aba já ativa e os meetings na tela, retorna sem esperas."""
     try:
-        wait = WebDriverWait(driver, settings.SELENIUM_EXPLICIT_WAIT_SEC)
-        wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "li.country-tab, .country-tab")))
-        tabs = driver.find_elements(By.CSS_SELECTOR, "li.country-tab, .country-tab")
-        for tab in tabs:
-            label = (tab.text or "").strip().replace("\n", " ")
-            if ("GB" in label and "IRE" in label) or ("GB & IRE" in label):
-                if "active" not in (tab.get_attribute("class") or ""):
-                    tab.click()
-                    break
+        state = driver.execute_script(_SELECT_TAB_JS)
+        if state == "absent":
+            WebDriverWait(driver, settings.SELENIUM_EXPLICIT_WAIT_SEC).until(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "li.country-tab, .country-tab"))
+            )
+            state = driver.execute_script(_SELECT_TAB_JS)
+        if state == "ready":
+            logger.debug("Aba GB & IRE ja ativa.")
+            return
         WebDriverWait(driver, settings.SELENIUM_EXPLICIT_WAIT_SEC + 10).until(
             EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".meeting-label"))
         )
-        logger.debug("Aba GB & IRE selecionada.")
+        logger.debug("Aba GB & IRE selecionada ({}).", state)
     except Exception as exc:
         logger.warning(f"Erro ao selecionar aba GB & IRE: {exc}")
 
@@ -75,64 +102,45 @@ def scrape_betfair_index() -> List[Dict[str, str]]:
     Retorna lista de dicionários:
     track_name, race_time_label, race_time_iso, race_url
     """
+    cache = get_page_cache()
+    cache_key = (settings.BETFAIR_GREYHOUND_RACING_URL, date.today().isoformat())
+    if cache is not None:
+        cached = cache.get(*cache_key)
+        if cached:
+            rows = json.loads(cached)
+            logger.info("Indice Betfair lido do cache: {} corridas.", len(rows))
+            return rows
+
     logger.info("Iniciando scrape do indice Betfair: {}", settings.BETFAIR_GREYHOUND_RACING_URL)
-    driver = build_chrome_driver()
-    try:
-        driver.get(settings.BETFAIR_GREYHOUND_RACING_URL)
-        _accept_cookies(driver)
+    # O Chrome é da sessão compartilhada (reaproveitado pelo Timeform): não encerra aqui.
+    browser = get_browser_session()
+    driver = browser.driver
+    with stage("betfair.index_get"):
+        navigate(driver, settings.BETFAIR_GREYHOUND_RACING_URL)
+    if "betfair" not in browser.visited:
+        with stage("betfair.cookies"):
+            _accept_cookies(driver)
+        # Só marca a sessão depois dos cookies: se a navegação falhar, a próxima chamada refaz.
+        browser.visited.add("betfair")
+    with stage("betfair.select_tab"):
         _select_gb_ire_tab(driver)
 
-        rows: List[Dict[str, str]] = []
-        try:
-            wait = WebDriverWait(driver, settings.SELENIUM_EXPLICIT_WAIT_SEC + 10)
-            wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".meeting-label")))
-            meetings = driver.find_elements(By.CSS_SELECTOR, ".country-content li.meeting-item, li.meeting-item")
-            if not meetings:
-                meetings = driver.find_elements(By.CSS_SELECTOR, ".meeting-label")
-                logger.debug("Fallback: usando labels de meeting.")
-            for meeting in meetings:
-                track_name = ""
-                try:
-                    track_name = meeting.find_element(By.CSS_SELECTOR, ".meeting-label").text.strip()
-                except Exception:
-                    try:
-                        track_name = meeting.text.strip()
-                    except Exception:
-                        pass
-
-                race_links = []
-                try:
-                    race_links = meeting.find_elements(By.CSS_SELECTOR, "ul.race-list li.race-information a.race-link")
-                except Exception:
-                    pass
-                for anchor in race_links:
-                    try:
-                        time_label = anchor.find_element(By.CSS_SELECTOR, ".label").text.strip()
-                    except Exception:
-                        time_label = ""
-
-                    href = anchor.get_attribute("href") or anchor.get_attribute("ng-href") or anchor.get_attribute("data-href")
-                    if not href:
-                        href = anchor.get_attribute("attr.href") or ""
-
-                    if href and not href.startswith("http"):
-                        href = urljoin(settings.BETFAIR_BASE_URL, href.lstrip("/"))
-
-                    rows.append(
-                        {
-                            "track_name": track_name,
-                            "race_time_label": time_label,
-                            "race_time_iso": hhmm_to_today_iso(time_label) if time_label else "",
-                            "race_url": href,
-                        }
-                    )
-        except TimeoutException:
-            logger.error("Timeout aguardando meetings Betfair.")
-
-        logger.info("Total de corridas encontradas: {}", len(rows))
-        return rows
-    finally:
-        driver.quit()
+    rows: List[Dict[str, str]] = []
+    try:
+        wait = WebDriverWait(driver, settings.SELENIUM_EXPLICIT_WAIT_SEC + 10)
+        wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".meeting-label")))
+        # Uma leitura do DOM e o parse em Python, em vez de find_element/get_attribute por corrida.
+        with stage("betfair.page_source"):
+            html = driver.page_source
+        with stage("betfair.parse"):
+            rows = parse_betfair_index(html, settings.BETFAIR_GREYHOUND_RACING_URL)
+    except TimeoutException:
+        logger.error("Timeout aguardando meetings Betfair.")
+
+    logger.info("Total de corridas encontradas: {}", len(rows))
+    if cache is not None and rows:
+        cache.put(*cache_key, json.dumps(rows))
+    return rows
 
 
 __all__ = ["scrape_betfair_index"]
@@ -0,0 +1,68 @@
+"""Parsing do índice de corridas da Betfair a partir do ``page_source`` (sem round-trips ao chromedriver)."""
+
+from __future__ import annotations
+
+from typing import Dict, List
+from urllib.parse import urljoin
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.scrapers.timeform_parse import Node, parse_html
+from src.mktfeeder_greyhounds.utils.dates import hhmm_to_today_iso
+
+_HREF_ATTRS = ("href", "ng-href", "data-href", "attr.href")
+
+
+def _has_ancestor_cls(node: Node, tag: str, cls: str, stop: Node) -> bool:
+    parent = node.parent
+    while parent is not None and parent is not stop:
+        if parent.tag == tag and cls in parent.classes:
+            return True
+        parent = parent.parent
+    return False
+
+
+def _race_links(meeting: Node) -> List[Node]:
+    """Equivalente a ``ul.race-list li.race-information a.race-link`` dentro do meeting."""
+    return [
+        anchor
+        for anchor in meeting.find_all("a", "race-link")
+        if _has_ancestor_cls(anchor, "li", "race-information", meeting)
+        and _has_ancestor_cls(anchor, "ul", "race-list", meeting)
+    ]
+
+
+def _race_url(anchor: Node, base_url: str) -> str:
+    href = next((anchor.attrs[attr] for attr in _HREF_ATTRS if anchor.attrs.get(attr)), "")
+    # O Selenium devolvia a propriedade ``href`` já resolvida contra a página; no HTML cru ela é relativa.
+    if href and not href.startswith("http"):
+        href = urljoin(base_url, href)
+    return href
+
+
+def parse_betfair_index(html: str, base_url: str | None = None) -> List[Dict[str, str]]:
+    """Linhas ``track_name, race_time_label, race_time_iso, race_url`` de cada corrida listada.
+
+    Links relativos são resolvidos contra ``base_url`` (padrão: ``BETFAIR_GREYHOUND_RACING_URL``).
+    """
+    base_url = base_url or settings.BETFAIR_GREYHOUND_RACING_URL
+    doc = parse_html(html)
+    meetings = doc.find_all("li", "meeting-item") or doc.find_all(cls="meeting-label")
+    rows: List[Dict[str, str]] = []
+    for meeting in meetings:
+        label = meeting if "meeting-label" in meeting.classes else meeting.find(cls="meeting-label")
+        track_name = (label or meeting).text.strip()
+        for anchor in _race_links(meeting):
+            time_el = anchor.find(cls="label")
+            time_label = time_el.text.strip() if time_el is not None else ""
+            rows.append(
+                {
+                    "track_name": track_name,
+                    "race_time_label": time_label,
+                    "race_time_iso": hhmm_to_today_iso(time_label) if time_label else "",
+                    "race_url": _race_url(anchor, base_url),
+                }
+            )
+    return rows
+
+
+__all__ = ["parse_betfair_index"]
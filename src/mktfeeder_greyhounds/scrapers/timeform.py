@@ -1,37 +1,189 @@
 from __future__ import annotations
 
+import queue
 import random
-import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, time as dt_time, timedelta
-from typing import Dict, Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple
 
 import pandas as pd
 from loguru import logger
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 from urllib.parse import urljoin
 
 from src.mktfeeder_greyhounds.config import settings
-from src.mktfeeder_greyhounds.utils.dates import hhmm_to_today_iso
-from src.mktfeeder_greyhounds.utils.selenium_driver import build_chrome_driver
-from src.mktfeeder_greyhounds.utils.text import clean_dog_name, normalize_category, normalize_track_name
+from src.mktfeeder_greyhounds.scrapers.timeform_parse import (
+    GRADE_RE,
+    TIMEFORM_BASE,
+    _fractional_to_decimal,
+    _parse_forecast_items,
+    parse_card_list,
+    parse_race_page,
+)
+from src.mktfeeder_greyhounds.utils.async_fetch import fetch_pages_sync
+from src.mktfeeder_greyhounds.utils.dates import hhmm_to_iso
+from src.mktfeeder_greyhounds.utils.http_session import build_http_session, fetch_html
+from src.mktfeeder_greyhounds.utils.journal import ScrapeJournal
+from src.mktfeeder_greyhounds.utils.metrics import observe, stage
+from src.mktfeeder_greyhounds.utils.page_cache import get_page_cache
+from src.mktfeeder_greyhounds.utils.rate_limit import HostRateLimiter
+from src.mktfeeder_greyhounds.utils.selenium_driver import (
+    browser_profile,
+    build_chrome_driver,
+    get_browser_session,
+    navigate,
+)
+from src.mktfeeder_greyhounds.utils.text import normalize_category, normalize_track_name
 
 _TIMEFORM_HOME = settings.TIMEFORM_BASE_URL
-_TIMEFORM_BASE = "https://www.timeform.com/greyhound-racing"
-GRADE_RE = re.compile(r"Grade:\s*\(([A-Z]{1,3}\d{0,2})\)", re.IGNORECASE)
+_TIMEFORM_BASE = TIMEFORM_BASE
+_CONSENT_COOKIE = "OptanonAlertBoxClosed"
+# Compartilhado por todos os workers: limita o total de page loads por host.
+_RATE_LIMITER = HostRateLimiter(settings.TIMEFORM_MAX_REQUESTS_PER_SEC)
+
+
+_MIN_DELAY_SEC = 0.001
+
+
+class _PolitenessController:
+    """Delay adaptativo (AIMD) entre page loads do Timeform, compartilhado pelos workers.
+
+    O ritmo (páginas/s = 1/delay) sobe ``TIMEFORM_RATE_STEP_PER_SEC`` a cada página saudável;
+    page load lento (acima de ``TIMEFORM_SLOW_PAGE_SEC``), timeout/erro de rede ou extração
+    falha (sem top3 nem forecast, ou grade UNK) multiplicam o delay por ``TIMEFORM_DELAY_BACKOFF``.
+    Somar no ritmo (e não no delay) faz a volta de um delay alto levar poucas páginas.
+    O delay fica sempre entre ``TIMEFORM_DELAY_FLOOR_SEC`` e ``TIMEFORM_DELAY_CEILING_SEC``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._delay = self._clamp(settings.TIMEFORM_MAX_DELAY_SEC)
+        self._started = time.monotonic()
+        self.trajectory: List[Tuple[float, float, str]] = []
+        self.backoffs = 0
+
+    @staticmethod
+    def _clamp(delay: float) -> float:
+        floor = max(0.0, settings.TIMEFORM_DELAY_FLOOR_SEC)
+        return min(max(delay, floor), max(floor, settings.TIMEFORM_DELAY_CEILING_SEC))
+
+    @property
+    def delay(self) -> float:
+        return self._delay
+
+    def start_run(self) -> None:
+        """Zera a trajetória de uma raspagem; o delay aprendido é mantido (daemon)."""
+        with self._lock:
+            self._started = time.monotonic()
+            self.trajectory = [(0.0, self._delay, "start")]
+            self.backoffs = 0
+
+    def _set(self, delay: float, reason: str) -> None:
+        previous, self._delay = self._delay, self._clamp(delay)
+        if self._delay != previous:
+            self.trajectory.append((round(time.monotonic() - self._started, 1), round(self._delay, 3), reason))
+
+    def record(self, latency: float | None, problem: str = "") -> None:
+        """Resultado de um page load: ``problem`` vazio e latência normal aceleram; o resto recua."""
+        if latency is not None and not problem and latency > settings.TIMEFORM_SLOW_PAGE_SEC:
+            problem = f"slow {latency:.1f}s"
+        with self._lock:
+            previous = self._delay
+            if problem:
+                self.backoffs += 1
+                self._set(previous * settings.TIMEFORM_DELAY_BACKOFF, problem)
+            else:
+                rate = 1.0 / max(previous, _MIN_DELAY_SEC)
+                self._set(1.0 / (rate + settings.TIMEFORM_RATE_STEP_PER_SEC), "ok")
+            current = self._delay
+        if problem and current != previous:
+            logger.info("Delay Timeform aumentado para {:.2f}s ({}).", current, problem)
+
+    def sleep(self, label: str = "") -> None:
+        if settings.TIMEFORM_ADAPTIVE_DELAY:
+            # Jitter de ±20% em torno do delay atual, para não bater num ritmo fixo.
+            base = self._delay
+            delay = random.uniform(0.8 * base, 1.2 * base)
+        else:
+            low = max(0.0, settings.TIMEFORM_MIN_DELAY_SEC)
+            high = max(low, settings.TIMEFORM_MAX_DELAY_SEC)
+            delay = random.uniform(low, high)
+        logger.debug("Delay{}: {:.2f}s", f" {label}" if label else "", delay)
+        with stage(f"timeform.sleep.{label or 'other'}"):
+            time.sleep(delay)
+
+    def log_summary(self) -> None:
+        if not settings.TIMEFORM_ADAPTIVE_DELAY or not self.trajectory:
+            return
+        delays = [delay for _, delay, _ in self.trajectory]
+        # Só as mudanças de direção (e o ponto final) entram na linha; a lista completa vai para o debug.
+        turns = [self.trajectory[0]]
+        for prev, cur, nxt in zip(self.trajectory, self.trajectory[1:], self.trajectory[2:] + [None]):
+            if nxt is None or (cur[1] - prev[1]) * (nxt[1] - cur[1]) < 0:
+                turns.append(cur)
+        logger.info(
+            "Delay adaptativo Timeform: {:.2f}s -> {:.2f}s (min {:.2f}s, max {:.2f}s, {} recuos) | trajetória: {}",
+            delays[0],
+            self._delay,
+            min(delays),
+            max(delays),
+            self.backoffs,
+            " ".join(f"{t:.0f}s={d:.2f}" + (f"({why})" if why not in ("ok", "start") else "") for t, d, why in turns),
+        )
+        logger.debug("Trajetória completa do delay Timeform: {}", self.trajectory)
+
+
+_POLITENESS = _PolitenessController()
 
 
 def _sleep_jitter(label: str = "") -> None:
-    low = max(0.0, settings.TIMEFORM_MIN_DELAY_SEC)
-    high = max(low, settings.TIMEFORM_MAX_DELAY_SEC)
-    delay = random.uniform(low, high)
-    logger.debug("Delay{}: {:.2f}s", f" {label}" if label else "", delay)
-    time.sleep(delay)
+    _POLITENESS.sleep(label)
+
+
+def _page_problem(parsed: Dict[str, object]) -> str:
+    """Motivo de recuo do delay para uma página extraída ("" se veio completa)."""
+    if not (parsed["top3"] or parsed["forecast"]):
+        return "empty"
+    if normalize_category(str(parsed["category_raw"])) == "UNK":
+        return "UNK"
+    return ""
+
+
+def use_rate_limiter(limiter) -> None:
+    """Troca o limitador de page loads do processo (ex.: ``SharedRateLimiter`` do backfill)."""
+    global _RATE_LIMITER
+    _RATE_LIMITER = limiter
+
+
+def _transport_problem(exc: Exception) -> str:
+    """Motivo de recuo para uma falha da requisição HTTP ("" se não indica sobrecarga do site)."""
+    from requests import exceptions as http_errors
+
+    if isinstance(exc, http_errors.HTTPError):
+        status = exc.response.status_code if exc.response is not None else 0
+        return f"HTTP {status}" if status == 429 or status >= 500 else ""
+    if isinstance(exc, (http_errors.Timeout, http_errors.ConnectionError, http_errors.RetryError)):
+        return type(exc).__name__
+    return ""
+
+
+def _throttle(url: str) -> None:
+    observe("timeform.rate_limit_wait", _RATE_LIMITER.acquire(url))
 
 
 def _accept_cookies(driver) -> None:
+    # Imports locais: com o backend HTTP o selenium só é carregado se houver fallback.
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        if driver.get_cookie(_CONSENT_COOKIE):
+            logger.debug("Consentimento de cookies (Timeform) ja registrado no perfil.")
+            return
+    except Exception:
+        pass
     try:
         wait = WebDriverWait(driver, settings.SELENIUM_EXPLICIT_WAIT_SEC)
         banner = None
@@ -62,6 +214,8 @@ def _accept_cookies(driver) -> None:
 
 
 def _list_cards(driver) -> List[Dict[str, str]]:
+    from selenium.webdriver.common.by import By
+
     cards: List[Dict[str, str]] = []
     try:
         container_list = driver.find_elements(By.CSS_SELECTOR, ".wfr-bytrack-content")
@@ -113,254 +267,644 @@ def _list_cards(driver) -> List[Dict[str, str]]:
     return cards
 
 
-def _extract_top3(driver) -> List[str]:
+def _extract_snapshot(driver) -> Tuple[str, Dict[str, object]]:
+    """Lê o ``page_source`` uma única vez e extrai verdict, forecast e grade em Python."""
     try:
-        container = driver.find_element(By.CSS_SELECTOR, ".rpf-verdict-container")
-        selections = container.find_elements(By.CSS_SELECTOR, ".rpf-verdict-selection")
-        top_names: List[str] = []
-        for selection in selections[:3]:
-            try:
-                name_el = selection.find_element(By.CSS_SELECTOR, ".rpf-verdict-selection-name a")
-                name = name_el.text.strip()
-                if name:
-                    top_names.append(clean_dog_name(name))
-            except Exception:
-                continue
-        return top_names
+        with stage("timeform.page_source"):
+            html = driver.page_source
     except Exception:
-        return []
+        html = ""
+    return html, parse_race_page(html)
 
 
-def _fractional_to_decimal(odd_txt: str) -> float | None:
-    if not odd_txt:
-        return None
-    txt = odd_txt.strip().lower()
-    if txt in {"evs", "evens"}:
-        return 2.0
-    m = re.match(r"^(\d+)\s*/\s*(\d+)$", txt)
-    if not m:
+def _race_datetime(hhmm: str, today_date: date) -> datetime | None:
+    try:
+        hh, mm = [int(x) for x in hhmm.split(":")[:2]]
+        return datetime.combine(today_date, dt_time(hh, mm))
+    except Exception:
         return None
-    num = int(m.group(1))
-    den = int(m.group(2)) if int(m.group(2)) != 0 else 1
-    return round((num / den) + 1.0, 2)
-
-
-def _parse_forecast_items(forecast_text: str) -> List[Dict[str, object]]:
-    parts = [p.strip() for p in forecast_text.split(",") if p.strip()]
-    out: List[Dict[str, object]] = []
-    for part in parts:
-        match = re.match(r"^(?P<odd>(?:\d+\s*/\s*\d+|evs|evens))\s+(?P<name>.+)$", part, flags=re.IGNORECASE)
-        if not match:
-            match = re.match(r"^(?P<name>.+?)\s+(?P<odd>(?:\d+\s*/\s*\d+|evs|evens))$", part, flags=re.IGNORECASE)
-        if not match:
-            continue
-        odd_raw = match.group("odd")
-        name_raw = match.group("name")
-        odd_val = _fractional_to_decimal(odd_raw)
-        out.append({"name": clean_dog_name(name_raw), "odds": odd_val})
-    return out
-
-
-def _extract_betting_forecast(driver) -> List[Dict[str, object]]:
-    texts: List[str] = []
-    xpaths = [
-        "//p[b[contains(., 'Betting Forecast')]]",
-        "//p[contains(., 'Betting Forecast')]",
-        "//*[contains(text(), 'Betting Forecast')]",
-    ]
-    for xp in xpaths:
+
+
+def _is_past_race(hhmm: str, today_date: date) -> bool:
+    # Só vale para o dia corrente: no backfill de datas passadas todas as corridas já largaram.
+    if today_date != date.today():
+        return False
+    race_dt = _race_datetime(hhmm, today_date)
+    if settings.SKIP_PAST_RACES and race_dt:
+        now = datetime.now()
+        return race_dt < now - timedelta(minutes=settings.PAST_RACE_GRACE_MINUTES)
+    return False
+
+
+def _new_counters() -> Dict[str, int]:
+    return {
+        "processed": 0,
+        "with_top3": 0,
+        "with_forecast": 0,
+        "skipped_past": 0,
+        "failed": 0,
+        "http_fallbacks": 0,
+    }
+
+
+def _merge_counters(
+    parts: Iterable[Tuple[Dict[str, int], Dict[str, int]]],
+) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Soma os contadores e a distribuição de categorias de cada worker."""
+    counters = _new_counters()
+    category_counts: Dict[str, int] = {}
+    for part_counters, part_categories in parts:
+        for key, value in part_counters.items():
+            counters[key] = counters.get(key, 0) + value
+        for cat, value in part_categories.items():
+            category_counts[cat] = category_counts.get(cat, 0) + value
+    return counters, category_counts
+
+
+def _open_home(driver) -> None:
+    _throttle(_TIMEFORM_HOME)
+    with stage("timeform.home_get"):
+        navigate(driver, _TIMEFORM_HOME)
+    with stage("timeform.cookies"):
+        _accept_cookies(driver)
+    _sleep_jitter("home")
+
+
+def _shared_driver():
+    """Driver da sessão compartilhada do processo, com a home do Timeform já preparada."""
+    browser = get_browser_session()
+    driver = browser.driver
+    if "timeform" not in browser.visited:
+        _open_home(driver)
+        browser.visited.add("timeform")
+    return driver
+
+
+class _SeleniumRaceFetcher:
+    """Carrega a página da corrida no Chrome e extrai do snapshot do DOM.
+
+    O worker 0 usa o Chrome compartilhado do processo; os demais abrem o próprio
+    Chrome (com perfil próprio) na primeira página que precisarem.
+    """
+
+    def __init__(self, worker_id: int = 0) -> None:
+        self._worker_id = worker_id
+        self._driver = None
+
+    @property
+    def driver(self):
+        if self._worker_id == 0:
+            return _shared_driver()
+        if self._driver is None:
+            self._driver = build_chrome_driver(profile=f"{browser_profile()}-timeform-{self._worker_id}")
+            _open_home(self._driver)
+        return self._driver
+
+    def fetch(self, card: Dict[str, str], record: bool = True) -> Tuple[List[str], str, List[Dict[str, object]]]:
+        """``record=False`` quando a página já foi contabilizada no delay adaptativo (fallback HTTP)."""
+        driver = self.driver
+        track = card.get("track_name", "")
+        hhmm = card.get("hhmm", "")
+        url = card.get("url", "")
+        _throttle(url)
+        started = time.perf_counter()
         try:
-            el = driver.find_element(By.XPATH, xp)
-            txt = el.text.strip()
-            if txt:
-                texts.append(txt)
-                break
-        except Exception:
-            continue
-    if not texts:
+            with stage("timeform.race_get"):
+                navigate(driver, url)
+        except Exception as exc:
+            if record:
+                _POLITENESS.record(None, type(exc).__name__)
+            raise
+        latency = time.perf_counter() - started
+        _sleep_jitter("race")
+
+        html, snapshot = _extract_snapshot(driver)
+        if normalize_category(str(snapshot["category_raw"])) == "UNK":
+            logger.warning("Categoria UNK (1ª tentativa), tentando novamente: {} {}", track, hhmm)
+            with stage("timeform.sleep.unk-retry"):
+                time.sleep(1.5)
+            html, snapshot = _extract_snapshot(driver)
+            if normalize_category(str(snapshot["category_raw"])) == "UNK":
+                logger.warning("Categoria UNK persistente (2ª tentativa): {} {}", track, hhmm)
+        if record:
+            _POLITENESS.record(latency, _page_problem(snapshot))
+        _cache_race(url, _card_day(card), html, snapshot)
+        _sleep_jitter("post-race")
+        return snapshot["top3"], str(snapshot["category_raw"]), snapshot["forecast"]
+
+    def close(self) -> None:
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+
+class _HttpRaceFetcher:
+    """Busca a página via HTTP e faz o parse do HTML estático.
+
+    Com ``pages`` (HTML já baixado pelo motor assíncrono), apenas faz o parse.
+    Páginas que não trazem grade nem verdict/forecast (ou cuja requisição falha)
+    são reprocessadas pelo Selenium, cujo driver só é criado se necessário.
+    """
+
+    def __init__(self, session, pages: Dict[str, str | None] | None = None, worker_id: int = 0) -> None:
+        self._session = session
+        self._pages = pages
+        self._fallback = _SeleniumRaceFetcher(worker_id)
+        self.fallbacks = 0
+
+    def _get_html(self, url: str) -> Tuple[str | None, float | None]:
+        """HTML da corrida e latência da requisição (None quando veio do download assíncrono)."""
+        if self._pages is not None and url in self._pages:
+            return self._pages[url], None
+        _throttle(url)
+        started = time.perf_counter()
+        with stage("timeform.race_http"):
+            html = fetch_html(self._session, url)
+        return html, time.perf_counter() - started
+
+    def fetch(self, card: Dict[str, str]) -> Tuple[List[str], str, List[Dict[str, object]]]:
+        """Cada página entra uma vez no delay adaptativo: a latência HTTP quando o parse fecha,
+        o erro de transporte (429/5xx, timeout, conexão) quando a requisição falha, ou o
+        resultado do Selenium quando a página só estava incompleta para o parser estático.
+        Páginas do download assíncrono não entram, nem pelo fallback.
+        """
+        url = card.get("url", "")
+        # Páginas do download assíncrono não passam pelo delay (o token bucket já controla o ritmo).
+        adaptive = self._pages is None
+        transport = ""
         try:
-            body_text = driver.find_element(By.TAG_NAME, "body").text
-            if "Betting Forecast" in body_text:
-                texts.append(body_text)
-        except Exception:
-            pass
+            html, latency = self._get_html(url)
+            parsed = parse_race_page(html) if html else None
+        except Exception as exc:
+            logger.debug("Falha HTTP em {}: {}", url, exc)
+            html, parsed = None, None
+            transport = _transport_problem(exc)
+            if adaptive and transport:
+                _POLITENESS.record(None, transport)
 
-    if not texts:
-        return []
+        if parsed is not None and _parse_ok(parsed):
+            if adaptive:
+                _POLITENESS.record(latency, "")
+            _cache_race(url, _card_day(card), html, parsed)
+            if adaptive:
+                _sleep_jitter("post-race")
+            return parsed["top3"], parsed["category_raw"], parsed["forecast"]
 
-    raw = texts[0]
-    if "Betting Forecast" in raw:
-        raw = raw.split("Betting Forecast", 1)[1]
-    raw = raw.lstrip(":").strip()
-    if "\n" in raw:
-        raw = raw.splitlines()[0].strip()
+        self.fallbacks += 1
+        logger.info("Parse HTTP incompleto, usando Selenium: {} {}", card.get("track_name"), card.get("hhmm"))
+        return self._fallback.fetch(card, record=adaptive and not transport)
 
-    return _parse_forecast_items(raw)
+    def close(self) -> None:
+        self._fallback.close()
 
 
-def _extract_category(driver) -> str:
-    texts: List[str] = []
-    try:
-        el = driver.find_element(By.XPATH, "//*[contains(., 'Grade:')]")
-        if el and el.text:
-            texts.append(el.text)
-    except Exception:
-        pass
+def _parse_ok(parsed: Dict[str, object]) -> bool:
+    if normalize_category(str(parsed["category_raw"])) == "UNK":
+        return False
+    return bool(parsed["top3"] or parsed["forecast"])
 
-    body_text = ""
-    try:
-        body_text = driver.find_element(By.TAG_NAME, "body").text
-        if body_text:
-            texts.append(body_text)
-    except Exception:
-        body_text = ""
 
-    for txt in texts:
-        match = GRADE_RE.search(txt or "")
-        if match:
-            return match.group(1).upper().replace(" ", "")
+def _card_day(card: Dict[str, str]) -> str:
+    """Dia (ISO) do card, carimbado por ``scrape_timeform_forecast``; hoje na falta."""
+    return card.get("date") or date.today().isoformat()
 
-    if body_text and "open race" in body_text.lower():
-        return "OR"
 
-    return "UNK"
+def _cached_race(url: str, day: str) -> Dict[str, object] | None:
+    cache = get_page_cache()
+    if cache is None:
+        return None
+    html = cache.get(url, day)
+    if not html:
+        return None
+    parsed = parse_race_page(html)
+    return parsed if _parse_ok(parsed) else None
+
+
+def _cache_race(url: str, day: str, html: str, parsed: Dict[str, object]) -> None:
+    """Só guarda páginas completas, para que re-execuções não reaproveitem páginas quebradas."""
+    cache = get_page_cache()
+    if cache is not None and html and _parse_ok(parsed):
+        cache.put(url, day, html)
+
+
+def _scrape_card(
+    fetcher,
+    card: Dict[str, str],
+    today_date: date,
+    counters: Dict[str, int],
+    category_counts: Dict[str, int],
+    use_cache: bool = True,
+) -> Dict[str, object] | None:
+    """Processa um card; retorna a linha raw ou None se o card foi ignorado.
+
+    ``use_cache=False`` força a ida à rede (refresh do daemon); a página nova
+    substitui a do cache.
+    """
+    track = card.get("track_name", "")
+    hhmm = card.get("hhmm", "")
+    url = card.get("url", "")
+    if not (track and hhmm and url):
+        return None
 
+    if _is_past_race(hhmm, today_date):
+        counters["skipped_past"] += 1
+        return None
 
-def scrape_timeform_forecast() -> Tuple[List[Dict[str, object]], Dict[str, int]]:
-    logger.info("Iniciando raspagem Timeform (cards do dia).")
-    driver = build_chrome_driver()
+    counters["processed"] += 1
+    cached = _cached_race(url, today_date.isoformat()) if use_cache else None
+    if cached is not None:
+        top3, category_raw, forecast_list = cached["top3"], str(cached["category_raw"]), cached["forecast"]
+    else:
+        top3, category_raw, forecast_list = fetcher.fetch(card)
+    category_norm = normalize_category(category_raw)
+
+    if not forecast_list:
+        logger.warning("Betting Forecast não encontrado: {} {}", track, hhmm)
+
+    out_row: Dict[str, object] = {
+        "date": today_date.isoformat(),
+        "track": track,
+        "track_key": normalize_track_name(track),
+        "hhmm": hhmm,
+        "race_time_iso": hhmm_to_iso(hhmm, today_date) if hhmm else "",
+        "category_raw": category_raw,
+        "category_norm": category_norm,
+        "TimeformTop1": top3[0] if len(top3) > 0 else "",
+        "TimeformTop2": top3[1] if len(top3) > 1 else "",
+        "TimeformTop3": top3[2] if len(top3) > 2 else "",
+        "Forecast1": forecast_list[0]["name"] if len(forecast_list) > 0 else "",
+        "Forecast2": forecast_list[1]["name"] if len(forecast_list) > 1 else "",
+        "Forecast3": forecast_list[2]["name"] if len(forecast_list) > 2 else "",
+        "Forecast1Odds": forecast_list[0]["odds"] if len(forecast_list) > 0 else None,
+        "Forecast2Odds": forecast_list[1]["odds"] if len(forecast_list) > 1 else None,
+        "Forecast3Odds": forecast_list[2]["odds"] if len(forecast_list) > 2 else None,
+    }
+    cat_norm = out_row["category_norm"]
+    if cat_norm:
+        category_counts[cat_norm] = category_counts.get(cat_norm, 0) + 1
+
+    if len(top3) >= 3:
+        counters["with_top3"] += 1
+    if len(forecast_list) >= 3:
+        counters["with_forecast"] += 1
+
+    return out_row
+
+
+def _scrape_worker(
+    worker_id: int,
+    fetcher,
+    work: "queue.Queue[Tuple[int, Dict[str, str]]]",
+    today_date: date,
+    on_row: Callable[[Dict[str, object]], None] | None = None,
+    journal: ScrapeJournal | None = None,
+) -> Tuple[List[Tuple[int, Dict[str, object]]], Dict[str, int], Dict[str, int]]:
+    """Consome cards da fila compartilhada até esvaziá-la e fecha o fetcher no final.
+
+    Com ``journal``, só devolve as linhas que não puderam ser gravadas nele.
+    """
+    counters = _new_counters()
+    category_counts: Dict[str, int] = {}
+    results: List[Tuple[int, Dict[str, object]]] = []
     try:
-        driver.get(_TIMEFORM_HOME)
-        _accept_cookies(driver)
-        _sleep_jitter("home")
+        while True:
+            try:
+                idx, card = work.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                row = _scrape_card(fetcher, card, today_date, counters, category_counts)
+            except Exception as exc:
+                counters["failed"] += 1
+                logger.warning(
+                    "Worker {}: falha ao processar card {} {}: {}",
+                    worker_id,
+                    card.get("track_name"),
+                    card.get("hhmm"),
+                    exc,
+                )
+                continue
+            if row is not None:
+                journaled = False
+                if journal is not None:
+                    try:
+                        journal.append(idx, card.get("url", ""), row)
+                        journaled = True
+                    except OSError as exc:
+                        logger.error("Falha ao gravar journal ({} {}): {}", row.get("track"), row.get("hhmm"), exc)
+                if not journaled:
+                    results.append((idx, row))
+                if on_row is not None:
+                    try:
+                        on_row(row)
+                    except Exception as exc:
+                        logger.error("Falha no callback de linha ({} {}): {}", row.get("track"), row.get("hhmm"), exc)
+    except Exception as exc:
+        logger.error("Worker {} do Timeform encerrado com erro: {}", worker_id, exc)
+    finally:
+        counters["http_fallbacks"] = getattr(fetcher, "fallbacks", 0)
+        fetcher.close()
+    return results, counters, category_counts
 
-        cards = _list_cards(driver)
-        logger.debug("Total de cards Timeform capturados: {}", len(cards))
 
-        count_top3 = 0
-        count_forecast = 0
-        count_processed = 0
-        skipped_past = 0
-        today_date = date.today()
-        category_counts: Dict[str, int] = {}
+def _cards_url(race_date: date | None) -> str:
+    """Home do Timeform para o dia corrente; página de racecards da data para os demais dias."""
+    if race_date is None or race_date == date.today():
+        return _TIMEFORM_HOME
+    return settings.TIMEFORM_CARDS_BY_DATE_URL.format(date=race_date.isoformat())
 
-        rows: List[Dict[str, object]] = []
 
-        for card in cards:
-            track = card.get("track_name", "")
-            hhmm = card.get("hhmm", "")
-            url = card.get("url", "")
-            if not (track and hhmm and url):
-                continue
+def _list_cards_http(session, url: str = _TIMEFORM_HOME) -> List[Dict[str, str]]:
+    try:
+        _throttle(url)
+        with stage("timeform.home_http"):
+            html = fetch_html(session, url)
+        return parse_card_list(html, _TIMEFORM_BASE)
+    except Exception as exc:
+        logger.warning("Falha ao listar cards via HTTP: {}", exc)
+        return []
 
-            race_dt = None
-            try:
-                hh, mm = [int(x) for x in hhmm.split(":")[:2]]
-                race_dt = datetime.combine(today_date, dt_time(hh, mm))
-            except Exception:
-                race_dt = None
 
-            if settings.SKIP_PAST_RACES and race_dt:
-                now = datetime.now()
-                if race_dt < now - timedelta(minutes=settings.PAST_RACE_GRACE_MINUTES):
-                    skipped_past += 1
-                    continue
+def _prefetch_pages(session, cards: List[Dict[str, str]], today_date: date) -> Dict[str, str | None]:
+    cache = get_page_cache()
+    urls = [
+        card["url"]
+        for card in cards
+        if card.get("track_name") and card.get("hhmm") and card.get("url")
+        and not _is_past_race(card["hhmm"], today_date)
+        and not (cache is not None and cache.is_fresh(card["url"], _card_day(card)))
+    ]
+    started = time.monotonic()
+    with stage("timeform.prefetch"):
+        pages = fetch_pages_sync(
+            session,
+            urls,
+            rate_per_sec=settings.TIMEFORM_ASYNC_RATE_PER_SEC,
+            burst=settings.TIMEFORM_ASYNC_BURST,
+            concurrency=settings.TIMEFORM_ASYNC_CONCURRENCY,
+            timeout=settings.HTTP_TIMEOUT_SEC,
+        )
+    ok = sum(1 for html in pages.values() if html)
+    logger.info("Download assíncrono: {}/{} páginas em {:.1f}s", ok, len(pages), time.monotonic() - started)
+    return pages
 
-            count_processed += 1
-            driver.get(url)
-            _sleep_jitter("race")
 
-            top3 = _extract_top3(driver)
-            category_raw = _extract_category(driver)
-            category_norm = normalize_category(category_raw)
-            if category_norm == "UNK":
-                logger.warning("Categoria UNK (1ª tentativa), tentando novamente: {} {}", track, hhmm)
-                time.sleep(1.5)
-                category_raw = _extract_category(driver)
-                category_norm = normalize_category(category_raw)
-                if category_norm == "UNK":
-                    logger.warning("Categoria UNK persistente (2ª tentativa): {} {}", track, hhmm)
-            forecast_list = _extract_betting_forecast(driver)
-
-            if not forecast_list:
-                logger.warning("Betting Forecast não encontrado: {} {}", track, hhmm)
-
-            out_row: Dict[str, object] = {
-                "date": date.today().isoformat(),
-                "track": track,
-                "track_key": normalize_track_name(track),
-                "hhmm": hhmm,
-                "race_time_iso": hhmm_to_today_iso(hhmm) if hhmm else "",
-                "category_raw": category_raw,
-                "category_norm": category_norm,
-                "TimeformTop1": top3[0] if len(top3) > 0 else "",
-                "TimeformTop2": top3[1] if len(top3) > 1 else "",
-                "TimeformTop3": top3[2] if len(top3) > 2 else "",
-                "Forecast1": forecast_list[0]["name"] if len(forecast_list) > 0 else "",
-                "Forecast2": forecast_list[1]["name"] if len(forecast_list) > 1 else "",
-                "Forecast3": forecast_list[2]["name"] if len(forecast_list) > 2 else "",
-                "Forecast1Odds": forecast_list[0]["odds"] if len(forecast_list) > 0 else None,
-                "Forecast2Odds": forecast_list[1]["odds"] if len(forecast_list) > 1 else None,
-                "Forecast3Odds": forecast_list[2]["odds"] if len(forecast_list) > 2 else None,
-            }
-            cat_norm = out_row["category_norm"]
-            if cat_norm:
-                category_counts[cat_norm] = category_counts.get(cat_norm, 0) + 1
-
-            if len(top3) >= 3:
-                count_top3 += 1
-            if len(forecast_list) >= 3:
-                count_forecast += 1
-
-            rows.append(out_row)
-            _sleep_jitter("post-race")
-
-        stats = {
-            "processed": count_processed,
-            "with_top3": count_top3,
-            "with_forecast": count_forecast,
-            "skipped_past": skipped_past,
-        }
+def _make_fetcher(backend: str, session, pages: Dict[str, str | None] | None, worker_id: int):
+    if backend == "async" and pages is not None:
+        return _HttpRaceFetcher(session, pages, worker_id)
+    if backend in ("http", "async"):
+        return _HttpRaceFetcher(session, worker_id=worker_id)
+    return _SeleniumRaceFetcher(worker_id)
+
+
+def list_timeform_cards(session=None, race_date: date | None = None) -> List[Dict[str, str]]:
+    """Lista os cards do dia (ou de ``race_date``) via HTTP (se houver ``session``) ou, na falta,
+    pelo Chrome compartilhado."""
+    url = _cards_url(race_date)
+    cards: List[Dict[str, str]] = []
+    if session is not None:
+        cards = _list_cards_http(session, url)
+    if not cards:
+        browser = get_browser_session()
+        home_driver = browser.driver
+        _open_home(home_driver)
+        browser.visited.add("timeform")
+        if url != _TIMEFORM_HOME:
+            _throttle(url)
+            with stage("timeform.home_get"):
+                navigate(home_driver, url)
+        with stage("timeform.list_cards"):
+            cards = _list_cards(home_driver)
+    logger.debug("Total de cards Timeform capturados: {}", len(cards))
+    return cards
+
+
+def scrape_timeform_forecast(
+    skip_keys: Set[Tuple[str, str]] | None = None,
+    on_row: Callable[[Dict[str, object]], None] | None = None,
+    soonest_first: bool = False,
+    journal: ScrapeJournal | None = None,
+    race_date: date | None = None,
+    workers: int | None = None,
+    backend: str | None = None,
+) -> Tuple[List[Dict[str, object]], Dict[str, int]]:
+    """Raspa os cards do dia (ou de ``race_date``, no backfill).
+
+    ``skip_keys`` contém pares (track_key, hhmm) já completos no raw do dia; esses cards
+    não são visitados (modo incremental). ``on_row`` é chamado (possivelmente de threads
+    de worker) assim que cada corrida é raspada; ``soonest_first`` visita primeiro as
+    corridas com largada mais próxima. Com ``journal``, cada corrida é registrada ao
+    terminar e as URLs já presentes nele (execução interrompida) não são revisitadas:
+    suas linhas passam de novo por ``on_row``, lidas do journal. ``workers`` e ``backend``
+    sobrescrevem ``TIMEFORM_WORKERS``/``TIMEFORM_BACKEND``.
+
+    Com ``journal`` as linhas não ficam em memória: o raw completo sai de ``journal.rows()``
+    e a lista devolvida traz só as que não puderam ser gravadas nele.
+    """
+    backend = backend or settings.TIMEFORM_BACKEND
+    today_date = race_date or date.today()
+    logger.info("Iniciando raspagem Timeform (cards de {}). Backend: {}", today_date.isoformat(), backend)
+    _POLITENESS.start_run()
+    session = None
+    try:
+        if backend in ("http", "async"):
+            session = build_http_session()
+        cards = [dict(card, date=today_date.isoformat()) for card in list_timeform_cards(session, today_date)]
+        # A posição na listagem completa do dia (antes de filtros e reordenação) é o ``seq`` do
+        # journal e ordena o raw final: é a mesma no run_daily, no streaming e no daemon.
+        indexed_cards = list(enumerate(cards))
+
+        skipped_known = 0
+        if skip_keys:
+            pending = [
+                (idx, c) for idx, c in indexed_cards if (c.get("track_key", ""), c.get("hhmm", "")) not in skip_keys
+            ]
+            skipped_known = len(indexed_cards) - len(pending)
+            indexed_cards = pending
+            logger.info("Modo incremental: {} cards já completos, {} a raspar.", skipped_known, len(indexed_cards))
+
+        if soonest_first:
+            indexed_cards.sort(key=lambda item: _race_datetime(item[1].get("hhmm", ""), today_date) or datetime.max)
+        resumed = 0
+        if journal is not None:
+            done_urls: Set[str] = set()
+            for entry in journal.entries():
+                done_urls.add(entry.get("url"))
+                resumed += 1
+                if on_row is not None:
+                    on_row(entry["row"])
+            if resumed:
+                indexed_cards = [(idx, card) for idx, card in indexed_cards if card.get("url") not in done_urls]
+                logger.info(
+                    "Retomando do journal {}: {} corridas já raspadas, {} cards a visitar.",
+                    journal.path,
+                    resumed,
+                    len(indexed_cards),
+                )
+        cards = [card for _, card in indexed_cards]
+        work: "queue.Queue[Tuple[int, Dict[str, str]]]" = queue.Queue()
+        for item in indexed_cards:
+            work.put(item)
+
+        pages = None
+        if backend == "async":
+            pages = _prefetch_pages(session, cards, today_date)
+
+        # No modo async os downloads já terminaram; o restante é parse (e fallbacks eventuais).
+        n_workers = 1 if backend == "async" else max(1, min(workers or settings.TIMEFORM_WORKERS, len(cards)))
+        if n_workers == 1:
+            outcomes = [_scrape_worker(0, _make_fetcher(backend, session, pages, 0), work, today_date, on_row, journal)]
+        else:
+            logger.info("Raspando {} cards com {} workers.", len(cards), n_workers)
+            with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="timeform") as pool:
+                futures = [
+                    pool.submit(
+                        _scrape_worker,
+                        worker_id,
+                        _make_fetcher(backend, session, pages, worker_id),
+                        work,
+                        today_date,
+                        on_row,
+                        journal,
+                    )
+                    for worker_id in range(n_workers)
+                ]
+                outcomes = [future.result() for future in futures]
+
+        indexed_rows: List[Tuple[int, Dict[str, object]]] = []
+        for results, _, _ in outcomes:
+            indexed_rows.extend(results)
+        indexed_rows.sort(key=lambda item: item[0])
+        rows = [row for _, row in indexed_rows]
+
+        stats, category_counts = _merge_counters((counters, cats) for _, counters, cats in outcomes)
+        stats["skipped_known"] = skipped_known
+        stats["resumed"] = resumed
 
         logger.info(
-            "Raspagem Timeform concluida. Corridas processadas: {} | com top3: {} | com betting forecast: {} | puladas (passadas): {}",
-            count_processed,
-            count_top3,
-            count_forecast,
-            skipped_past,
+            "Raspagem Timeform concluida. Corridas processadas: {} | com top3: {} | com betting forecast: {} | puladas (passadas): {} | falhas: {}",
+            stats["processed"],
+            stats["with_top3"],
+            stats["with_forecast"],
+            stats["skipped_past"],
+            stats["failed"],
         )
+        if backend in ("http", "async"):
+            logger.info("Fallbacks para Selenium (parse HTTP incompleto): {}", stats["http_fallbacks"])
         logger.info("Distribuição de categorias (processadas): {}", category_counts)
+        _POLITENESS.log_summary()
         return rows, stats
     finally:
-        driver.quit()
-
-
-def build_timeform_forecast_df(rows: Iterable[Dict[str, object]]) -> pd.DataFrame:
-    columns = [
-        "date",
-        "track",
-        "track_key",
-        "hhmm",
-        "race_time_iso",
-        "category_raw",
-        "category_norm",
-        "TimeformTop1",
-        "TimeformTop2",
-        "TimeformTop3",
-        "Forecast1",
-        "Forecast2",
-        "Forecast3",
-        "Forecast1Odds",
-        "Forecast2Odds",
-        "Forecast3Odds",
-    ]
-    data = []
+        if journal is not None:
+            journal.close()
+        if session is not None:
+            session.close()
+
+
+class TimeformRefresher:
+    """Re-raspa cards avulsos ao longo do dia (modo daemon).
+
+    Mantém ``workers`` fetchers vivos (navegadores e/ou sessão HTTP) entre os refreshes;
+    cada chamada de ``refresh`` pega um fetcher livre, então no máximo ``workers``
+    páginas são carregadas ao mesmo tempo. O worker 0 usa o Chrome compartilhado do processo.
+    """
+
+    def __init__(self, workers: int = 1) -> None:
+        self._backend = settings.TIMEFORM_BACKEND
+        self._session = build_http_session() if self._backend in ("http", "async") else None
+        self._fetchers: "queue.Queue" = queue.Queue()
+        for worker_id in range(max(1, workers)):
+            self._fetchers.put(_make_fetcher(self._backend, self._session, None, worker_id))
+        self._lock = threading.Lock()
+        self.counters = _new_counters()
+        self.category_counts: Dict[str, int] = {}
+        _POLITENESS.start_run()
+
+    def list_cards(self) -> List[Dict[str, str]]:
+        return list_timeform_cards(self._session)
+
+    def refresh(self, card: Dict[str, str]) -> Dict[str, object] | None:
+        """Raspa o card ignorando o cache; retorna a linha raw (ou None se passada/inválida)."""
+        counters = _new_counters()
+        category_counts: Dict[str, int] = {}
+        fetcher = self._fetchers.get()
+        try:
+            row = _scrape_card(fetcher, card, date.today(), counters, category_counts, use_cache=False)
+        except Exception:
+            counters["failed"] += 1
+            raise
+        finally:
+            self._fetchers.put(fetcher)
+            with self._lock:
+                self.counters, self.category_counts = _merge_counters(
+                    [(self.counters, self.category_counts), (counters, category_counts)]
+                )
+        return row
+
+    def close(self) -> None:
+        _POLITENESS.log_summary()
+        while True:
+            try:
+                fetcher = self._fetchers.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fetcher.close()
+            except Exception as exc:
+                logger.debug("Falha ao fechar fetcher do Timeform: {}", exc)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+_RAW_COLUMNS = [
+    "date",
+    "track",
+    "track_key",
+    "hhmm",
+    "race_time_iso",
+    "category_raw",
+    "category_norm",
+    "TimeformTop1",
+    "TimeformTop2",
+    "TimeformTop3",
+    "Forecast1",
+    "Forecast2",
+    "Forecast3",
+    "Forecast1Odds",
+    "Forecast2Odds",
+    "Forecast3Odds",
+]
+
+
+def iter_timeform_forecast_frames(rows: Iterable[Dict[str, object]], chunk_rows: int = 5000) -> Iterator[pd.DataFrame]:
+    """Blocos do raw com até ``chunk_rows`` linhas cada, montados enquanto ``rows`` é lido.
+
+    Sempre gera ao menos um bloco (vazio, só com as colunas, se não houver linhas).
+    """
+    data: List[Dict[str, object]] = []
+    emitted = False
     for row in rows:
-        data.append({col: row.get(col) for col in columns})
-    if not data:
-        return pd.DataFrame([], columns=columns)
-    return pd.DataFrame(data, columns=columns)
-
-
-__all__ = ["scrape_timeform_forecast", "build_timeform_forecast_df"]
+        data.append({col: row.get(col) for col in _RAW_COLUMNS})
+        if len(data) >= chunk_rows:
+            yield pd.DataFrame(data, columns=_RAW_COLUMNS)
+            emitted = True
+            data = []
+    if data or not emitted:
+        yield pd.DataFrame(data, columns=_RAW_COLUMNS)
+
+
+def build_timeform_forecast_df(rows: Iterable[Dict[str, object]], chunk_rows: int = 5000) -> pd.DataFrame:
+    """Monta o raw a partir de ``rows`` (lista ou iterador, p.ex. o journal), em blocos de ``chunk_rows``."""
+    frames = list(iter_timeform_forecast_frames(rows, chunk_rows))
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+__all__ = [
+    "scrape_timeform_forecast",
+    "list_timeform_cards",
+    "TimeformRefresher",
+    "build_timeform_forecast_df",
+    "iter_timeform_forecast_frames",
+]
 
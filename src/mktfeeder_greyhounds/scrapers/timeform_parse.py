@@ -0,0 +1,302 @@
+"""Parsing do HTML do Timeform sem navegador (html.parser da stdlib)."""
+
+from __future__ import annotations
+
+import itertools
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List
+from urllib.parse import urljoin
+
+from src.mktfeeder_greyhounds.utils.metrics import stage
+from src.mktfeeder_greyhounds.utils.text import clean_dog_name, normalize_track_name
+
+TIMEFORM_BASE = "https://www.timeform.com/greyhound-racing"
+GRADE_RE = re.compile(r"Grade:\s*\(([A-Z]{1,3}\d{0,2})\)", re.IGNORECASE)
+_FRACTION_RE = re.compile(r"^(\d+)\s*/\s*(\d+)$")
+_ODD_FIRST_RE = re.compile(r"^(?P<odd>(?:\d+\s*/\s*\d+|evs|evens))\s+(?P<name>.+)$", re.IGNORECASE)
+_ODD_LAST_RE = re.compile(r"^(?P<name>.+?)\s+(?P<odd>(?:\d+\s*/\s*\d+|evs|evens))$", re.IGNORECASE)
+_INLINE_SPACES_RE = re.compile(r"[ \t\r\f\v\u00a0]+")
+
+_VOID_TAGS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+)
+_SKIP_TEXT_TAGS = frozenset({"script", "style", "noscript", "template", "head", "title"})
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset",
+        "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+        "hr", "li", "main", "nav", "ol", "p", "section", "table", "tbody", "td", "tfoot", "th",
+        "thead", "tr", "ul",
+    }
+)
+
+
+class Node:
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: "Node | None" = None) -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List["Node | str"] = []
+        self.parent = parent
+
+    @property
+    def classes(self) -> List[str]:
+        return (self.attrs.get("class") or "").split()
+
+    def iter(self) -> Iterator["Node"]:
+        """Percorre os descendentes (pré-ordem, sem incluir o próprio nó)."""
+        stack = list(reversed([c for c in self.children if isinstance(c, Node)]))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed([c for c in node.children if isinstance(c, Node)]))
+
+    def find_all(self, tag: str | None = None, cls: str | None = None) -> List["Node"]:
+        return [
+            n for n in self.iter() if (tag is None or n.tag == tag) and (cls is None or cls in n.classes)
+        ]
+
+    def find(self, tag: str | None = None, cls: str | None = None) -> "Node | None":
+        for n in self.iter():
+            if (tag is None or n.tag == tag) and (cls is None or cls in n.classes):
+                return n
+        return None
+
+    def has_ancestor(self, tag: str, stop: "Node | None" = None) -> bool:
+        node = self.parent
+        while node is not None and node is not stop:
+            if node.tag == tag:
+                return True
+            node = node.parent
+        return False
+
+    def own_text(self) -> str:
+        return "".join(c for c in self.children if isinstance(c, str))
+
+    @property
+    def text(self) -> str:
+        """Texto renderizado aproximado (equivalente ao ``.text`` do Selenium)."""
+        parts: List[str] = []
+        _collect_text(self, parts)
+        lines = (_INLINE_SPACES_RE.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+
+def _collect_text(node: Node, parts: List[str]) -> None:
+    for child in node.children:
+        if isinstance(child, str):
+            parts.append(child.replace("\n", " "))
+        elif child.tag in _SKIP_TEXT_TAGS:
+            continue
+        elif child.tag in _BLOCK_TAGS:
+            parts.append("\n")
+            _collect_text(child, parts)
+            parts.append("\n")
+        else:
+            _collect_text(child, parts)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {})
+        self._current = self.root
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        node = Node(tag, {k: v or "" for k, v in attrs}, self._current)
+        self._current.children.append(node)
+        if tag not in _VOID_TAGS:
+            self._current = node
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        self._current.children.append(Node(tag, {k: v or "" for k, v in attrs}, self._current))
+
+    def handle_endtag(self, tag: str) -> None:
+        node: Node | None = self._current
+        while node is not None and node is not self.root:
+            if node.tag == tag:
+                self._current = node.parent or self.root
+                return
+            node = node.parent
+        # Tag de fechamento sem abertura correspondente: ignora.
+
+    def handle_data(self, data: str) -> None:
+        self._current.children.append(data)
+
+
+def parse_html(html: str) -> Node:
+    builder = _TreeBuilder()
+    builder.feed(html or "")
+    builder.close()
+    return builder.root
+
+
+def _body(doc: Node) -> Node:
+    return doc.find("body") or doc
+
+
+def _fractional_to_decimal(odd_txt: str) -> float | None:
+    if not odd_txt:
+        return None
+    txt = odd_txt.strip().lower()
+    if txt in {"evs", "evens"}:
+        return 2.0
+    m = _FRACTION_RE.match(txt)
+    if not m:
+        return None
+    num = int(m.group(1))
+    den = int(m.group(2)) if int(m.group(2)) != 0 else 1
+    return round((num / den) + 1.0, 2)
+
+
+def _parse_forecast_items(forecast_text: str) -> List[Dict[str, object]]:
+    parts = [p.strip() for p in forecast_text.split(",") if p.strip()]
+    out: List[Dict[str, object]] = []
+    for part in parts:
+        match = _ODD_FIRST_RE.match(part)
+        if not match:
+            match = _ODD_LAST_RE.match(part)
+        if not match:
+            continue
+        odd_raw = match.group("odd")
+        name_raw = match.group("name")
+        odd_val = _fractional_to_decimal(odd_raw)
+        out.append({"name": clean_dog_name(name_raw), "odds": odd_val})
+    return out
+
+
+def forecast_from_text(raw: str) -> List[Dict[str, object]]:
+    """Recorta o trecho após 'Betting Forecast' (primeira linha) e extrai nomes/odds."""
+    if "Betting Forecast" in raw:
+        raw = raw.split("Betting Forecast", 1)[1]
+    raw = raw.lstrip(":").strip()
+    if "\n" in raw:
+        raw = raw.splitlines()[0].strip()
+    return _parse_forecast_items(raw)
+
+
+def category_from_texts(texts: List[str], body_text: str) -> str:
+    for txt in texts:
+        match = GRADE_RE.search(txt or "")
+        if match:
+            return match.group(1).upper().replace(" ", "")
+
+    if body_text and "open race" in body_text.lower():
+        return "OR"
+
+    return "UNK"
+
+
+def extract_top3(doc: Node) -> List[str]:
+    container = doc.find(cls="rpf-verdict-container")
+    if container is None:
+        return []
+    top_names: List[str] = []
+    for selection in container.find_all(cls="rpf-verdict-selection")[:3]:
+        name_box = selection.find(cls="rpf-verdict-selection-name")
+        anchor = name_box.find("a") if name_box is not None else None
+        if anchor is None:
+            continue
+        name = anchor.text.strip()
+        if name:
+            top_names.append(clean_dog_name(name))
+    return top_names
+
+
+def extract_betting_forecast(doc: Node) -> List[Dict[str, object]]:
+    body = _body(doc)
+    raw = ""
+    paragraphs = body.find_all("p")
+    # Mesma ordem de preferência dos XPaths usados no Selenium.
+    candidates = itertools.chain(
+        (
+            p
+            for p in paragraphs
+            if any(isinstance(b, Node) and b.tag == "b" and "Betting Forecast" in b.text for b in p.children)
+        ),
+        (p for p in paragraphs if "Betting Forecast" in p.text),
+        (n for n in body.iter() if "Betting Forecast" in n.own_text()),
+    )
+    for node in candidates:
+        txt = node.text.strip()
+        if txt:
+            raw = txt
+            break
+    if not raw:
+        body_text = body.text
+        if "Betting Forecast" not in body_text:
+            return []
+        raw = body_text
+    return forecast_from_text(raw)
+
+
+def extract_category(doc: Node) -> str:
+    body_text = _body(doc).text
+    return category_from_texts([body_text], body_text)
+
+
+def parse_race_page(html: str) -> Dict[str, object]:
+    """Extrai top3 do verdict, Betting Forecast e grade de uma página de corrida."""
+    with stage("extract.parse_html"):
+        doc = parse_html(html)
+    with stage("extract.top3"):
+        top3 = extract_top3(doc)
+    with stage("extract.forecast"):
+        forecast = extract_betting_forecast(doc)
+    with stage("extract.category"):
+        category_raw = extract_category(doc)
+    return {"top3": top3, "forecast": forecast, "category_raw": category_raw}
+
+
+def _card(track_name: str, anchor: Node, base_url: str) -> Dict[str, str]:
+    link = anchor.attrs.get("href") or anchor.attrs.get("ng-href") or ""
+    if link and not link.startswith("http"):
+        link = urljoin(base_url, link)
+    return {
+        "track_name": track_name,
+        "track_key": normalize_track_name(track_name),
+        "hhmm": anchor.text.strip(),
+        "url": link,
+    }
+
+
+def parse_card_list(html: str, base_url: str = TIMEFORM_BASE) -> List[Dict[str, str]]:
+    """Lista os cards do dia a partir do HTML da home do Timeform."""
+    doc = parse_html(html)
+    cards: List[Dict[str, str]] = []
+    for container in doc.find_all(cls="wfr-bytrack-content"):
+        for section in container.find_all(cls="wfr-meeting"):
+            track_el = section.find("b", "wfr-track")
+            if track_el is None:
+                continue
+            track_name = track_el.text.strip()
+            for anchor in section.find_all("a", "wfr-race"):
+                if anchor.has_ancestor("li", stop=section) and anchor.has_ancestor("ul", stop=section):
+                    cards.append(_card(track_name, anchor, base_url))
+
+    if not cards:
+        for container in doc.find_all(cls="w-cards-results"):
+            for section in container.find_all("section"):
+                header = section.find("h3")
+                if header is None:
+                    continue
+                track_name = header.text.strip()
+                for anchor in section.find_all("a"):
+                    if anchor.has_ancestor("li", stop=section):
+                        cards.append(_card(track_name, anchor, base_url))
+    return cards
+
+
+__all__ = [
+    "GRADE_RE",
+    "parse_html",
+    "parse_race_page",
+    "parse_card_list",
+    "forecast_from_text",
+    "category_from_texts",
+    "extract_top3",
+    "extract_betting_forecast",
+    "extract_category",
+]
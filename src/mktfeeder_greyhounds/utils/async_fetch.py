@@ -0,0 +1,61 @@
+"""Motor assíncrono de download de páginas com limite de taxa (token bucket)."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Iterable
+
+from src.mktfeeder_greyhounds.logger import logger
+from src.mktfeeder_greyhounds.utils.http_session import fetch_html
+from src.mktfeeder_greyhounds.utils.rate_limit import AsyncTokenBucket
+
+
+async def _fetch_one(
+    session,
+    url: str,
+    bucket: AsyncTokenBucket,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+) -> str | None:
+    async with semaphore:
+        await bucket.acquire()
+        try:
+            # requests é bloqueante: cada download roda numa thread do executor padrão. O timeout
+            # vai para o próprio ``session.get`` (um ``wait_for`` não interromperia a thread, que
+            # seguiria ocupando uma conexão do pool).
+            return await asyncio.to_thread(fetch_html, session, url, timeout)
+        except Exception as exc:
+            from requests.exceptions import Timeout
+
+            if isinstance(exc, Timeout):
+                logger.warning("Timeout ({:g}s) ao baixar {}", timeout, url)
+            else:
+                logger.warning("Falha ao baixar {}: {}", url, exc)
+        return None
+
+
+async def fetch_pages(
+    session,
+    urls: Iterable[str],
+    *,
+    rate_per_sec: float,
+    burst: int,
+    concurrency: int,
+    timeout: float,
+) -> Dict[str, str | None]:
+    """Baixa as URLs em paralelo; o ritmo é ditado pelo bucket, não por sleeps fixos.
+
+    Retorna ``{url: html}``; URLs que falharam ou estouraram o timeout ficam com ``None``.
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    bucket = AsyncTokenBucket(rate_per_sec, burst)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    pages = await asyncio.gather(*(_fetch_one(session, url, bucket, semaphore, timeout) for url in unique_urls))
+    return dict(zip(unique_urls, pages))
+
+
+def fetch_pages_sync(session, urls: Iterable[str], **kwargs) -> Dict[str, str | None]:
+    return asyncio.run(fetch_pages(session, urls, **kwargs))
+
+
+__all__ = ["fetch_pages", "fetch_pages_sync"]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 
 def utc_now_iso() -> str:
@@ -11,17 +11,22 @@ def today_str() -> str:
     return datetime.now().strftime("%Y-%m-%d")
 
 
-def hhmm_to_today_iso(hhmm: str) -> str:
-    """Converte 'HH:MM' para ISO hoje."""
+def hhmm_to_iso(hhmm: str, day: date | None = None) -> str:
+    """Converte 'HH:MM' para ISO no dia ``day`` (hoje, se omitido)."""
+    day = day or date.today()
     try:
         hour, minute = [int(x) for x in hhmm.strip()[:5].split(":")]
-        now = datetime.now()
-        dt = datetime(now.year, now.month, now.day, hour, minute)
+        dt = datetime(day.year, day.month, day.day, hour, minute)
         return dt.isoformat(timespec="minutes")
     except Exception:
         return datetime.now().isoformat(timespec="minutes")
 
 
+def hhmm_to_today_iso(hhmm: str) -> str:
+    """Converte 'HH:MM' para ISO hoje."""
+    return hhmm_to_iso(hhmm)
+
+
 def iso_to_hhmm(iso_str: str) -> str:
     try:
         dt = datetime.fromisoformat(iso_str)
@@ -30,5 +35,5 @@ def iso_to_hhmm(iso_str: str) -> str:
         return ""
 
 
-__all__ = ["utc_now_iso", "today_str", "hhmm_to_today_iso", "iso_to_hhmm"]
+__all__ = ["utc_now_iso", "today_str", "hhmm_to_iso", "hhmm_to_today_iso", "iso_to_hhmm"]
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from contextlib import ExitStack
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 from typing import Iterable, Mapping, Sequence
@@ -7,6 +8,7 @@ from typing import Iterable, Mapping, Sequence
 import pandas as pd
 
 from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.utils.metrics import stage
 
 
 def ensure_dir(path: Path) -> None:
@@ -50,5 +52,271 @@ def write_dataframe(df: pd.DataFrame, csv_path: Path) -> None:
     df.to_csv(csv_path, index=False, encoding=settings.CSV_ENCODING)
 
 
-__all__ = ["ensure_dir", "write_csv", "read_csv", "atomic_write_text", "write_dataframe"]
+# --- Datasets do pipeline (CSV ou Parquet particionado por data) ---
+
+# Colunas conhecidas de cada dataset e o tipo gravado no Parquet; colunas extras
+# são gravadas com o tipo inferido pelo pyarrow.
+_SCHEMAS: dict[str, dict[str, str]] = {
+    "timeform_forecast": {
+        "date": "date",
+        "track": "category",
+        "track_key": "category",
+        "hhmm": "string",
+        "race_time_iso": "string",
+        "category_raw": "string",
+        "category_norm": "category",
+        "TimeformTop1": "string",
+        "TimeformTop2": "string",
+        "TimeformTop3": "string",
+        "Forecast1": "string",
+        "Forecast2": "string",
+        "Forecast3": "string",
+        "Forecast1Odds": "float",
+        "Forecast2Odds": "float",
+        "Forecast3Odds": "float",
+    },
+    "top3": {
+        "date": "date",
+        "track": "category",
+        "hhmm": "string",
+        "category_raw": "string",
+        "category_norm": "category",
+        "dog_1": "string",
+        "dog_2": "string",
+        "dog_3": "string",
+    },
+    "forecast": {
+        "date": "date",
+        "track": "category",
+        "hhmm": "string",
+        "category_raw": "string",
+        "category_norm": "category",
+        "forecast_1": "string",
+        "forecast_2": "string",
+        "forecast_3": "string",
+        "forecast_1_odds": "float",
+        "forecast_2_odds": "float",
+        "forecast_3_odds": "float",
+        "market_id": "string",
+        "market_url": "string",
+        "market_match": "category",
+    },
+    "betfair_index": {
+        "track_name": "category",
+        "race_time_label": "string",
+        "race_time_iso": "string",
+        "race_url": "string",
+    },
+    "marketfeeder_audit": {
+        "date": "date",
+        "track": "category",
+        "hhmm": "string",
+        "category_raw": "string",
+        "category_norm": "category",
+        "dog_name": "string",
+        "strategy_tag": "category",
+        "stake": "float",
+        "market_id": "string",
+        "market_url": "string",
+    },
+}
+
+
+def _dataset_locations(name: str) -> tuple[Path, str, Path]:
+    """(diretório do CSV, nome do CSV com ``{day}``, diretório base das partições Parquet)."""
+    if name == "timeform_forecast":
+        return settings.RAW_TIMEFORM_FORECAST_DIR, "timeform_forecast_{day}.csv", settings.RAW_TIMEFORM_FORECAST_DIR
+    if name == "top3":
+        return settings.OUTPUT_TOP3_DIR, "top3_{day}.csv", settings.OUTPUT_TOP3_DIR
+    if name == "forecast":
+        return settings.OUTPUT_FORECAST_DIR, "forecast_{day}.csv", settings.OUTPUT_FORECAST_DIR
+    if name == "betfair_index":
+        return settings.RAW_BETFAIR_INDEX_DIR, "betfair_index_{day}.csv", settings.RAW_BETFAIR_INDEX_DIR
+    if name == "marketfeeder_audit":
+        hist = settings.MARKETFEEDER_HISTORY_DIR
+        return hist, "import_selections_{day}_audit.csv", hist / "audit"
+    raise ValueError(f"Dataset desconhecido: {name}")
+
+
+def dataset_csv_path(name: str, day: str) -> Path:
+    csv_dir, pattern, _ = _dataset_locations(name)
+    return csv_dir / pattern.format(day=day)
+
+
+def dataset_partition_path(name: str, day: str) -> Path:
+    _, _, parquet_dir = _dataset_locations(name)
+    return parquet_dir / f"date={day}" / "part-0.parquet"
+
+
+def _use_parquet() -> bool:
+    return settings.STORAGE_FORMAT == "parquet"
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - depende do ambiente
+        raise RuntimeError('STORAGE_FORMAT="parquet" requer o pacote pyarrow (pip install pyarrow).') from exc
+    return pa, pq
+
+
+def _arrow_column(pa, values: pd.Series, kind: str):
+    if kind == "float":
+        return pa.array(pd.to_numeric(values, errors="coerce").astype("float64"), from_pandas=True)
+    if kind == "date":
+        stamps = pd.to_datetime(values.astype(object).where(values.notna(), None), errors="coerce")
+        return pa.array(stamps, type=pa.timestamp("ns"), from_pandas=True).cast(pa.date32())
+    text = values.astype(str).astype(object).where(values.notna(), None)
+    array = pa.array(text, type=pa.string(), from_pandas=True)
+    return array.dictionary_encode() if kind == "category" else array
+
+
+def _to_table(pa, df: pd.DataFrame, name: str):
+    schema = _SCHEMAS[name]
+    n_rows = len(df.index)
+    arrays, names = [], []
+    for col, kind in schema.items():
+        values = df[col] if col in df.columns else pd.Series([None] * n_rows, dtype=object)
+        arrays.append(_arrow_column(pa, values.reset_index(drop=True), kind))
+        names.append(col)
+    table = pa.Table.from_arrays(arrays, names=names)
+    extra = [col for col in df.columns if col not in schema]
+    if extra:
+        extra_table = pa.Table.from_pandas(df[extra], preserve_index=False)
+        for col in extra:
+            table = table.append_column(col, extra_table.column(col))
+    return table
+
+
+def write_parquet(df: pd.DataFrame, path: Path, name: str) -> None:
+    """Grava o DataFrame com o schema do dataset (tmp + replace, como o arquivo do MarketFeeder)."""
+    pa, pq = _pyarrow()
+    ensure_dir(path.parent)
+    tmp_path = path.with_suffix(".tmp")
+    pq.write_table(_to_table(pa, df, name), tmp_path)
+    tmp_path.replace(path)
+
+
+def read_parquet(path: Path) -> pd.DataFrame:
+    if not path.exists():
+        return pd.DataFrame()
+    _, pq = _pyarrow()
+    return pq.read_table(path).to_pandas()
+
+
+def save_dataset(df: pd.DataFrame, name: str, day: str, *, csv: bool | None = None) -> Path:
+    """Grava o dataset do dia no formato de ``STORAGE_FORMAT``.
+
+    Em modo Parquet, a cópia CSV (exportação para humanos) segue ``STORAGE_CSV_EXPORT``,
+    a menos que ``csv`` seja informado. Retorna o caminho principal gravado.
+    """
+    csv_path = dataset_csv_path(name, day)
+    with stage(f"write.{name}"):
+        if not _use_parquet():
+            write_dataframe(df, csv_path)
+            return csv_path
+        parquet_path = dataset_partition_path(name, day)
+        write_parquet(df, parquet_path, name)
+        if settings.STORAGE_CSV_EXPORT if csv is None else csv:
+            write_dataframe(df, csv_path)
+        return parquet_path
+
+
+def save_dataset_chunks(frames: Iterable[pd.DataFrame], name: str, day: str, *, csv: bool | None = None) -> Path:
+    """``save_dataset`` em fluxo: cada bloco de ``frames`` é gravado assim que chega.
+
+    O CSV recebe o cabeçalho só no primeiro bloco e o Parquet ganha um row group por bloco;
+    ambos são escritos em ``.tmp`` e só substituem o arquivo do dia no final. ``frames``
+    deve trazer ao menos um bloco (vazio, com as colunas, se não houver linhas).
+    """
+    csv_path = dataset_csv_path(name, day)
+    parquet_path = dataset_partition_path(name, day) if _use_parquet() else None
+    export_csv = parquet_path is None or (settings.STORAGE_CSV_EXPORT if csv is None else csv)
+    written: list[tuple[Path, Path]] = []
+    with stage(f"write.{name}"):
+        try:
+            with ExitStack() as stack:
+                csv_file = None
+                if export_csv:
+                    ensure_dir(csv_path.parent)
+                    written.append((csv_path.with_suffix(".tmp"), csv_path))
+                    csv_file = stack.enter_context(
+                        written[-1][0].open("w", encoding=settings.CSV_ENCODING, newline="")
+                    )
+                writer = None
+                for chunk, df in enumerate(frames):
+                    if csv_file is not None:
+                        df.to_csv(csv_file, index=False, header=chunk == 0)
+                    if parquet_path is None:
+                        continue
+                    pa, pq = _pyarrow()
+                    table = _to_table(pa, df, name)
+                    if writer is None:
+                        ensure_dir(parquet_path.parent)
+                        written.append((parquet_path.with_suffix(".tmp"), parquet_path))
+                        writer = stack.enter_context(pq.ParquetWriter(written[-1][0], table.schema))
+                    writer.write_table(table)
+        except BaseException:
+            for tmp_path, _ in written:
+                tmp_path.unlink(missing_ok=True)
+            raise
+        for tmp_path, path in written:
+            tmp_path.replace(path)
+    return parquet_path or csv_path
+
+
+def dataset_path(name: str, day: str) -> Path:
+    """Arquivo que ``load_dataset`` lê para o dia; em modo Parquet, dias gravados antes da troca caem no CSV."""
+    if _use_parquet():
+        parquet_path = dataset_partition_path(name, day)
+        if parquet_path.exists():
+            return parquet_path
+    return dataset_csv_path(name, day)
+
+
+def load_dataset(name: str, day: str) -> pd.DataFrame:
+    """Lê o dataset do dia (Parquet ou CSV, conforme ``dataset_path``)."""
+    path = dataset_path(name, day)
+    if path.suffix == ".parquet":
+        return read_parquet(path)
+    return read_csv(path)
+
+
+def dataset_days(name: str) -> list[str]:
+    """Dias disponíveis do dataset (partições Parquet e/ou CSVs), em ordem."""
+    csv_dir, pattern, parquet_dir = _dataset_locations(name)
+    prefix, suffix = pattern.split("{day}")
+    days = {p.name[len(prefix) : len(p.name) - len(suffix)] for p in csv_dir.glob(pattern.format(day="*"))}
+    if parquet_dir.exists():
+        days.update(p.parent.name.split("=", 1)[1] for p in parquet_dir.glob("date=*/part-0.parquet"))
+    return sorted(days)
+
+
+def load_dataset_days(name: str, days: Iterable[str] | None = None) -> pd.DataFrame:
+    """Concatena vários dias do dataset (todos, se ``days`` for None)."""
+    frames = [load_dataset(name, day) for day in (dataset_days(name) if days is None else days)]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+__all__ = [
+    "ensure_dir",
+    "write_csv",
+    "read_csv",
+    "atomic_write_text",
+    "write_dataframe",
+    "write_parquet",
+    "read_parquet",
+    "dataset_csv_path",
+    "dataset_partition_path",
+    "dataset_path",
+    "save_dataset",
+    "save_dataset_chunks",
+    "load_dataset",
+    "dataset_days",
+    "load_dataset_days",
+]
 
@@ -0,0 +1,52 @@
+"""Versões por coluna das expressões usadas linha a linha nos builders (``row.get(col) or ""`` etc.)."""
+
+from __future__ import annotations
+
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+
+def column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Coluna como objetos Python; ausente equivale a ``row.get(col)`` -> None."""
+    if col in df.columns:
+        return pd.Series(df[col].to_numpy(dtype=object), index=df.index)
+    return pd.Series([None] * len(df.index), index=df.index, dtype=object)
+
+
+def truthy(values: pd.Series) -> pd.Series:
+    """Vetoriza ``bool(v)`` para os valores de um CSV/raw (None, "", 0 e False são falsy; NaN não)."""
+    arr = values.to_numpy(dtype=object)
+    falsy = (arr == None) | (arr == 0) | (arr == "")  # noqa: E711 - comparação elemento a elemento
+    return pd.Series(~falsy, index=values.index)
+
+
+def first_truthy(*candidates: pd.Series) -> pd.Series:
+    """Vetoriza ``a or b or ...``: o primeiro valor truthy, senão o último candidato."""
+    out = candidates[-1]
+    for values in reversed(candidates[:-1]):
+        out = values.where(truthy(values), out)
+    return out
+
+
+def as_text(values: pd.Series) -> pd.Series:
+    """Vetoriza ``str(v or "")``."""
+    return values.astype(str).where(truthy(values), "")
+
+
+def map_unique(text: pd.Series, fn: Callable[[str], str]) -> pd.Series:
+    """Aplica ``fn`` uma vez por valor distinto (nomes de pista/cão/categoria se repetem muito)."""
+    codes, uniques = pd.factorize(text, sort=False)
+    cleaned = pd.Index([fn(value) for value in uniques], dtype=object)
+    return pd.Series(cleaned.take(codes), index=text.index, dtype=object)
+
+
+def counts_in_order(values: pd.Series) -> Dict[str, int]:
+    """Contagem por valor, na ordem da primeira ocorrência (a mesma de um dict incrementado em loop)."""
+    codes, uniques = pd.factorize(values, sort=False)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return {value: int(count) for value, count in zip(uniques, counts)}
+
+
+__all__ = ["column", "truthy", "first_truthy", "as_text", "map_unique", "counts_in_order"]
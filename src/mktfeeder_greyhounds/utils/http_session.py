@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.mktfeeder_greyhounds.config import settings
+
+if TYPE_CHECKING:
+    import requests
+
+
+def build_http_session() -> requests.Session:
+    """Sessão HTTP com pool de conexões keep-alive e retry para erros transitórios."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    retry = Retry(
+        total=settings.HTTP_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=max(settings.TIMEFORM_WORKERS, settings.TIMEFORM_ASYNC_CONCURRENCY, 4),
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "User-Agent": settings.USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-GB,en;q=0.9",
+        }
+    )
+    return session
+
+
+def fetch_html(session: requests.Session, url: str, timeout: float | None = None) -> str:
+    response = session.get(url, timeout=timeout or settings.HTTP_TIMEOUT_SEC)
+    response.raise_for_status()
+    return response.text
+
+
+__all__ = ["build_http_session", "fetch_html"]
@@ -0,0 +1,131 @@
+"""Journal JSONL da raspagem: cada corrida concluída vira uma linha em ``data/raw/journal/``.
+
+Cada linha é gravada e descarregada (``flush``) na hora, então sobrevive a um crash do
+processo ou do chromedriver; o ``fsync`` (que protege contra queda da máquina) é feito em
+lotes de ``JOURNAL_FSYNC_EVERY_ROWS`` linhas ou ``JOURNAL_FSYNC_EVERY_SEC`` segundos.
+Uma execução interrompida é retomada pulando as URLs já registradas; depois que o raw do
+dia é gravado, o journal é descartado.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger
+
+
+class ScrapeJournal:
+    """Journal append-only de linhas raspadas, compartilhado entre as threads de worker."""
+
+    def __init__(self, path: Path, fsync_every_rows: int, fsync_every_sec: float) -> None:
+        self.path = path
+        self._fsync_every_rows = max(1, fsync_every_rows)
+        self._fsync_every_sec = fsync_every_sec
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._file = None
+
+    def _repair_tail(self) -> None:
+        """Corta uma última linha incompleta (crash no meio do ``write``)."""
+        if not self.path.exists():
+            return
+        with self.path.open("rb+") as fh:
+            size = fh.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            fh.seek(size - 1)
+            if fh.read(1) == b"\n":
+                return
+            fh.seek(0)
+            keep = fh.read().rfind(b"\n") + 1
+            fh.truncate(keep)
+        logger.warning("Journal com última linha incompleta, descartada: {}", self.path)
+
+    def entries(self) -> Iterator[Dict[str, object]]:
+        """Entradas ``{"seq", "url", "row"}`` na ordem de gravação, lidas sob demanda."""
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and isinstance(entry.get("row"), dict):
+                    yield entry
+
+    def rows(self) -> Iterator[Dict[str, object]]:
+        """Linhas na ordem da listagem de cards do dia (``seq``), não na de conclusão dos workers.
+
+        Só o índice (seq, posição no arquivo) fica em memória; cada linha é lida sob demanda.
+        """
+        if not self.path.exists():
+            return
+        index = []
+        with self.path.open("rb") as fh:
+            offset = 0
+            for line in fh:
+                try:
+                    seq = int(json.loads(line).get("seq", -1))
+                except (ValueError, AttributeError, TypeError):
+                    seq = None
+                if seq is not None:
+                    index.append((seq, offset))
+                offset += len(line)
+            for _, offset in sorted(index):
+                fh.seek(offset)
+                row = json.loads(fh.readline()).get("row")
+                if isinstance(row, dict):
+                    yield row
+
+    def append(self, seq: int, url: str, row: Dict[str, object]) -> None:
+        line = json.dumps({"seq": seq, "url": url, "row": row}, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._repair_tail()
+                self._file = self.path.open("a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self._pending += 1
+            if self._pending >= self._fsync_every_rows or time.monotonic() - self._last_sync >= self._fsync_every_sec:
+                self._sync()
+
+    def _sync(self) -> None:
+        if self._file is not None and self._pending:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def discard(self) -> None:
+        """Remove o journal (o raw do dia já foi gravado)."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def open_scrape_journal(name: str, day: str) -> ScrapeJournal | None:
+    """Journal ``<name>_<dia>.jsonl``, ou None se desativado em ``Settings``."""
+    if not settings.JOURNAL_ENABLED:
+        return None
+    return ScrapeJournal(
+        settings.JOURNAL_DIR / f"{name}_{day}.jsonl",
+        fsync_every_rows=settings.JOURNAL_FSYNC_EVERY_ROWS,
+        fsync_every_sec=settings.JOURNAL_FSYNC_EVERY_SEC,
+    )
+
+
+__all__ = ["ScrapeJournal", "open_scrape_journal"]
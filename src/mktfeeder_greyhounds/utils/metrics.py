@@ -0,0 +1,170 @@
+"""Tempo por etapa da execução (driver, cookies, cards, page loads, extração, sleeps, gravações).
+
+Cada etapa acumula amostras via ``stage(nome)``; no fim da execução ``write_run_report``
+acrescenta o resumo (contagem, total, p50/p95/max) em ``data/metrics/run_YYYY-MM-DD.json``
+e, com ``METRICS_PROMETHEUS``, regrava ``data/metrics/mktfeeder.prom`` no formato texto do
+Prometheus (para o textfile collector do node_exporter).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger
+
+_PROM_FILE = "mktfeeder.prom"
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Percentil com interpolação linear sobre amostras já ordenadas."""
+    if len(ordered) == 1:
+        return ordered[0]
+    pos = (len(ordered) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+class RunMetrics:
+    """Amostras de duração por etapa, compartilhadas entre as threads de worker."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[float]] = {}
+        self._started = time.time()
+        self._started_perf = time.perf_counter()
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._started = time.time()
+            self._started_perf = time.perf_counter()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Por etapa: count, total_sec, p50_sec, p95_sec e max_sec (em ordem alfabética)."""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items() if values}
+        return {
+            name: {
+                "count": len(values),
+                "total_sec": round(sum(values), 4),
+                "p50_sec": round(_percentile(values, 0.50), 4),
+                "p95_sec": round(_percentile(values, 0.95), 4),
+                "max_sec": round(values[-1], 4),
+            }
+            for name, values in sorted(samples.items())
+        }
+
+    def report(self, run: str) -> Dict[str, object]:
+        return {
+            "run": run,
+            "started_at": datetime.fromtimestamp(self._started).isoformat(timespec="seconds"),
+            "wall_sec": round(time.perf_counter() - self._started_perf, 3),
+            "stages": self.summary(),
+        }
+
+
+_METRICS = RunMetrics()
+
+
+def get_metrics() -> RunMetrics:
+    """Coletor do processo (todas as etapas de uma execução caem no mesmo relatório)."""
+    return _METRICS
+
+
+def stage(name: str):
+    """Atalho para ``get_metrics().stage(name)``."""
+    return _METRICS.stage(name)
+
+
+def observe(name: str, seconds: float) -> None:
+    _METRICS.observe(name, seconds)
+
+
+def _write_text(path: Path, content: str) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _prom_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(report: Dict[str, object]) -> str:
+    """Resumo da execução no formato texto do Prometheus."""
+    run = _prom_label(str(report["run"]))
+    stages: Dict[str, Dict[str, float]] = report["stages"]  # type: ignore[assignment]
+    lines = [
+        "# HELP mktfeeder_stage_seconds Duração das etapas na última execução.",
+        "# TYPE mktfeeder_stage_seconds summary",
+    ]
+    for name, stats in stages.items():
+        labels = f'run="{run}",stage="{_prom_label(name)}"'
+        lines.append(f'mktfeeder_stage_seconds{{{labels},quantile="0.5"}} {stats["p50_sec"]}')
+        lines.append(f'mktfeeder_stage_seconds{{{labels},quantile="0.95"}} {stats["p95_sec"]}')
+        lines.append(f"mktfeeder_stage_seconds_sum{{{labels}}} {stats['total_sec']}")
+        lines.append(f"mktfeeder_stage_seconds_count{{{labels}}} {stats['count']}")
+    lines.append("# HELP mktfeeder_stage_max_seconds Maior duração da etapa na última execução.")
+    lines.append("# TYPE mktfeeder_stage_max_seconds gauge")
+    for name, stats in stages.items():
+        lines.append(f'mktfeeder_stage_max_seconds{{run="{run}",stage="{_prom_label(name)}"}} {stats["max_sec"]}')
+    lines.append("# HELP mktfeeder_run_seconds Duração total da última execução.")
+    lines.append("# TYPE mktfeeder_run_seconds gauge")
+    lines.append(f'mktfeeder_run_seconds{{run="{run}"}} {report["wall_sec"]}')
+    lines.append("# HELP mktfeeder_run_timestamp_seconds Fim da última execução (epoch).")
+    lines.append("# TYPE mktfeeder_run_timestamp_seconds gauge")
+    lines.append(f'mktfeeder_run_timestamp_seconds{{run="{run}"}} {int(time.time())}')
+    return "\n".join(lines) + "\n"
+
+
+def write_run_report(run: str, day: str | None = None) -> Path | None:
+    """Acrescenta o resumo da execução ao arquivo do dia; retorna o caminho (ou None se desativado)."""
+    if not settings.METRICS_ENABLED:
+        return None
+    report = _METRICS.report(run)
+    metrics_dir = settings.METRICS_DIR
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    path = metrics_dir / f"run_{day or date.today().isoformat()}.json"
+    runs: List[Dict[str, object]] = []
+    if path.exists():
+        try:
+            runs = json.loads(path.read_text(encoding="utf-8")).get("runs", [])
+        except (OSError, ValueError, AttributeError):
+            logger.warning("Métricas existentes ilegíveis, recriando: {}", path)
+    runs.append(report)
+    _write_text(path, json.dumps({"runs": runs}, ensure_ascii=False, indent=2))
+    if settings.METRICS_PROMETHEUS:
+        _write_text(metrics_dir / _PROM_FILE, render_prometheus(report))
+
+    slowest = sorted(report["stages"].items(), key=lambda item: item[1]["total_sec"], reverse=True)[:5]
+    logger.info(
+        "Métricas da execução ({:.1f}s) salvas em {} | etapas mais pesadas: {}",
+        report["wall_sec"],
+        path,
+        ", ".join(f"{name}={stats['total_sec']:.2f}s" for name, stats in slowest) or "-",
+    )
+    return path
+
+
+__all__ = ["RunMetrics", "get_metrics", "observe", "render_prometheus", "stage", "write_run_report"]
@@ -0,0 +1,137 @@
+"""Cache persistente de páginas raspadas (HTML comprimido ou campos extraídos).
+
+Entradas são indexadas por (url, data da corrida), expiram após ``PAGE_CACHE_TTL_SEC``
+e o total em disco é limitado por ``PAGE_CACHE_MAX_MB`` com despejo LRU.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT NOT NULL,
+    race_date TEXT NOT NULL,
+    content BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (url, race_date)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages (last_access);
+"""
+
+
+class PageCache:
+    def __init__(self, path: Path, ttl_sec: float, max_bytes: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl_sec
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "stored": 0, "evicted": 0}
+
+    def get(self, url: str, race_date: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at FROM pages WHERE url = ? AND race_date = ?",
+                (url, race_date),
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            content, created_at = row
+            if now - created_at > self._ttl:
+                self._conn.execute("DELETE FROM pages WHERE url = ? AND race_date = ?", (url, race_date))
+                self.stats["stale"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE pages SET last_access = ? WHERE url = ? AND race_date = ?",
+                (now, url, race_date),
+            )
+            self.stats["hits"] += 1
+        return zlib.decompress(content).decode("utf-8")
+
+    def is_fresh(self, url: str, race_date: str) -> bool:
+        """Indica se há entrada válida, sem afetar estatísticas nem a ordem LRU."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at FROM pages WHERE url = ? AND race_date = ?",
+                (url, race_date),
+            ).fetchone()
+        return row is not None and time.time() - row[0] <= self._ttl
+
+    def put(self, url: str, race_date: str, content: str) -> None:
+        blob = zlib.compress(content.encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, race_date, content, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, race_date, blob, len(blob), now, now),
+            )
+            self.stats["stored"] += 1
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        for url, race_date, size in self._conn.execute(
+            "SELECT url, race_date, size FROM pages ORDER BY last_access"
+        ).fetchall():
+            self._conn.execute("DELETE FROM pages WHERE url = ? AND race_date = ?", (url, race_date))
+            self.stats["evicted"] += 1
+            total -= size
+            if total <= self._max_bytes:
+                break
+
+    def log_summary(self) -> None:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        hit_rate = (self.stats["hits"] / lookups * 100) if lookups else 0.0
+        logger.info(
+            "Cache de páginas: hits={} | misses={} (expirados={}) | hit rate={:.0f}% | gravados={} | despejados={}",
+            self.stats["hits"],
+            self.stats["misses"],
+            self.stats["stale"],
+            hit_rate,
+            self.stats["stored"],
+            self.stats["evicted"],
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_CACHE: PageCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_page_cache() -> PageCache | None:
+    """Cache compartilhado do processo, ou None se desativado em ``Settings``."""
+    global _CACHE
+    if not settings.PAGE_CACHE_ENABLED:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = PageCache(
+                settings.PAGE_CACHE_DIR / "pages.sqlite",
+                ttl_sec=settings.PAGE_CACHE_TTL_SEC,
+                max_bytes=int(settings.PAGE_CACHE_MAX_MB * 1024 * 1024),
+            )
+        return _CACHE
+
+
+__all__ = ["PageCache", "get_page_cache"]
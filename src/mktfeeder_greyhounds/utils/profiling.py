@@ -0,0 +1,148 @@
+"""Profiling opcional por etapa (``--profile`` em run_daily, build_outputs e build_marketfeeder_file).
+
+Para cada etapa marcada com ``Profiler.stage(nome)`` são gravados em
+``data/profiles/<execução>_<YYYYmmdd-HHMMSS>/``:
+
+- ``<etapa>.prof``: dump do cProfile (``python -m pstats`` / snakeviz);
+- ``<etapa>.collapsed``: pilhas amostradas de todas as threads no formato "collapsed"
+  (``flamegraph.pl``, speedscope, inferno);
+- ``<etapa>.alloc.txt``: pico de memória e maiores alocações (tracemalloc) por linha.
+
+O cProfile só enxerga a thread que abriu a etapa; com ``TIMEFORM_WORKERS > 1`` o trabalho
+dos workers aparece apenas nas pilhas amostradas.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger
+
+_SAMPLE_INTERVAL_SEC = 0.005
+_TOP_ALLOCATIONS = 30
+_TRACEMALLOC_FRAMES = 10
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{Path(code.co_filename).stem}:{name}".replace(";", ",").replace(" ", "_")
+
+
+class _StackSampler(threading.Thread):
+    """Amostra periodicamente as pilhas de todas as threads (exceto a própria)."""
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="profile-sampler", daemon=True)
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self.stacks: Counter[str] = Counter()
+
+    def run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self._interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, str(thread_id)).replace(";", ",").replace(" ", "_"))
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class Profiler:
+    """Perfis por etapa; desativado, ``stage`` não faz nada."""
+
+    def __init__(self, run: str, enabled: bool = True, interval: float = _SAMPLE_INTERVAL_SEC) -> None:
+        self.enabled = enabled
+        self._interval = interval
+        self.out_dir = settings.PROFILES_DIR / f"{run}_{datetime.now():%Y%m%d-%H%M%S}"
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        own_tracemalloc = not tracemalloc.is_tracing()
+        if own_tracemalloc:
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        sampler = _StackSampler(self._interval)
+        profile = cProfile.Profile()
+        sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            sampler.stop()
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if own_tracemalloc:
+                tracemalloc.stop()
+            self._write(name, profile, sampler.stacks, snapshot, current, peak)
+
+    def _write(
+        self,
+        name: str,
+        profile: cProfile.Profile,
+        stacks: Counter[str],
+        snapshot: tracemalloc.Snapshot,
+        current: int,
+        peak: int,
+    ) -> None:
+        prof_path = self.out_dir / f"{name}.prof"
+        profile.dump_stats(str(prof_path))
+
+        collapsed_path = self.out_dir / f"{name}.collapsed"
+        collapsed_path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()),
+            encoding="utf-8",
+        )
+
+        snapshot = snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen *>"),
+            )
+        )
+        lines = [
+            f"etapa: {name}",
+            f"pico: {peak / 2**20:.1f} MiB | ainda alocado ao final: {current / 2**20:.1f} MiB",
+            "",
+            f"Top {_TOP_ALLOCATIONS} alocações vivas ao final da etapa (por linha):",
+        ]
+        for stat in snapshot.statistics("lineno")[:_TOP_ALLOCATIONS]:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocos  {frame.filename}:{frame.lineno}")
+        alloc_path = self.out_dir / f"{name}.alloc.txt"
+        alloc_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        logger.info(
+            "Profile da etapa '{}': {} amostras de pilha | pico {:.1f} MiB | {}",
+            name,
+            sum(stacks.values()),
+            peak / 2**20,
+            self.out_dir,
+        )
+
+
+__all__ = ["Profiler"]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """Limite global de requisições por host, compartilhado entre threads.
+
+    Cada chamada a ``acquire`` reserva o próximo slot livre do host e dorme até ele,
+    garantindo no máximo ``max_per_sec`` requisições por segundo por host.
+    """
+
+    def __init__(self, max_per_sec: float) -> None:
+        self._interval = 1.0 / max_per_sec if max_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot: dict[str, float] = {}
+
+    def acquire(self, url: str) -> float:
+        """Bloqueia até o host da URL liberar um slot; retorna o tempo esperado."""
+        if self._interval <= 0:
+            return 0.0
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self._interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class SharedRateLimiter:
+    """Limite global de requisições entre processos (p.ex. workers do backfill).
+
+    O próximo slot livre fica num ``multiprocessing.Value``: crie o limitador no processo
+    principal com o mesmo contexto do pool e repasse-o aos workers pelo ``initializer``.
+    ``time.monotonic`` usa o relógio do sistema, comum a todos os processos da máquina.
+    """
+
+    def __init__(self, max_per_sec: float, ctx=None) -> None:
+        if ctx is None:
+            import multiprocessing
+
+            ctx = multiprocessing.get_context()
+        self._interval = 1.0 / max_per_sec if max_per_sec > 0 else 0.0
+        self._next_slot = ctx.Value("d", 0.0)
+
+    def acquire(self, url: str = "") -> float:
+        """Bloqueia até o próximo slot global; retorna o tempo esperado (``url`` só por compatibilidade)."""
+        if self._interval <= 0:
+            return 0.0
+        with self._next_slot.get_lock():
+            now = time.monotonic()
+            slot = max(now, self._next_slot.value)
+            self._next_slot.value = slot + self._interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class AsyncTokenBucket:
+    """Token bucket para asyncio: ``rate`` tokens/s, acumulando até ``burst``.
+
+    ``rate <= 0`` desativa o limite.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self._rate = rate
+        self._capacity = float(max(1, burst))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self._rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1.0:
+                await asyncio.sleep((1.0 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1.0
+
+
+__all__ = ["HostRateLimiter", "SharedRateLimiter", "AsyncTokenBucket"]
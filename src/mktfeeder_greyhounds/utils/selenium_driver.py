@@ -1,14 +1,31 @@
 from __future__ import annotations
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import atexit
+import json
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
 
 from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.logger import logger
+from src.mktfeeder_greyhounds.utils.metrics import observe
 
+# selenium e webdriver-manager só são importados ao abrir o primeiro Chrome: os scripts
+# que não raspam (e o backend HTTP sem fallback) não pagam esse custo de import.
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+_DRIVER_PATH: str | None = None
+_DRIVER_PATH_LOCK = threading.Lock()
+
+
+def _build_options(use_headless_new: bool | None, profile: str | None = None) -> Options:
+    from selenium.webdriver.chrome.options import Options
 
-def _build_options(use_headless_new: bool | None) -> Options:
     chrome_options = Options()
     if use_headless_new is True:
         chrome_options.add_argument("--headless=new")
@@ -24,25 +41,100 @@ def _build_options(use_headless_new: bool | None) -> Options:
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
-    chrome_options.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
-    )
+    chrome_options.add_argument(f"--user-agent={settings.USER_AGENT}")
+    if profile:
+        # Perfil persistente: cookies (consentimento) e cache HTTP sobrevivem entre execuções.
+        chrome_options.add_argument(f"--user-data-dir={_profile_dir(profile)}")
+    if settings.SELENIUM_BLOCK_RESOURCES and settings.SELENIUM_NETWORK_REPORT:
+        # Eventos Network.* no log de performance alimentam o relatório de economia por página.
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
     chrome_options.page_load_strategy = "eager"
     return chrome_options
 
 
-def build_chrome_driver() -> webdriver.Chrome:
+# Mensagem do chromedriver quando outro Chrome já usa o mesmo ``--user-data-dir``.
+_PROFILE_IN_USE = "user data directory is already in use"
+
+
+def _profile_in_use(exc: Exception) -> bool:
+    return _PROFILE_IN_USE in str(exc)
+
+
+def _profile_dir(profile: str) -> Path:
+    path = settings.CHROME_PROFILE_DIR / profile
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _driver_path_file() -> Path:
+    return settings.PAGE_CACHE_DIR / "chromedriver_path.txt"
+
+
+def resolve_driver_path(refresh: bool = False) -> str:
+    """Caminho do chromedriver, resolvido uma vez por processo e lembrado em disco.
+
+    ``ChromeDriverManager().install()`` (checagem de rede + disco) só roda quando não há
+    caminho válido em cache ou quando ``refresh`` é pedido após falha de inicialização.
+    """
+    global _DRIVER_PATH
+    if settings.CHROMEDRIVER_PATH:
+        return settings.CHROMEDRIVER_PATH
+    with _DRIVER_PATH_LOCK:
+        if not refresh:
+            if _DRIVER_PATH and Path(_DRIVER_PATH).exists():
+                return _DRIVER_PATH
+            cache_file = _driver_path_file()
+            if cache_file.exists():
+                cached = cache_file.read_text(encoding="utf-8").strip()
+                if cached and Path(cached).exists():
+                    _DRIVER_PATH = cached
+                    return _DRIVER_PATH
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        started = time.perf_counter()
+        _DRIVER_PATH = ChromeDriverManager().install()
+        logger.info("chromedriver resolvido em {:.1f}s: {}", time.perf_counter() - started, _DRIVER_PATH)
+        cache_file = _driver_path_file()
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(_DRIVER_PATH, encoding="utf-8")
+        return _DRIVER_PATH
+
+
+def build_chrome_driver(profile: str | None = "default") -> webdriver.Chrome:
+    """Inicia um Chrome configurado.
+
+    ``profile`` escolhe o subdiretório de ``CHROME_PROFILE_DIR`` (instâncias simultâneas
+    precisam de perfis distintos); ``None`` ou ``SELENIUM_PERSIST_PROFILE=False`` usa um
+    perfil temporário. Se o perfil já estiver aberto por outro processo, cai num perfil
+    temporário em vez de falhar.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
     attempts = []
     if settings.SELENIUM_HEADLESS:
         attempts = [True, False, None]
     else:
         attempts = [None]
+    if not settings.SELENIUM_PERSIST_PROFILE:
+        profile = None
 
+    started = time.perf_counter()
+    refreshed = False
     ex = None
-    for headless_new in attempts:
+    while attempts:
+        headless_new = attempts.pop(0)
         try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=_build_options(headless_new))
+            try:
+                service = Service(resolve_driver_path())
+                driver = webdriver.Chrome(service=service, options=_build_options(headless_new, profile))
+            except Exception as exc:
+                if refreshed or settings.CHROMEDRIVER_PATH or _profile_in_use(exc):
+                    raise
+                # O chromedriver em cache pode ter ficado incompatível após update do Chrome.
+                refreshed = True
+                service = Service(resolve_driver_path(refresh=True))
+                driver = webdriver.Chrome(service=service, options=_build_options(headless_new, profile))
             try:
                 driver.execute_cdp_cmd(
                     "Page.addScriptToEvaluateOnNewDocument",
@@ -52,12 +144,264 @@ def build_chrome_driver() -> webdriver.Chrome:
                 pass
             driver.set_page_load_timeout(settings.SELENIUM_PAGELOAD_TIMEOUT_SEC)
             driver.implicitly_wait(0)
+            observe("driver.start", time.perf_counter() - started)
+            logger.info("Chrome iniciado em {:.1f}s (perfil: {})", time.perf_counter() - started, profile or "temporario")
             return driver
         except Exception as exc:
             ex = exc
+            if profile and _profile_in_use(exc):
+                logger.warning("Perfil do Chrome '{}' em uso por outro processo; usando perfil temporário.", profile)
+                profile = None
+                attempts.insert(0, headless_new)
             continue
     raise ex if ex else RuntimeError("Falha ao inicializar ChromeDriver")
 
 
-__all__ = ["build_chrome_driver"]
+# Estimativa de bytes por requisição bloqueada (o recurso nunca é baixado, então não há
+# tamanho real); valores típicos de páginas de corrida por tipo de recurso do CDP.
+_TYPICAL_BLOCKED_BYTES = {
+    "Image": 30_000,
+    "Media": 400_000,
+    "Font": 40_000,
+    "Script": 60_000,
+    "XHR": 5_000,
+    "Fetch": 5_000,
+    "Other": 10_000,
+}
+
+
+class _NetworkMeter:
+    """Estado de bloqueio e contadores de rede de um driver."""
+
+    def __init__(self) -> None:
+        self.patterns: tuple[str, ...] | None = None
+        self.current_url = ""
+
+
+_METERS: "weakref.WeakKeyDictionary[webdriver.Chrome, _NetworkMeter]" = weakref.WeakKeyDictionary()
+_NETWORK_TOTALS = {"pages": 0, "requests_loaded": 0, "bytes_loaded": 0, "requests_blocked": 0, "bytes_saved_est": 0}
+_NETWORK_LOCK = threading.Lock()
+
+
+def blocked_patterns_for(url: str) -> tuple[str, ...]:
+    """Blocklist efetiva para o host da URL (blocklist global menos o allowlist do site)."""
+    host = urlparse(url).netloc.lower()
+    allowed: set[str] = set()
+    for site, patterns in settings.SELENIUM_BLOCK_ALLOWLIST:
+        if host == site or host.endswith("." + site):
+            allowed.update(patterns)
+    return tuple(p for p in settings.SELENIUM_BLOCKED_URL_PATTERNS if p not in allowed)
+
+
+def _apply_resource_blocking(driver, meter: _NetworkMeter, url: str) -> None:
+    patterns = blocked_patterns_for(url)
+    if patterns == meter.patterns:
+        return
+    try:
+        if meter.patterns is None:
+            driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        meter.patterns = patterns
+    except Exception as exc:
+        logger.debug("Falha ao aplicar bloqueio de recursos via CDP: {}", exc)
+
+
+def _drain_network_report(driver, meter: _NetworkMeter) -> None:
+    """Lê o log de performance acumulado e o atribui à página carregada anteriormente."""
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return
+    if not meter.current_url:
+        return
+    request_types: dict[str, str] = {}
+    loaded = loaded_bytes = 0
+    blocked_by_type: dict[str, int] = {}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except Exception:
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            request_types[params.get("requestId", "")] = params.get("type", "Other")
+        elif method == "Network.loadingFinished":
+            loaded += 1
+            loaded_bytes += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            rtype = params.get("type") or request_types.get(params.get("requestId", ""), "Other")
+            blocked_by_type[rtype] = blocked_by_type.get(rtype, 0) + 1
+
+    blocked = sum(blocked_by_type.values())
+    saved = sum(_TYPICAL_BLOCKED_BYTES.get(t, _TYPICAL_BLOCKED_BYTES["Other"]) * n for t, n in blocked_by_type.items())
+    logger.debug(
+        "Rede {}: {} reqs / {:.0f} KB carregados | {} bloqueadas {} (~{:.0f} KB economizados)",
+        meter.current_url,
+        loaded,
+        loaded_bytes / 1024,
+        blocked,
+        blocked_by_type,
+        saved / 1024,
+    )
+    with _NETWORK_LOCK:
+        _NETWORK_TOTALS["pages"] += 1
+        _NETWORK_TOTALS["requests_loaded"] += loaded
+        _NETWORK_TOTALS["bytes_loaded"] += loaded_bytes
+        _NETWORK_TOTALS["requests_blocked"] += blocked
+        _NETWORK_TOTALS["bytes_saved_est"] += saved
+
+
+def navigate(driver, url: str) -> None:
+    """``driver.get`` com a blocklist do site aplicada e medição de rede por página.
+
+    Se o ``get`` falhar, confere se o Chrome da sessão compartilhada ainda responde; se
+    tiver morrido, o próximo acesso a ``BrowserSession.driver`` abre outro.
+    """
+    try:
+        _navigate(driver, url)
+    except Exception:
+        session = _SESSION
+        if session is not None and session.owns(driver):
+            session.check_alive()
+        raise
+
+
+def _navigate(driver, url: str) -> None:
+    if not settings.SELENIUM_BLOCK_RESOURCES:
+        driver.get(url)
+        return
+    meter = _METERS.get(driver)
+    if meter is None:
+        meter = _METERS[driver] = _NetworkMeter()
+    if settings.SELENIUM_NETWORK_REPORT:
+        _drain_network_report(driver, meter)
+    _apply_resource_blocking(driver, meter, url)
+    meter.current_url = url
+    driver.get(url)
+
+
+def log_network_summary() -> None:
+    if not (settings.SELENIUM_BLOCK_RESOURCES and settings.SELENIUM_NETWORK_REPORT):
+        return
+    for driver, meter in list(_METERS.items()):
+        _drain_network_report(driver, meter)
+        meter.current_url = ""
+    with _NETWORK_LOCK:
+        totals = dict(_NETWORK_TOTALS)
+    if not totals["pages"]:
+        return
+    pages = totals["pages"]
+    logger.info(
+        "Rede (Selenium): {} páginas | média/página: {:.0f} reqs, {:.0f} KB carregados, {:.0f} reqs bloqueadas, ~{:.0f} KB economizados",
+        pages,
+        totals["requests_loaded"] / pages,
+        totals["bytes_loaded"] / pages / 1024,
+        totals["requests_blocked"] / pages,
+        totals["bytes_saved_est"] / pages / 1024,
+    )
+
+
+class BrowserSession:
+    """Chrome "quente" compartilhado pelos scrapers dentro de um mesmo processo.
+
+    O driver é criado sob demanda, recriado se o processo do Chrome morrer (conferido só
+    quando uma navegação falha, não a cada acesso), e fechado no ``atexit``. ``visited``
+    permite que cada scraper saiba se já preparou o site (home carregada, cookies aceitos)
+    nesta sessão.
+    """
+
+    def __init__(self, profile: str = "default") -> None:
+        self._profile = profile
+        self._driver: webdriver.Chrome | None = None
+        self._lock = threading.RLock()
+        self.visited: set[str] = set()
+
+    def _alive(self) -> bool:
+        try:
+            _ = self._driver.current_url  # type: ignore[union-attr]
+            return True
+        except Exception:
+            return False
+
+    @property
+    def driver(self) -> webdriver.Chrome:
+        with self._lock:
+            if self._driver is None:
+                self._driver = build_chrome_driver(self._profile)
+                self.visited.clear()
+            return self._driver
+
+    def owns(self, driver) -> bool:
+        return driver is not None and driver is self._driver
+
+    def check_alive(self) -> None:
+        """Descarta o driver se o Chrome não responde mais (chamado após uma falha)."""
+        with self._lock:
+            if self._driver is not None and not self._alive():
+                logger.warning("Sessão do Chrome perdida; reiniciando no próximo uso.")
+                self._quit()
+
+    def _quit(self) -> None:
+        try:
+            if self._driver is not None:
+                if settings.SELENIUM_NETWORK_REPORT and self._driver in _METERS:
+                    _drain_network_report(self._driver, _METERS[self._driver])
+                self._driver.quit()
+        except Exception:
+            pass
+        self._driver = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._quit()
+            self.visited.clear()
+
+
+_SESSION: BrowserSession | None = None
+_SESSION_LOCK = threading.Lock()
+_SESSION_PROFILE = "default"
+
+
+def set_browser_profile(profile: str) -> None:
+    """Perfil do Chrome da sessão compartilhada; chamar antes do primeiro uso (um por processo).
+
+    Cada script que abre o Chrome usa o próprio nome, para que execuções simultâneas
+    (``run_daily`` x ``run_daemon`` x ``backfill``) não disputem o mesmo ``--user-data-dir``.
+    """
+    global _SESSION_PROFILE
+    _SESSION_PROFILE = profile
+
+
+def browser_profile() -> str:
+    """Perfil da sessão compartilhada; prefixo dos perfis dos workers extras do processo."""
+    return _SESSION_PROFILE
+
+
+def get_browser_session() -> BrowserSession:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = BrowserSession(_SESSION_PROFILE)
+            atexit.register(_SESSION.close)
+        return _SESSION
+
+
+def close_browser_session() -> None:
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+
 
+__all__ = [
+    "build_chrome_driver",
+    "navigate",
+    "blocked_patterns_for",
+    "log_network_summary",
+    "resolve_driver_path",
+    "BrowserSession",
+    "get_browser_session",
+    "set_browser_profile",
+    "browser_profile",
+    "close_browser_session",
+]
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from functools import lru_cache
+
+_CACHE_SIZE = 4096
 
 _COUNTRY_SUFFIX_RE = re.compile(r"\s*\(([A-Z]{2,3})\)\s*$")
 _APOSTROPHES_RE = re.compile(r"[\u2019\u2018\']+")
-_NON_ALNUM_SPACE_RE = re.compile(r"[^0-9A-Za-z\s]+")
 _WHITESPACE_RE = re.compile(r"\s+")
 _PARENTHESIS_CONTENT_RE = re.compile(r"\s*\([^\)]*\)")
 _PROVIDER_PREFIX_RE = re.compile(
@@ -27,30 +29,32 @@ _PROVIDER_PREFIX_RE = re.compile(
     r")\s*(?:-|/)?\s*",
     re.IGNORECASE,
 )
-_DATE_TOKEN_RE = re.compile(r"\b\d{1,2}(?:st|nd|rd|th)?\b", re.IGNORECASE)
-_MONTH_TOKEN_RE = re.compile(
+# Datas, meses, dias da semana, sessões, anos e "Dogs"/"Dg": palavras inteiras trocadas por espaço
+# numa única passada (os conjuntos são disjuntos, então equivale a aplicá-los em sequência).
+_NOISE_TOKEN_RE = re.compile(
     r"\b(?:"
-    r"Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|"
-    r"Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?"
+    r"\d{1,2}(?:st|nd|rd|th)?"
+    r"|\d{4}"
+    r"|Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?"
+    r"|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?"
+    r"|Matinee|Morning|Early|Late|Afternoon|Evening|Midnight|Night|Eve"
+    r"|(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)(?:day)?"
+    r"|Dogs?|Dg"
     r")\b",
     re.IGNORECASE,
 )
-_SESSION_TOKEN_RE = re.compile(
-    r"\b(?:Matinee|Morning|Early|Late|Afternoon|Evening|Midnight|Night|Eve)\b",
-    re.IGNORECASE,
-)
-_DAY_TOKEN_RE = re.compile(
-    r"\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)(?:day)?\b",
-    re.IGNORECASE,
-)
 _COUNTRY_PREFIX_RE = re.compile(
     r"^(?:Aus|Australia|Ire|Ireland|Nz|New\s+Zealand|Uk|United\s+Kingdom)\b\s*",
     re.IGNORECASE,
 )
-_TRAILING_DOGS_RE = re.compile(r"\b(Dogs?|Dg)\b", re.IGNORECASE)
+_LEADING_THE_RE = re.compile(r"^The\s+", re.IGNORECASE)
+_VENUE_WORD_RE = re.compile(r"\b(?:Stadium|Racecourse)\b", re.IGNORECASE)
+_NON_ALNUM_RUN_RE = re.compile(r"[^0-9A-Za-z]+")
 _EMBEDDED_DAY_SUFFIX_RE = re.compile(r"(\d{1,2})(st|nd|rd|th)", re.IGNORECASE)
 _NUMERIC_CAMEL_RE = re.compile(r"(\D)(\d)")
 _VALLEY_TYPO_RE = re.compile(r"\bValey\b", re.IGNORECASE)
+_APOSTROPHES_TABLE = str.maketrans("", "", "\u2019\u2018'")
+_SEPARATORS_TABLE = str.maketrans({"/": " ", "\\": " ", "-": " "})
 _CANONICAL_OVERRIDES = {
     "Shelbourne": "Shelbourne Park",
     "Shelbourn": "Shelbourne Park",
@@ -74,43 +78,33 @@ def strip_accents(text: str) -> str:
     return "".join(c for c in nfkd if not unicodedata.combining(c))
 
 
-def clean_dog_name(raw_name: str) -> str:
-    name = strip_country_suffix(raw_name or "")
-    name = normalize_spaces(name)
-    name = remove_apostrophes(name)
-    name = strip_accents(name)
-    name = _NON_ALNUM_SPACE_RE.sub(" ", name)
-    name = normalize_spaces(name)
-    return name.title()
+def _clean_dog_name(raw_name: str) -> str:
+    name = strip_country_suffix(raw_name or "").translate(_APOSTROPHES_TABLE)
+    if not name.isascii():
+        name = strip_accents(name)
+    # Pontuação e espaços viram um único espaço na mesma passada.
+    return _NON_ALNUM_RUN_RE.sub(" ", name).strip().title()
 
 
-def normalize_track_name(raw_name: str) -> str:
+def _normalize_track_name(raw_name: str) -> str:
     name = normalize_spaces(str(raw_name or ""))
     if not name:
         return ""
 
-    name = name.replace("/", " ").replace("\\", " ").replace("-", " ")
+    name = name.translate(_SEPARATORS_TABLE)
     name = _EMBEDDED_DAY_SUFFIX_RE.sub(r"\1", name)
     name = _NUMERIC_CAMEL_RE.sub(r"\1 \2", name)
     name = _PROVIDER_PREFIX_RE.sub("", name)
     name = _PROVIDER_PREFIX_RE.sub("", name)
     name = _COUNTRY_PREFIX_RE.sub("", name)
     name = _PARENTHESIS_CONTENT_RE.sub("", name)
-    name = _DATE_TOKEN_RE.sub(" ", name)
-    name = _MONTH_TOKEN_RE.sub(" ", name)
-    name = _DAY_TOKEN_RE.sub(" ", name)
-    name = _SESSION_TOKEN_RE.sub(" ", name)
-    name = re.sub(r"\b\d{4}\b", " ", name)
-    name = _TRAILING_DOGS_RE.sub(" ", name)
-    name = re.sub(r"^The\s+", "", name, flags=re.IGNORECASE)
-    name = normalize_spaces(name)
-    name = remove_apostrophes(name)
-    name = strip_accents(name)
-    name = re.sub(r"\bStadium\b", "", name, flags=re.IGNORECASE)
-    name = re.sub(r"\bGreyhound Stadium\b", "", name, flags=re.IGNORECASE)
-    name = re.sub(r"\bRacecourse\b", "", name, flags=re.IGNORECASE)
-    name = _NON_ALNUM_SPACE_RE.sub(" ", name)
-    name = normalize_spaces(name).title()
+    name = _NOISE_TOKEN_RE.sub(" ", name)
+    name = _LEADING_THE_RE.sub("", name)
+    name = name.translate(_APOSTROPHES_TABLE)
+    if not name.isascii():
+        name = strip_accents(name)
+    name = _VENUE_WORD_RE.sub("", name)
+    name = _NON_ALNUM_RUN_RE.sub(" ", name).strip().title()
     name = _VALLEY_TYPO_RE.sub("Valley", name)
     name = _CANONICAL_OVERRIDES.get(name, name)
     if not name:
@@ -118,6 +112,27 @@ def normalize_track_name(raw_name: str) -> str:
     return name
 
 
+# Poucas dezenas de pistas e alguns milhares de cães por dia: os nomes se repetem
+# entre listagem, scrape e builders. ``typed`` evita que 1 e 1.0 dividam a entrada.
+clean_dog_name = lru_cache(maxsize=_CACHE_SIZE, typed=True)(_clean_dog_name)
+normalize_track_name = lru_cache(maxsize=_CACHE_SIZE, typed=True)(_normalize_track_name)
+
+
+def normalization_cache_info() -> dict[str, dict[str, float]]:
+    """Hits/misses/tamanho dos caches de ``normalize_track_name`` e ``clean_dog_name``."""
+    out: dict[str, dict[str, float]] = {}
+    for label, fn in (("track", normalize_track_name), ("dog", clean_dog_name)):
+        info = fn.cache_info()
+        calls = info.hits + info.misses
+        out[label] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "hit_rate": round(info.hits / calls, 4) if calls else 0.0,
+        }
+    return out
+
+
 def normalize_category(raw: str) -> str:
     if not raw:
         return ""
@@ -132,5 +147,6 @@ __all__ = [
     "normalize_track_name",
     "normalize_category",
     "normalize_spaces",
+    "normalization_cache_info",
 ]
 
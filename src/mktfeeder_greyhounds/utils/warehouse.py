@@ -0,0 +1,343 @@
+"""Warehouse histórico (SQLite local) com corridas, Betting Forecast, verdicts e seleções exportadas.
+
+A carga é feita por dia: cada dia recarregado substitui as linhas daquela data na tabela
+correspondente, então re-ingerir um arquivo atualizado é idempotente.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Sequence
+
+import pandas as pd
+
+from src.mktfeeder_greyhounds.config import settings
+from src.mktfeeder_greyhounds.utils.frames import column, map_unique
+from src.mktfeeder_greyhounds.utils.text import normalize_category, normalize_spaces, normalize_track_name
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS races (
+    date TEXT NOT NULL,
+    track TEXT NOT NULL,
+    track_key TEXT NOT NULL,
+    hhmm TEXT NOT NULL,
+    race_time_iso TEXT,
+    category_raw TEXT,
+    category_norm TEXT,
+    PRIMARY KEY (date, track_key, hhmm)
+);
+CREATE TABLE IF NOT EXISTS forecasts (
+    date TEXT NOT NULL,
+    track_key TEXT NOT NULL,
+    hhmm TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    dog_name TEXT NOT NULL,
+    odds REAL,
+    PRIMARY KEY (date, track_key, hhmm, position)
+);
+CREATE TABLE IF NOT EXISTS verdicts (
+    date TEXT NOT NULL,
+    track_key TEXT NOT NULL,
+    hhmm TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    dog_name TEXT NOT NULL,
+    PRIMARY KEY (date, track_key, hhmm, position)
+);
+CREATE TABLE IF NOT EXISTS selections (
+    date TEXT NOT NULL,
+    track TEXT NOT NULL,
+    track_key TEXT NOT NULL,
+    hhmm TEXT NOT NULL,
+    category_raw TEXT,
+    category_norm TEXT,
+    dog_name TEXT NOT NULL,
+    strategy_tag TEXT NOT NULL,
+    stake REAL
+);
+CREATE TABLE IF NOT EXISTS ingest_log (
+    source TEXT NOT NULL,
+    date TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    rows INTEGER NOT NULL,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (source, date)
+);
+CREATE INDEX IF NOT EXISTS idx_races_date ON races (date);
+CREATE INDEX IF NOT EXISTS idx_races_track_date ON races (track_key, date);
+CREATE INDEX IF NOT EXISTS idx_forecasts_date ON forecasts (date);
+CREATE INDEX IF NOT EXISTS idx_forecasts_track_date ON forecasts (track_key, date);
+CREATE INDEX IF NOT EXISTS idx_forecasts_dog ON forecasts (dog_name);
+CREATE INDEX IF NOT EXISTS idx_verdicts_date ON verdicts (date);
+CREATE INDEX IF NOT EXISTS idx_verdicts_track_date ON verdicts (track_key, date);
+CREATE INDEX IF NOT EXISTS idx_verdicts_dog ON verdicts (dog_name);
+CREATE INDEX IF NOT EXISTS idx_selections_date ON selections (date);
+CREATE INDEX IF NOT EXISTS idx_selections_track_date ON selections (track_key, date);
+CREATE INDEX IF NOT EXISTS idx_selections_dog ON selections (dog_name);
+"""
+
+# Tabelas preenchidas por cada fonte (o dia é apagado nelas antes de recarregar).
+_SOURCE_TABLES = {
+    "timeform_forecast": ("races", "forecasts", "verdicts"),
+    "forecast": ("races", "forecasts"),
+    "marketfeeder_audit": ("selections",),
+}
+
+
+def _text(df: pd.DataFrame, col: str) -> pd.Series:
+    """Coluna como texto com espaços normalizados; ausente/None/NaN vira ""."""
+    values = column(df, col)
+    return map_unique(values.astype(str).where(values.notna(), ""), normalize_spaces)
+
+
+def _number(df: pd.DataFrame, col: str) -> pd.Series:
+    numbers = pd.to_numeric(column(df, col), errors="coerce")
+    return numbers.astype(object).where(numbers.notna(), None)
+
+
+def _null_if_empty(text: pd.Series) -> pd.Series:
+    return text.where(text != "", None)
+
+
+def _track_key(df: pd.DataFrame, track: pd.Series) -> pd.Series:
+    key = _text(df, "track_key")
+    return key.where(key != "", map_unique(track, normalize_track_name))
+
+
+def _rows(frame: pd.DataFrame) -> list[tuple]:
+    return list(frame.itertuples(index=False, name=None))
+
+
+def _race_rows(df: pd.DataFrame, day: str) -> list[tuple]:
+    track, hhmm = _text(df, "track"), _text(df, "hhmm")
+    frame = pd.DataFrame(
+        {
+            "date": day,
+            "track": track,
+            "track_key": _track_key(df, track),
+            "hhmm": hhmm,
+            "race_time_iso": _null_if_empty(_text(df, "race_time_iso")),
+            "category_raw": _null_if_empty(_text(df, "category_raw")),
+            "category_norm": _null_if_empty(map_unique(_text(df, "category_norm"), normalize_category)),
+        }
+    )
+    return _rows(frame[(track != "") & (hhmm != "")])
+
+
+def _ranked_rows(
+    df: pd.DataFrame,
+    day: str,
+    name_cols: Sequence[str],
+    odds_cols: Sequence[str] | None = None,
+) -> list[tuple]:
+    """Uma linha por posição (1..3) com nome preenchido; ``odds_cols`` acrescenta a odd."""
+    track, hhmm = _text(df, "track"), _text(df, "hhmm")
+    valid = (track != "") & (hhmm != "")
+    track_key = _track_key(df, track)
+    frames = []
+    for position, col in enumerate(name_cols, start=1):
+        dog = _text(df, col)
+        frame = pd.DataFrame({"date": day, "track_key": track_key, "hhmm": hhmm, "position": position, "dog_name": dog})
+        if odds_cols is not None:
+            frame["odds"] = _number(df, odds_cols[position - 1])
+        frames.append(frame[valid & (dog != "")])
+    return _rows(pd.concat(frames, ignore_index=True)) if frames else []
+
+
+def _selection_rows(df: pd.DataFrame, day: str) -> list[tuple]:
+    track, dog = _text(df, "track"), _text(df, "dog_name")
+    frame = pd.DataFrame(
+        {
+            "date": day,
+            "track": track,
+            "track_key": map_unique(track, normalize_track_name),
+            "hhmm": _text(df, "hhmm"),
+            "category_raw": _null_if_empty(_text(df, "category_raw")),
+            "category_norm": _null_if_empty(_text(df, "category_norm")),
+            "dog_name": dog,
+            "strategy_tag": _text(df, "strategy_tag"),
+            "stake": _number(df, "stake"),
+        }
+    )
+    return _rows(frame[(track != "") & (dog != "")])
+
+
+class Warehouse:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # --- carga ---
+
+    def ingested_mtime(self, source: str, day: str) -> float | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime FROM ingest_log WHERE source = ? AND date = ?", (source, day)
+            ).fetchone()
+        return row[0] if row else None
+
+    def load_day(self, source: str, day: str, df: pd.DataFrame, path: Path, mtime: float) -> int:
+        """Substitui o dia ``day`` nas tabelas da fonte pelo conteúdo de ``df``; retorna linhas gravadas."""
+        if source == "timeform_forecast":
+            batches = {
+                "races": _race_rows(df, day),
+                "forecasts": _ranked_rows(
+                    df, day, ("Forecast1", "Forecast2", "Forecast3"), ("Forecast1Odds", "Forecast2Odds", "Forecast3Odds")
+                ),
+                "verdicts": _ranked_rows(df, day, ("TimeformTop1", "TimeformTop2", "TimeformTop3")),
+            }
+        elif source == "forecast":
+            batches = {
+                "races": _race_rows(df, day),
+                "forecasts": _ranked_rows(
+                    df,
+                    day,
+                    ("forecast_1", "forecast_2", "forecast_3"),
+                    ("forecast_1_odds", "forecast_2_odds", "forecast_3_odds"),
+                ),
+            }
+        elif source == "marketfeeder_audit":
+            batches = {"selections": _selection_rows(df, day)}
+        else:
+            raise ValueError(f"Fonte desconhecida: {source}")
+
+        total = 0
+        with self._lock, self._conn:
+            for table in _SOURCE_TABLES[source]:
+                self._conn.execute(f"DELETE FROM {table} WHERE date = ?", (day,))
+            for table, rows in batches.items():
+                if not rows:
+                    continue
+                placeholders = ", ".join("?" * len(rows[0]))
+                self._conn.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", rows)
+                total += len(rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingest_log (source, date, path, mtime, rows, ingested_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (source, day, str(path), mtime, total, time.time()),
+            )
+        return total
+
+    def bulk_mode(self) -> None:
+        """Troca durabilidade por velocidade na carga inicial do histórico (o arquivo é reconstruível)."""
+        with self._lock:
+            self._conn.execute("PRAGMA synchronous=OFF")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA cache_size=-65536")
+
+    # --- consultas ---
+
+    def query(self, sql: str, params: Sequence[object] | dict = ()) -> pd.DataFrame:
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def days(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT date FROM races ORDER BY date")]
+
+    def races(
+        self,
+        track: str | None = None,
+        category_prefix: str | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> pd.DataFrame:
+        """Corridas com o Betting Forecast (1..3 + odds) e o verdict lado a lado."""
+        where, params = self._filters("r", track, category_prefix, start, end)
+        sql = f"""
+            SELECT r.date, r.track, r.track_key, r.hhmm, r.race_time_iso, r.category_raw, r.category_norm,
+                   MAX(CASE WHEN f.position = 1 THEN f.dog_name END) AS forecast_1,
+                   MAX(CASE WHEN f.position = 2 THEN f.dog_name END) AS forecast_2,
+                   MAX(CASE WHEN f.position = 3 THEN f.dog_name END) AS forecast_3,
+                   MAX(CASE WHEN f.position = 1 THEN f.odds END) AS forecast_1_odds,
+                   MAX(CASE WHEN f.position = 2 THEN f.odds END) AS forecast_2_odds,
+                   MAX(CASE WHEN f.position = 3 THEN f.odds END) AS forecast_3_odds,
+                   (SELECT dog_name FROM verdicts v WHERE v.date = r.date AND v.track_key = r.track_key
+                        AND v.hhmm = r.hhmm AND v.position = 1) AS verdict_1
+            FROM races r
+            LEFT JOIN forecasts f ON f.date = r.date AND f.track_key = r.track_key AND f.hhmm = r.hhmm
+            {where}
+            GROUP BY r.date, r.track_key, r.hhmm
+            ORDER BY r.date, r.hhmm, r.track_key
+        """
+        return self.query(sql, params)
+
+    def selections(
+        self,
+        track: str | None = None,
+        category_prefix: str | None = None,
+        strategy_tag: str | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> pd.DataFrame:
+        """Seleções exportadas ao MarketFeeder, com a odd do Betting Forecast do cão."""
+        where, params = self._filters("s", track, category_prefix, start, end)
+        if strategy_tag:
+            where += (" AND " if where else "WHERE ") + "s.strategy_tag = ?"
+            params.append(strategy_tag.upper())
+        sql = f"""
+            SELECT s.date, s.track, s.track_key, s.hhmm, s.category_norm, s.dog_name, s.strategy_tag, s.stake,
+                   f.position AS forecast_position, f.odds AS forecast_odds
+            FROM selections s
+            LEFT JOIN forecasts f ON f.date = s.date AND f.track_key = s.track_key AND f.hhmm = s.hhmm
+                AND f.dog_name = s.dog_name
+            {where}
+            ORDER BY s.date, s.hhmm, s.track_key
+        """
+        return self.query(sql, params)
+
+    def dog_history(self, dog_name: str) -> pd.DataFrame:
+        """Todas as aparições do cão no Betting Forecast e no verdict."""
+        sql = """
+            SELECT f.date, f.track_key, f.hhmm, 'forecast' AS source, f.position, f.odds
+            FROM forecasts f WHERE f.dog_name = ?
+            UNION ALL
+            SELECT v.date, v.track_key, v.hhmm, 'verdict' AS source, v.position, NULL
+            FROM verdicts v WHERE v.dog_name = ?
+            ORDER BY 1, 3
+        """
+        dog = normalize_spaces(dog_name)
+        return self.query(sql, (dog, dog))
+
+    @staticmethod
+    def _filters(
+        alias: str,
+        track: str | None,
+        category_prefix: str | None,
+        start: str | None,
+        end: str | None,
+    ) -> tuple[str, list[object]]:
+        clauses: list[str] = []
+        params: list[object] = []
+        if track:
+            clauses.append(f"{alias}.track_key = ?")
+            params.append(normalize_track_name(track))
+        if category_prefix:
+            clauses.append(f"{alias}.category_norm LIKE ? ESCAPE '\\'")
+            escaped = normalize_category(category_prefix).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(escaped + "%")
+        if start:
+            clauses.append(f"{alias}.date >= ?")
+            params.append(start)
+        if end:
+            clauses.append(f"{alias}.date <= ?")
+            params.append(end)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_warehouse(path: Path | None = None) -> Warehouse:
+    return Warehouse(path or settings.WAREHOUSE_PATH)
+
+
+__all__ = ["Warehouse", "open_warehouse"]
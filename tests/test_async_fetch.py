@@ -0,0 +1,86 @@
+"""Motor assíncrono contra um servidor HTTP local que serve os fixtures."""
+
+from __future__ import annotations
+
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from src.mktfeeder_greyhounds.utils.async_fetch import fetch_pages_sync  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures"
+SLOW_SEC = 3.0
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    """Serve ``benchmarks/fixtures``; ``/slow`` só responde depois de ``SLOW_SEC``."""
+
+    def do_GET(self) -> None:
+        if self.path == "/slow":
+            time.sleep(SLOW_SEC)
+        super().do_GET()
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_FixtureHandler, directory=str(FIXTURES)))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session():
+    # Sessão sem retry: o teste mede o timeout de uma única tentativa.
+    with requests.Session() as s:
+        yield s
+
+
+def test_pages_are_paced_by_token_bucket(base_url: str, session) -> None:
+    urls = [f"{base_url}/timeform_race.html?n={i}" for i in range(6)]
+
+    started = time.monotonic()
+    pages = fetch_pages_sync(session, urls, rate_per_sec=10.0, burst=1, concurrency=6, timeout=5.0)
+    elapsed = time.monotonic() - started
+
+    expected = (FIXTURES / "timeform_race.html").read_text(encoding="utf-8")
+    assert list(pages) == urls
+    assert all(html == expected for html in pages.values())
+    # burst=1 a 10/s: a 1ª sai na hora e as 5 seguintes esperam 0,1 s cada.
+    assert elapsed >= 0.45
+
+
+def test_burst_is_not_throttled(base_url: str, session) -> None:
+    urls = [f"{base_url}/timeform_cards.html?n={i}" for i in range(4)]
+
+    started = time.monotonic()
+    pages = fetch_pages_sync(session, urls, rate_per_sec=1.0, burst=4, concurrency=4, timeout=5.0)
+
+    assert all(pages.values())
+    assert time.monotonic() - started < 1.0
+
+
+def test_failures_come_back_as_none(base_url: str, session) -> None:
+    ok, missing, slow = f"{base_url}/betfair_index.html", f"{base_url}/missing.html", f"{base_url}/slow"
+
+    started = time.monotonic()
+    pages = fetch_pages_sync(session, [ok, missing, slow], rate_per_sec=0, burst=1, concurrency=3, timeout=0.5)
+    elapsed = time.monotonic() - started
+
+    assert pages[ok]
+    assert pages[missing] is None
+    assert pages[slow] is None
+    # O timeout chega ao session.get: não espera a resposta lenta do servidor.
+    assert elapsed < SLOW_SEC
@@ -0,0 +1,125 @@
+"""Builders de TOP3/FORECAST por coluna x a implementação original com ``iterrows``."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_build_outputs import _legacy_build_forecast, _legacy_build_top3
+from src.mktfeeder_greyhounds.pipeline.build_outputs import build_forecast, build_top3
+
+NAN = float("nan")
+
+
+@pytest.fixture
+def df_raw() -> pd.DataFrame:
+    """Raw pequeno com os buracos dos arquivos reais: None/NaN, "" e colunas CamelCase x snake_case."""
+    return pd.DataFrame(
+        [
+            {
+                "date": "2024-05-01",
+                "track": "  Romford ",
+                "hhmm": "18:09",
+                "race_time_iso": "2024-05-01T18:09",
+                "category_raw": "A5",
+                "category_norm": "a 5",
+                "TimeformTop1": "Swift  Blaze",
+                "TimeformTop2": "Droopys Aoife",
+                "TimeformTop3": "Ballymac Tas",
+                "Forecast1": "Swift Blaze",
+                "Forecast2": "Droopys Aoife",
+                "Forecast3": "Ballymac Tas",
+                "Forecast1Odds": 2.75,
+                "Forecast2Odds": 3.5,
+                "Forecast3Odds": 5.0,
+            },
+            {
+                # Sem data e sem hhmm: data de hoje e horário tirado do ISO; NaN vira "nan" no TOP3.
+                "date": None,
+                "track": "Hove",
+                "hhmm": "",
+                "race_time_iso": "2024-05-01T19:15",
+                "category_raw": "D3",
+                "category_norm": "D3",
+                "TimeformTop1": "Kinda Keen",
+                "TimeformTop2": "Lenson Bocko",
+                "TimeformTop3": NAN,
+                # Só as colunas snake_case preenchidas: o ``or`` cai nelas.
+                "Forecast1": None,
+                "Forecast2": "",
+                "Forecast3": None,
+                "forecast_1": "Kinda Keen",
+                "forecast_2": "Lenson Bocko",
+                "forecast_3": "Rising Brandy",
+                "Forecast1Odds": 0.0,
+                "forecast_1_odds": 4.0,
+                "forecast_2_odds": 6.0,
+                "forecast_3_odds": 8.0,
+            },
+            {
+                # TOP3 e FORECAST incompletos: a corrida some das duas saídas.
+                "date": "2024-05-01",
+                "track": "Towcester",
+                "hhmm": "20:30",
+                "category_raw": "OR",
+                "category_norm": "OR",
+                "TimeformTop1": "Swords Rex",
+                "TimeformTop2": "",
+                "TimeformTop3": "Droopys Jet",
+                "Forecast1": "Swords Rex",
+                "Forecast2": "",
+                "forecast_2": None,
+                "Forecast3": "Droopys Jet",
+            },
+            {
+                # Sem TOP3; no FORECAST o NaN é truthy e fica (como no ``or`` original).
+                "date": "2024-05-01",
+                "track": "Sheffield",
+                "hhmm": "21:02",
+                "category_raw": "",
+                "category_norm": None,
+                "TimeformTop1": None,
+                "Forecast1": NAN,
+                "Forecast2": "Droopys Jet",
+                "Forecast3": "Swords Rex",
+            },
+        ]
+    )
+
+
+def test_top3_matches_iterrows(df_raw: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(build_top3(df_raw), _legacy_build_top3(df_raw))
+
+
+def test_forecast_matches_iterrows(df_raw: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(build_forecast(df_raw), _legacy_build_forecast(df_raw))
+
+
+def test_top3_fills_defaults(df_raw: pd.DataFrame) -> None:
+    top3 = build_top3(df_raw)
+
+    assert top3["track"].tolist() == ["Romford", "Hove"]
+    assert top3["dog_1"].tolist() == ["Swift Blaze", "Kinda Keen"]
+    assert top3["dog_3"].tolist() == ["Ballymac Tas", "nan"]
+    assert top3["date"].tolist() == ["2024-05-01", date.today().isoformat()]
+    assert top3["hhmm"].tolist() == ["18:09", "19:15"]
+
+
+def test_forecast_falls_back_to_snake_case(df_raw: pd.DataFrame) -> None:
+    forecast = build_forecast(df_raw)
+
+    assert forecast["track"].tolist() == ["  Romford ", "Hove", "Sheffield"]
+    assert forecast.loc[1, ["forecast_1", "forecast_2", "forecast_3"]].tolist() == [
+        "Kinda Keen",
+        "Lenson Bocko",
+        "Rising Brandy",
+    ]
+    assert forecast.loc[1, "forecast_1_odds"] == 4.0
+    assert pd.isna(forecast.loc[2, "forecast_1"])
+
+
+def test_empty_raw() -> None:
+    assert build_top3(pd.DataFrame()).empty
+    assert build_forecast(pd.DataFrame()).empty
@@ -0,0 +1,118 @@
+"""Journal da raspagem: retomada entre execuções e gravação do raw em fluxo."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.mktfeeder_greyhounds.pipeline import daily_scrape
+from src.mktfeeder_greyhounds.scrapers import timeform
+from src.mktfeeder_greyhounds.utils import files
+from src.mktfeeder_greyhounds.utils.files import save_dataset, save_dataset_chunks
+from src.mktfeeder_greyhounds.utils.journal import ScrapeJournal
+
+RACE_DATE = date(2024, 5, 1)
+# Ordem da listagem do Timeform (por pista), diferente da ordem de largada.
+CARDS = [
+    {"track_name": "Romford", "track_key": "Romford", "hhmm": "18:09", "url": "https://example.invalid/romford"},
+    {"track_name": "Romford", "track_key": "Romford", "hhmm": "20:01", "url": "https://example.invalid/romford-2"},
+    {"track_name": "Hove", "track_key": "Hove", "hhmm": "12:03", "url": "https://example.invalid/hove"},
+    {"track_name": "Sheffield", "track_key": "Sheffield", "hhmm": "14:30", "url": "https://example.invalid/sheffield"},
+]
+
+
+class _FakeFetcher:
+    """Devolve uma corrida completa; as URLs de ``failing`` levantam erro (corrida com falha)."""
+
+    def __init__(self, failing: set[str]) -> None:
+        self._failing = failing
+
+    def fetch(self, card):
+        if card["url"] in self._failing:
+            raise RuntimeError("chromedriver caiu")
+        forecast = [{"name": f"{card['track_name']} {i}", "odds": 2.0 + i} for i in range(3)]
+        return [item["name"] for item in forecast], "A5", forecast
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def scrape(monkeypatch):
+    monkeypatch.setattr(timeform, "list_timeform_cards", lambda session=None, race_date=None: [dict(c) for c in CARDS])
+    monkeypatch.setattr(timeform, "get_page_cache", lambda: None)
+
+    def run(journal, failing=(), **kwargs):
+        monkeypatch.setattr(timeform, "_make_fetcher", lambda *args: _FakeFetcher(set(failing)))
+        return timeform.scrape_timeform_forecast(
+            journal=journal, race_date=RACE_DATE, workers=1, backend="selenium", **kwargs
+        )
+
+    return run
+
+
+def _journal(tmp_path) -> ScrapeJournal:
+    return ScrapeJournal(tmp_path / "timeform_2024-05-01.jsonl", fsync_every_rows=1, fsync_every_sec=0)
+
+
+def test_resume_keeps_listing_order_across_runs(tmp_path, scrape) -> None:
+    # 1ª execução como o streaming (largada mais próxima primeiro), interrompida em duas corridas.
+    rows, stats = scrape(_journal(tmp_path), failing={CARDS[0]["url"], CARDS[3]["url"]}, soonest_first=True)
+    assert rows == []
+    assert stats["failed"] == 2
+
+    # 2ª execução como o run_daily incremental, com outro filtro de cards.
+    journal = _journal(tmp_path)
+    rows, stats = scrape(journal, skip_keys={("Romford", "20:01")})
+    assert rows == []
+    assert stats["resumed"] == 2
+
+    assert [(row["track"], row["hhmm"]) for row in journal.rows()] == [
+        (card["track_name"], card["hhmm"]) for card in CARDS
+    ]
+
+
+def test_rows_without_journal_are_returned(scrape) -> None:
+    rows, _ = scrape(None, soonest_first=True)
+
+    assert [(row["track"], row["hhmm"]) for row in rows] == [(card["track_name"], card["hhmm"]) for card in CARDS]
+
+
+def test_merge_replaces_in_place_and_appends() -> None:
+    existing = [
+        {"track_key": "Hove", "hhmm": "12:03", "Forecast1": ""},
+        {"track_key": "Romford", "hhmm": "18:09", "Forecast1": "A"},
+    ]
+    fresh = [
+        {"track_key": "Sheffield", "hhmm": "14:30", "Forecast1": "C"},
+        {"track_key": "Hove", "hhmm": "12:03", "Forecast1": "B"},
+    ]
+
+    merged = list(daily_scrape._merge_rows(existing, lambda: iter(fresh)))
+
+    assert [row["Forecast1"] for row in merged] == ["B", "A", "C"]
+
+
+def test_chunked_save_matches_save_dataset(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(files, "_dataset_locations", lambda name: (tmp_path, name + "_{day}.csv", tmp_path))
+    rows = [
+        {"track": "Romford", "hhmm": f"18:{i:02d}", "category_norm": "A5", "Forecast1": None, "Forecast1Odds": 2.5}
+        for i in range(7)
+    ]
+
+    chunked = save_dataset_chunks(timeform.iter_timeform_forecast_frames(rows, chunk_rows=3), "timeform_forecast", "a")
+    whole = save_dataset(timeform.build_timeform_forecast_df(rows), "timeform_forecast", "b")
+
+    assert chunked.read_bytes() == whole.read_bytes()
+    assert len(pd.read_csv(chunked).index) == 7
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_chunked_save_without_rows_writes_header(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(files, "_dataset_locations", lambda name: (tmp_path, name + "_{day}.csv", tmp_path))
+
+    path = save_dataset_chunks(timeform.iter_timeform_forecast_frames([]), "timeform_forecast", "a")
+
+    assert list(pd.read_csv(path).columns)[:3] == ["date", "track", "track_key"]
@@ -0,0 +1,84 @@
+"""Linhas e auditoria do MarketFeeder por coluna x a implementação original com ``iterrows``."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_marketfeeder_import import _legacy_build_lines_and_audit, assert_same
+from src.mktfeeder_greyhounds.pipeline.build_marketfeeder_import import build_lines_and_audit
+
+NAN = float("nan")
+
+
+def _race(track: str, hhmm: str, category: object, *dogs: object) -> dict:
+    return {
+        "track": track,
+        "hhmm": hhmm,
+        "category_raw": category,
+        "category_norm": category,
+        "forecast_1": dogs[0],
+        "forecast_2": dogs[1],
+        "forecast_3": dogs[2],
+    }
+
+
+@pytest.fixture
+def df_forecast() -> pd.DataFrame:
+    """FORECAST pequeno com None/NaN, "", espaços e categorias escritas de formas diferentes."""
+    return pd.DataFrame(
+        [
+            _race("Romford", "18:09", "a 5", "Swift  Blaze", " Droopys Aoife", "Ballymac Tas"),
+            # Mesmo horário e pista: o sort estável intercala as duas corridas na ordem do FORECAST.
+            _race(" Romford", "18:09", "HP", "Kinda Keen", "Lenson Bocko", "Rising Brandy"),
+            # NaN é truthy no ``or`` original: vira o cão "nan".
+            _race("Hove", "12:01", "d3", "Swords Rex", NAN, "Droopys Jet"),
+            # Elegível mas com forecast incompleto.
+            _race("Hove", "13:30", "OR", "Swords Rex", "", None),
+            # Categorias fora da estratégia.
+            _race("Towcester", "14:00", "S1", "Swords Rex", "Droopys Jet", "Kinda Keen"),
+            _race("Towcester", "14:15", None, "Swords Rex", "Droopys Jet", "Kinda Keen"),
+        ]
+    )
+
+
+def test_matches_iterrows(df_forecast: pd.DataFrame) -> None:
+    assert_same(build_lines_and_audit(df_forecast), _legacy_build_lines_and_audit(df_forecast))
+
+
+def test_lines_in_stable_order(df_forecast: pd.DataFrame) -> None:
+    lines, audit, skipped, *_ = build_lines_and_audit(df_forecast)
+
+    assert lines == [
+        '[12:01 Hove]Swords Rex\t"LAY"\t1.0',
+        '[12:01 Hove]nan\t"LAY"\t1.0',
+        '[12:01 Hove]Droopys Jet\t"LAY"\t1.0',
+        '[18:09 Romford]Swift Blaze\t"BACK"\t1.0',
+        '[18:09 Romford]Kinda Keen\t"LAY"\t1.0',
+        '[18:09 Romford]Droopys Aoife\t"BACK"\t1.0',
+        '[18:09 Romford]Lenson Bocko\t"LAY"\t1.0',
+        '[18:09 Romford]Ballymac Tas\t"BACK"\t1.0',
+        '[18:09 Romford]Rising Brandy\t"LAY"\t1.0',
+    ]
+    assert audit["date"].unique().tolist() == [date.today().isoformat()]
+    assert len(audit.index) == len(lines)
+    assert skipped == 1
+
+
+def test_counters(df_forecast: pd.DataFrame) -> None:
+    _, _, _, counts, races, exported, ignored_total, ignored = build_lines_and_audit(df_forecast)
+
+    assert list(races.items()) == [("BACK", 1), ("LAY", 2)]
+    assert counts == {"BACK": 3, "LAY": 6}
+    assert list(exported.items()) == [("A 5", 1), ("HP", 1), ("D3", 1)]
+    assert ignored_total == 2
+    assert list(ignored.items()) == [("S1", 1), ("", 1)]
+
+
+def test_empty_forecast() -> None:
+    lines, audit, *_ = build_lines_and_audit(pd.DataFrame())
+
+    assert lines == []
+    assert audit.empty
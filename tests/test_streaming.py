@@ -0,0 +1,133 @@
+"""Publicação progressiva do MarketFeeder (``StreamingPublisher``)."""
+
+from __future__ import annotations
+
+import time
+
+import pandas as pd
+import pytest
+
+from src.mktfeeder_greyhounds.pipeline import build_marketfeeder_import, build_outputs, streaming
+from src.mktfeeder_greyhounds.pipeline.market_join import MarketIndex, join_markets
+from src.mktfeeder_greyhounds.scrapers.timeform import build_timeform_forecast_df
+
+NAN = float("nan")
+
+
+def _row(track: str, hhmm: str, category: str, *forecast: object, key: str = "") -> dict:
+    return {
+        "date": "2024-05-01",
+        "track": track,
+        "track_key": key or track,
+        "hhmm": hhmm,
+        "category_raw": category,
+        "category_norm": category,
+        "TimeformTop1": "",
+        "Forecast1": forecast[0],
+        "Forecast2": forecast[1],
+        "Forecast3": forecast[2],
+        "Forecast1Odds": 2.5,
+    }
+
+
+ROWS = [
+    _row("Romford", "18:09", "A5", "Swift  Blaze", "Droopys Aoife", "Ballymac Tas"),
+    _row("Hove", "12:01", "D3", "Swords Rex", NAN, "Droopys Jet"),
+    _row("Hove", "13:30", "OR", "Swords Rex", "", "Kinda Keen"),
+    _row("Towcester", "14:00", "S1", "Swords Rex", "Droopys Jet", "Kinda Keen"),
+    # Outra corrida no mesmo horário e pista: empata na ordenação e segue a ordem de chegada.
+    _row(" Romford", "18:09", "HP", "Kinda Keen", "Lenson Bocko", "Rising Brandy", key="Romford Stadium"),
+    # Mesma chave da primeira corrida (re-raspagem): substitui a linha anterior.
+    _row("Romford", "18:09", "a 4", "Rising Brandy", "Swift Blaze", "Lenson Bocko"),
+]
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """Captura as publicações e confere que nenhuma acontece com o lock do publisher preso."""
+    calls = []
+
+    def fake_write(lines, audit):
+        assert publisher_ref[0]._lock.acquire(blocking=False), "gravação dentro do lock"
+        publisher_ref[0]._lock.release()
+        calls.append((lines, audit))
+        return "import_selections.txt", None, None
+
+    publisher_ref = [None]
+    monkeypatch.setattr(build_marketfeeder_import, "write_marketfeeder_files", fake_write)
+    return calls, publisher_ref
+
+
+def test_publish_matches_batch_pipeline(published) -> None:
+    calls, ref = published
+    publisher = ref[0] = streaming.StreamingPublisher(every_races=len(ROWS), every_sec=float("inf"))
+
+    for row in ROWS:
+        publisher.add(row)
+
+    df_forecast = build_outputs.build_forecast(build_timeform_forecast_df(publisher.rows()))
+    lines, audit, *_ = build_marketfeeder_import.build_lines_and_audit(df_forecast)
+    assert len(calls) == 1
+    assert calls[0][0] == lines
+    assert calls[0][1].to_csv(index=False) == audit.to_csv(index=False)
+
+
+def test_seed_rows_are_published_with_new_rows(published) -> None:
+    calls, ref = published
+    publisher = ref[0] = streaming.StreamingPublisher(1, float("inf"), seed_rows=ROWS[:4])
+
+    publisher.add(ROWS[4], force=True)
+
+    assert [line.split("]")[0] for line in calls[0][0]] == ["[12:01 Hove"] * 3 + ["[18:09 Romford"] * 6
+
+
+def test_timer_publishes_idle_rows(published) -> None:
+    calls, ref = published
+    publisher = ref[0] = streaming.StreamingPublisher(every_races=100, every_sec=0.2)
+
+    publisher.add(ROWS[0])
+    assert calls == []
+    deadline = time.monotonic() + 3
+    while not calls and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert len(calls) == 1
+    publisher.close()
+    assert len(calls) == 1
+
+
+def test_close_flushes_pending_rows(published) -> None:
+    calls, ref = published
+    publisher = ref[0] = streaming.StreamingPublisher(every_races=100, every_sec=float("inf"))
+
+    publisher.add(ROWS[0])
+    publisher.close()
+
+    assert len(calls) == 1
+    assert publisher.publishes == 1
+    assert isinstance(calls[0][1], pd.DataFrame)
+
+
+def test_refresh_publish_keeps_market_columns(published) -> None:
+    calls, ref = published
+    markets = [("Romford", "18:09", "1.220522030"), ("Hove", "12:02", "1.220522031")]
+    index = MarketIndex.from_frame(
+        pd.DataFrame(
+            [
+                {"track_name": track, "race_time_label": hhmm, "race_url": f"https://example.invalid/market/{market_id}"}
+                for track, hhmm, market_id in markets
+            ]
+        ),
+        min_similarity=0.85,
+    )
+    publisher = ref[0] = streaming.StreamingPublisher(1, float("inf"), seed_rows=ROWS[:-1], markets=index)
+
+    publisher.add(ROWS[-1], force=True)
+
+    df_forecast = build_outputs.build_forecast(build_timeform_forecast_df(publisher.rows()))
+    df_forecast, _ = join_markets(df_forecast, index)
+    lines, audit, *_ = build_marketfeeder_import.build_lines_and_audit(df_forecast)
+    assert calls[-1][0] == lines
+    assert calls[-1][1].to_csv(index=False) == audit.to_csv(index=False)
+    assert list(audit.columns[-2:]) == ["market_id", "market_url"]
+    assert "1.220522030" in set(audit["market_id"])
@@ -0,0 +1,172 @@
+"""Parsers do Timeform sobre os fixtures HTML salvos em ``benchmarks/fixtures/``."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.mktfeeder_greyhounds.scrapers import timeform
+from src.mktfeeder_greyhounds.scrapers.timeform_parse import TIMEFORM_BASE, parse_card_list, parse_race_page
+
+FIXTURES = Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures"
+
+
+@pytest.fixture(scope="module")
+def race_html() -> str:
+    return (FIXTURES / "timeform_race.html").read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def cards_html() -> str:
+    return (FIXTURES / "timeform_cards.html").read_text(encoding="utf-8")
+
+
+def _strip_section(html: str, cls: str) -> str:
+    """Remove a ``<section class="cls">`` inteira do HTML."""
+    start = html.index(f'<section class="{cls}"')
+    end = html.index("</section>", start) + len("</section>")
+    return html[:start] + html[end:]
+
+
+def _without_verdict_and_forecast(html: str) -> str:
+    return _strip_section(_strip_section(html, "rpf-verdict"), "rp-forecast")
+
+
+def _without_grade(html: str) -> str:
+    return html.replace("Grade: (A5)", "")
+
+
+def test_parse_race_page_top3_forecast_and_grade(race_html: str) -> None:
+    parsed = parse_race_page(race_html)
+
+    assert parsed["top3"] == ["Swift Blaze", "Droopys Aoife", "Ballymac Tas"]
+    assert parsed["category_raw"] == "A5"
+    assert [item["name"] for item in parsed["forecast"][:3]] == ["Swift Blaze", "Droopys Aoife", "Ballymac Tas"]
+    assert [item["odds"] for item in parsed["forecast"][:3]] == [2.75, 3.5, 5.0]
+    assert len(parsed["forecast"]) == 6
+
+
+def test_parse_card_list_urls(cards_html: str) -> None:
+    cards = parse_card_list(cards_html)
+
+    assert len(cards) == 294
+    assert cards[0] == {
+        "track_name": "Romford",
+        "track_key": "Romford",
+        "hhmm": "18:09",
+        "url": f"{TIMEFORM_BASE}/racecards/romford/1809/2024-05-01/1001",
+    }
+    assert all(card["url"].startswith(f"{TIMEFORM_BASE}/racecards/") for card in cards)
+    assert len({card["url"] for card in cards}) == len(cards)
+    # Links do menu da página não viram cards.
+    assert not any("/menu/" in card["url"] for card in cards)
+
+
+def test_complete_page_is_ok(race_html: str) -> None:
+    assert timeform._parse_ok(parse_race_page(race_html))
+
+
+@pytest.mark.parametrize("damage", [_without_verdict_and_forecast, _without_grade], ids=["sem-forecast", "sem-grade"])
+def test_incomplete_page_is_not_ok(race_html: str, damage) -> None:
+    assert not timeform._parse_ok(parse_race_page(damage(race_html)))
+
+
+class _StubFallback:
+    def __init__(self) -> None:
+        self.cards = []
+        self.recorded = []
+
+    def fetch(self, card, record=True):
+        self.cards.append(card)
+        self.recorded.append(record)
+        return ["X", "Y", "Z"], "A1", []
+
+    def close(self) -> None:
+        pass
+
+
+def _http_fetcher(monkeypatch, url: str, html: str | None):
+    monkeypatch.setattr(timeform, "get_page_cache", lambda: None)
+    fetcher = timeform._HttpRaceFetcher(session=None, pages={url: html})
+    fetcher._fallback = _StubFallback()
+    return fetcher
+
+
+def test_incomplete_page_falls_back_to_selenium(monkeypatch, race_html: str) -> None:
+    card = {"track_name": "Romford", "hhmm": "18:09", "url": "https://example.invalid/race"}
+    fetcher = _http_fetcher(monkeypatch, card["url"], _without_verdict_and_forecast(race_html))
+
+    top3, category, _ = fetcher.fetch(card)
+
+    assert fetcher.fallbacks == 1
+    assert fetcher._fallback.cards == [card]
+    assert (top3, category) == (["X", "Y", "Z"], "A1")
+
+
+def test_complete_page_skips_fallback(monkeypatch, race_html: str) -> None:
+    card = {"track_name": "Romford", "hhmm": "18:09", "url": "https://example.invalid/race"}
+    fetcher = _http_fetcher(monkeypatch, card["url"], race_html)
+
+    top3, category, forecast = fetcher.fetch(card)
+
+    assert fetcher.fallbacks == 0
+    assert top3 == ["Swift Blaze", "Droopys Aoife", "Ballymac Tas"]
+    assert category == "A5"
+    assert len(forecast) == 6
+
+
+def _response_error(status: int):
+    requests = pytest.importorskip("requests")
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status}", response=response)
+
+
+@pytest.mark.parametrize(
+    "outcome, expected_records, fallback_records",
+    [
+        ("complete", [(0.5, "")], []),
+        ("incomplete", [], [True]),
+        ("http-404", [], [True]),
+        ("http-429", [(None, "HTTP 429")], [False]),
+        ("http-503", [(None, "HTTP 503")], [False]),
+    ],
+)
+def test_http_fetch_records_each_page_once(monkeypatch, race_html: str, outcome, expected_records, fallback_records):
+    """Só latência e erros de transporte entram no delay adaptativo; páginas incompletas ficam para o Selenium."""
+    card = {"track_name": "Romford", "hhmm": "18:09", "url": "https://example.invalid/race"}
+    monkeypatch.setattr(timeform, "get_page_cache", lambda: None)
+    monkeypatch.setattr(timeform, "_throttle", lambda url: None)
+    monkeypatch.setattr(timeform, "_sleep_jitter", lambda label="": None)
+    records = []
+    monkeypatch.setattr(timeform._POLITENESS, "record", lambda latency, problem="": records.append((latency, problem)))
+
+    def fake_get_html(self, url):
+        if outcome.startswith("http-"):
+            raise _response_error(int(outcome[5:]))
+        return (race_html if outcome == "complete" else _without_verdict_and_forecast(race_html)), 0.5
+
+    monkeypatch.setattr(timeform._HttpRaceFetcher, "_get_html", fake_get_html)
+    fetcher = timeform._HttpRaceFetcher(session=None)
+    fetcher._fallback = _StubFallback()
+
+    fetcher.fetch(card)
+
+    assert records == expected_records
+    assert fetcher._fallback.recorded == fallback_records
+
+
+@pytest.mark.parametrize("outcome", ["incomplete", "missing"])
+def test_prefetched_page_does_not_record(monkeypatch, race_html: str, outcome) -> None:
+    """Páginas do download assíncrono ficam fora do delay adaptativo, também no fallback."""
+    card = {"track_name": "Romford", "hhmm": "18:09", "url": "https://example.invalid/race"}
+    records = []
+    monkeypatch.setattr(timeform._POLITENESS, "record", lambda latency, problem="": records.append((latency, problem)))
+    page = _without_verdict_and_forecast(race_html) if outcome == "incomplete" else None
+    fetcher = _http_fetcher(monkeypatch, card["url"], page)
+
+    fetcher.fetch(card)
+
+    assert records == []
+    assert fetcher._fallback.recorded == [False]